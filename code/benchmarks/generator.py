@@ -0,0 +1,225 @@
+import argparse
+import csv
+import dataclasses
+import math
+import pathlib
+import random
+import typing as tp
+
+CSV_DELIMITER = ";"
+SIZE_CODE_FIRST = 30
+
+PRICAT_FIELDNAMES = (
+    "ean",
+    "supplier",
+    "brand",
+    "catalog_code",
+    "collection",
+    "season",
+    "article_structure_code",
+    "article_number",
+    "article_number_2",
+    "article_number_3",
+    "color_code",
+    "size_group_code",
+    "size_code",
+    "size_name",
+    "currency",
+    "price_buy_gross",
+    "price_buy_net",
+    "discount_rate",
+    "price_sell",
+    "material",
+    "target_area",
+)
+MAPPINGS_FIELDNAMES = ("source", "destination", "source_type", "destination_type")
+
+SEASONS = {"winter": "Winter", "summer": "Summer"}
+COLLECTIONS = {
+    "NW 17-18": "Winter Collection 2017/2018",
+    "NS 18": "Summer Collection 2018",
+}
+ARTICLE_STRUCTURES = {
+    "1": "Pump",
+    "2": "Boot",
+    "3": "Sneaker",
+    "4": "Slipper",
+    "5": "Loafer",
+    "6": "Mocassin",
+    "7": "Sandal",
+}
+COLOURS = (
+    "Nero",
+    "Marrone",
+    "Brandy",
+    "Indaco",
+    "Fucile",
+    "Bosco",
+    "Bianco",
+    "Rosso",
+    "Blu",
+    "Verde",
+    "Grigio",
+    "Beige",
+    "Oro",
+    "Argento",
+)
+NAMES = ("Aviation", "Caipirinha", "Joker", "Mojito", "Negroni", "Spritz")
+MATERIALS = ("Leather", "Suede", "Textile", "Synthetic")
+
+
+@dataclasses.dataclass(frozen=True)
+class PricatSpec:
+    """Shape of a synthetic pricat file and its mappings.
+
+    Attributes:
+        articles (int): The number of articles.
+        colours (int): The number of colours per article.
+        sizes (int): The number of sizes per colour.
+        mapping_density (float): The share of distinct values of mapped
+            columns that have a mapping rule, from 0 to 1.
+        seed (int): The seed of the random generator.
+    """
+
+    articles: int = 10
+    colours: int = 14
+    sizes: int = 28
+    mapping_density: float = 1.0
+    seed: int = 0
+
+    @property
+    def rows(self) -> int:
+        return self.articles * self.colours * self.sizes
+
+
+def write_pricat(spec: PricatSpec, path: pathlib.Path) -> None:
+    """Write a synthetic pricat file.
+
+    Args:
+        spec (PricatSpec): The shape of the file.
+        path (pathlib.Path): The path of the CSV file to write.
+    """
+    with open(path, "w", encoding="utf-8", newline="") as csv_file:
+        writer = csv.DictWriter(
+            csv_file, fieldnames=PRICAT_FIELDNAMES, delimiter=CSV_DELIMITER
+        )
+        writer.writeheader()
+        writer.writerows(_iter_pricat_rows(spec))
+
+
+def write_mappings(spec: PricatSpec, path: pathlib.Path) -> None:
+    """Write mappings for a synthetic pricat file.
+
+    Mappings have direct rules for season, collection, article structure and
+    colour, composite rules for sizes and a glob rule for the net price with
+    currency, like `mappings_bonus.csv`.
+
+    Args:
+        spec (PricatSpec): The shape of the pricat file.
+        path (pathlib.Path): The path of the CSV file to write.
+    """
+    with open(path, "w", encoding="utf-8", newline="") as csv_file:
+        writer = csv.writer(csv_file, delimiter=CSV_DELIMITER)
+        writer.writerow(MAPPINGS_FIELDNAMES)
+        writer.writerows(_iter_mapping_rows(spec))
+
+
+def _iter_pricat_rows(spec: PricatSpec) -> tp.Iterator[dict[str, str]]:
+    rnd = random.Random(spec.seed)
+    ean = 8719245000000
+
+    for article in range(spec.articles):
+        article_number = f"{10000 + article}-{rnd.randrange(100):02d}"
+        name = rnd.choice(NAMES)
+        season = rnd.choice(tuple(SEASONS))
+        price_buy_net = f"{rnd.randrange(30, 120)}.{rnd.choice((0, 5))}"
+        price_sell = f"{rnd.randrange(120, 250)}.95"
+        article_attributes = {
+            "supplier": "Rupesco BV",
+            "brand": "Via Vai",
+            "catalog_code": "",
+            "collection": rnd.choice(tuple(COLLECTIONS)),
+            "season": season,
+            "article_structure_code": rnd.choice(tuple(ARTICLE_STRUCTURES)),
+            "article_number": article_number,
+            "article_number_3": name,
+            "size_group_code": "EU",
+            "currency": "EUR",
+            "price_buy_gross": "",
+            "discount_rate": "",
+            "material": rnd.choice(MATERIALS),
+            "target_area": "Woman Shoes",
+        }
+
+        for colour in range(spec.colours):
+            colour_name = COLOURS[colour % len(COLOURS)]
+            for size in range(spec.sizes):
+                ean += 1
+                size_code = str(SIZE_CODE_FIRST + size)
+                yield {
+                    **article_attributes,
+                    "ean": str(ean),
+                    "article_number_2": f"{article_number} {name} {colour_name}",
+                    "color_code": str(colour + 1),
+                    "size_code": size_code,
+                    "size_name": size_code,
+                    "price_buy_net": price_buy_net,
+                    "price_sell": price_sell,
+                }
+
+
+def _iter_mapping_rows(spec: PricatSpec) -> tp.Iterator[tuple[str, str, str, str]]:
+    def dense(items: list[tuple[str, str]]) -> list[tuple[str, str]]:
+        return items[: math.ceil(len(items) * spec.mapping_density)]
+
+    for source, destination in dense(list(SEASONS.items())):
+        yield source, destination, "season", "season"
+    for source, destination in dense(list(COLLECTIONS.items())):
+        yield source, destination, "collection", "collection"
+    for source, destination in dense(list(ARTICLE_STRUCTURES.items())):
+        yield source, destination, "article_structure_code", "article_structure"
+
+    colours = [
+        (str(colour + 1), COLOURS[colour % len(COLOURS)])
+        for colour in range(spec.colours)
+    ]
+    for source, destination in dense(colours):
+        yield source, destination, "color_code", "color"
+
+    sizes = [
+        (f"EU|{SIZE_CODE_FIRST + size}", f"European size {SIZE_CODE_FIRST + size}")
+        for size in range(spec.sizes)
+    ]
+    for source, destination in dense(sizes):
+        yield source, destination, "size_group_code|size_code", "size"
+
+    yield "*", "*", "price_buy_net|currency", "price_buy_net_currency"
+
+
+def main() -> None:
+    """Parse CLI args and write a synthetic pricat file with its mappings."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-o", "--output-dir", type=pathlib.Path, required=True)
+    parser.add_argument("--articles", type=int, default=PricatSpec.articles)
+    parser.add_argument("--colours", type=int, default=PricatSpec.colours)
+    parser.add_argument("--sizes", type=int, default=PricatSpec.sizes)
+    parser.add_argument(
+        "--mapping-density", type=float, default=PricatSpec.mapping_density
+    )
+    parser.add_argument("--seed", type=int, default=PricatSpec.seed)
+    args = parser.parse_args()
+
+    spec = PricatSpec(
+        articles=args.articles,
+        colours=args.colours,
+        sizes=args.sizes,
+        mapping_density=args.mapping_density,
+        seed=args.seed,
+    )
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    write_pricat(spec=spec, path=args.output_dir / "pricat.csv")
+    write_mappings(spec=spec, path=args.output_dir / "mappings.csv")
+
+
+if __name__ == "__main__":
+    main()
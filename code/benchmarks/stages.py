@@ -0,0 +1,211 @@
+import argparse
+import dataclasses
+import io
+import json
+import pathlib
+import tempfile
+import time
+import tracemalloc
+import typing as tp
+
+from benchmarks.generator import PricatSpec, write_mappings, write_pricat
+from src.extractor import reader
+from src.extractor import schemas as extractor_schemas
+from src.grouper import catalog as catalog_grouper
+from src.loader import encoders as loader_enc
+from src.loader import loader
+from src.transformer import transformer
+
+CSV_DELIMITER = ";"
+ARTICLES_DEFAULT = (10, 100, 1000)
+
+
+@dataclasses.dataclass(frozen=True)
+class StageResult:
+    """Result of a benchmarked pipeline stage.
+
+    Attributes:
+        stage (str): The name of the stage.
+        rows (int): The number of source rows.
+        seconds (float): Wall time of the stage.
+        rows_per_second (float): Throughput of the stage.
+        peak_memory (int | None): Peak memory allocated by the stage, in bytes,
+            measured by tracemalloc in a separate run.
+    """
+
+    stage: str
+    rows: int
+    seconds: float
+    rows_per_second: float
+    peak_memory: int | None
+
+
+def benchmark(spec: PricatSpec, trace_memory: bool = True) -> list[StageResult]:
+    """Benchmark every pipeline stage on a synthetic pricat file.
+
+    Stages are timed in one run and, optionally, their peak memory is
+    measured in another run, so that tracing does not skew timings.
+
+    Args:
+        spec (PricatSpec): The shape of the pricat file.
+        trace_memory (bool): Whether to measure peak memory of stages.
+
+    Returns:
+        list[StageResult]: Results in pipeline order.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        source_path = pathlib.Path(directory) / "pricat.csv"
+        mappings_path = pathlib.Path(directory) / "mappings.csv"
+        write_pricat(spec=spec, path=source_path)
+        write_mappings(spec=spec, path=mappings_path)
+
+        timings = _run_stages(source_path, mappings_path, trace_memory=False)
+        peaks = (
+            _run_stages(source_path, mappings_path, trace_memory=True)
+            if trace_memory
+            else {}
+        )
+
+    return [
+        StageResult(
+            stage=stage,
+            rows=spec.rows,
+            seconds=seconds,
+            rows_per_second=spec.rows / seconds if seconds else 0,
+            peak_memory=peaks.get(stage),
+        )
+        for stage, seconds in timings.items()
+    ]
+
+
+def _run_stages(
+    source_path: pathlib.Path, mappings_path: pathlib.Path, trace_memory: bool
+) -> dict[str, tp.Any]:
+    results: dict[str, tp.Any] = {}
+
+    def measure(stage: str, func: tp.Callable[[], tp.Any]) -> tp.Any:
+        if trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        result = func()
+        seconds = time.perf_counter() - start
+        if trace_memory:
+            results[stage] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        else:
+            results[stage] = seconds
+        return result
+
+    mapping = transformer.Mapping()
+    mapping.build(
+        mapping_rows=reader.CsvReader(
+            file_meta=reader.CsvFileReaderMeta(
+                path=mappings_path, delimiter=CSV_DELIMITER
+            ),
+            validation_schema=extractor_schemas.CsvMappingSchemaRequired,
+        ).read_by_row()
+    )
+    source_reader = reader.CsvReader(
+        file_meta=reader.CsvFileReaderMeta(path=source_path, delimiter=CSV_DELIMITER),
+        validation_schema=extractor_schemas.CsvSourceSchemaRequired,
+    )
+
+    rows = measure("read_by_row", lambda: list(source_reader.read_by_row()))
+    transformed_rows = measure(
+        "transform_row",
+        lambda: [transformer.transform_row(row, mapping) for row in rows],
+    )
+
+    transform = transformer.TupleTransform.compile(
+        plan=mapping.plan, fieldnames=source_reader.read_header()
+    )
+    tuple_rows = measure(
+        "read_by_tuple",
+        lambda: list(source_reader.read_by_tuple(columns=transform.columns)),
+    )
+    measure("transform_tuple", lambda: [transform.apply(row) for row in tuple_rows])
+    measure("transform_batch", lambda: list(transform.apply_batches(tuple_rows)))
+
+    def group() -> catalog_grouper.Catalog:
+        catalog = catalog_grouper.Catalog.new()
+        for row in transformed_rows:
+            catalog.add(flat_data_row=row)
+        return catalog
+
+    catalog = measure("catalog_add", group)
+    measure(
+        "consolidate_common_attributes",
+        lambda: catalog_grouper.consolidate_common_attributes(catalog),
+    )
+    measure(
+        "encode_to_json",
+        lambda: loader.encode_to_json(
+            obj=catalog, encoder_cls=loader_enc.DataClassJsonEncoder
+        ),
+    )
+    measure(
+        "write_json",
+        lambda: loader.write_json(
+            obj=catalog,
+            stream=io.StringIO(),
+            encoder_cls=loader_enc.DataClassJsonEncoder,
+        ),
+    )
+
+    return results
+
+
+def main() -> None:
+    """Parse CLI args, benchmark stages at several scales and print results."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--articles",
+        type=lambda value: [int(articles) for articles in value.split(",")],
+        help="Comma-separated numbers of articles, one benchmark per number",
+        default=list(ARTICLES_DEFAULT),
+    )
+    parser.add_argument("--colours", type=int, default=PricatSpec.colours)
+    parser.add_argument("--sizes", type=int, default=PricatSpec.sizes)
+    parser.add_argument(
+        "--mapping-density", type=float, default=PricatSpec.mapping_density
+    )
+    parser.add_argument("--seed", type=int, default=PricatSpec.seed)
+    parser.add_argument(
+        "--no-memory", action="store_true", help="Do not measure peak memory"
+    )
+    parser.add_argument(
+        "--json", action="store_true", help="Print results as JSON lines"
+    )
+    args = parser.parse_args()
+
+    if not args.json:
+        print(
+            f"{'stage':<30} {'rows':>10} {'seconds':>10} {'rows/s':>12} {'peak MB':>9}"
+        )
+
+    for articles in args.articles:
+        spec = PricatSpec(
+            articles=articles,
+            colours=args.colours,
+            sizes=args.sizes,
+            mapping_density=args.mapping_density,
+            seed=args.seed,
+        )
+        for result in benchmark(spec=spec, trace_memory=not args.no_memory):
+            if args.json:
+                print(json.dumps(dataclasses.asdict(result)))
+                continue
+
+            peak_memory = (
+                f"{result.peak_memory / 1024 / 1024:9.1f}"
+                if result.peak_memory is not None
+                else f"{'-':>9}"
+            )
+            print(
+                f"{result.stage:<30} {result.rows:>10} {result.seconds:>10.3f} "
+                f"{result.rows_per_second:>12.0f} {peak_memory}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+import asyncio
+import concurrent.futures
+import io
+import threading
+import typing as tp
+
+from src import schemas as pipeline_schemas
+from src.extractor import reader
+from src.extractor import schemas as extractor_schemas
+from src.extractor.exceptions import InvalidCsvSchemaError
+from src.grouper import catalog as catalog_grouper
+from src.grouper import hierarchy
+from src.loader import encoders as loader_enc
+from src.loader import loader
+from src.loader import schemas as loader_schemas
+from src.transformer import cache as mapping_cache
+from src.transformer import transformer
+
+# Items in flight between two stages: blocks of records, batches of rows
+# or chunks of output. A full queue suspends the stage that feeds it.
+STAGE_QUEUE_SIZE = 8
+OUTPUT_CHUNK_SIZE = 64 * 1024
+# How often an encoder waiting on a full queue checks whether writing stopped
+OUTPUT_POLL_SECONDS = 0.1
+
+
+class AsyncSink(tp.Protocol):
+    """An asynchronous byte sink, e.g. a response body or an object upload."""
+
+    async def write(self, data: bytes) -> None: ...
+
+
+async def run_pipeline_async(
+    source: tp.AsyncIterable[bytes],
+    source_meta: extractor_schemas.CsvStreamMeta,
+    mappings_file: reader.CsvFileReaderMeta,
+    sink: AsyncSink,
+    output: loader_schemas.OutputMeta | None = None,
+    options: pipeline_schemas.PipelineOptions | None = None,
+    executor: concurrent.futures.ThreadPoolExecutor | None = None,
+) -> None:
+    """Run the ETL pipeline on an asynchronous byte stream.
+
+    Reading, transforming, grouping and writing run as asyncio tasks joined
+    by bounded queues, so a slow stage suspends the stages feeding it and
+    memory stays bounded while many streams are processed concurrently.
+    Parsing, transforming, grouping and encoding run on the executor, so
+    the event loop stays responsive. The output is the same as `run_pipeline`
+    writes for the same source.
+
+    Args:
+        source (tp.AsyncIterable[bytes]): Bytes of the source CSV, in blocks
+            of any size.
+        source_meta (extractor_schemas.CsvStreamMeta): Metadata for the source.
+        mappings_file (reader.CsvFileReaderMeta): Metadata for the mappings
+            CSV file.
+        sink (AsyncSink): The sink to write the encoded output to.
+        output (loader_schemas.OutputMeta | None): The format and encoding of
+            the output; its path is not used. Defaults to JSON.
+        options (pipeline_schemas.PipelineOptions | None): Pipeline options.
+            Only `drop_columns`, `mappings_cache`, `group_by` and
+            `default_share` apply.
+        executor (concurrent.futures.ThreadPoolExecutor | None): The executor
+            for CPU-heavy steps. Defaults to the executor of the event loop.
+
+    Raises:
+        ValueError: If the output format is binary, or options other than
+            `drop_columns`, `mappings_cache`, `group_by` and `default_share`
+            are set.
+        InvalidCsvSchemaError: If the header of the source is missing or
+            does not contain required fields.
+    """
+    if output is None:
+        output = loader_schemas.OutputMeta()
+    if options is None:
+        options = pipeline_schemas.PipelineOptions()
+    if output.format is loader_schemas.OutputFormat.BINARY:
+        raise ValueError("Binary output is not supported by the async pipeline")
+    if (
+        options.workers > 1
+        or options.max_memory is not None
+        or options.sorted_input
+        or options.store is not None
+        or options.stats
+        or options.trace_memory
+    ):
+        raise ValueError(
+            "Only drop_columns, mappings_cache, group_by and default_share options "
+            "are supported by the async pipeline"
+        )
+
+    loop = asyncio.get_running_loop()
+    mapping = await loop.run_in_executor(
+        executor, mapping_cache.load_mapping, mappings_file, options.mappings_cache
+    )
+
+    blocks: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=STAGE_QUEUE_SIZE)
+    batches: asyncio.Queue[list[reader.Row] | None] = asyncio.Queue(
+        maxsize=STAGE_QUEUE_SIZE
+    )
+    catalog = catalog_grouper.Catalog.new()
+    await _run_stages(
+        _read_blocks(source=source, blocks=blocks),
+        _transform_blocks(
+            blocks=blocks,
+            batches=batches,
+            mapping=mapping,
+            source_meta=source_meta,
+            drop_columns=options.drop_columns,
+            executor=executor,
+        ),
+        _group_batches(batches=batches, catalog=catalog, executor=executor),
+    )
+
+    await loop.run_in_executor(
+        executor,
+        catalog_grouper.consolidate_common_attributes,
+        catalog,
+        options.default_share,
+    )
+    output_catalog: catalog_grouper.Catalog | hierarchy.GroupedCatalog = catalog
+    if len(options.group_by) > 1:
+        output_catalog = hierarchy.GroupedCatalog(
+            catalog=catalog, group_by=options.group_by[1:]
+        )
+    await _write_catalog(
+        catalog=output_catalog, output=output, sink=sink, executor=executor
+    )
+
+
+async def _run_stages(*stages: tp.Coroutine[tp.Any, tp.Any, None]) -> None:
+    # Fail with the error of the first failed stage, cancelling the others,
+    # which may wait on queues that are never consumed or fed again
+    tasks = [asyncio.ensure_future(stage) for stage in stages]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def _read_blocks(
+    source: tp.AsyncIterable[bytes], blocks: asyncio.Queue[bytes | None]
+) -> None:
+    splitter = reader.RecordSplitter()
+    async for data in source:
+        if block := splitter.feed(data):
+            await blocks.put(block)
+    if block := splitter.close():
+        await blocks.put(block)
+    await blocks.put(None)
+
+
+async def _transform_blocks(
+    blocks: asyncio.Queue[bytes | None],
+    batches: asyncio.Queue[list[reader.Row] | None],
+    mapping: transformer.Mapping,
+    source_meta: extractor_schemas.CsvStreamMeta,
+    drop_columns: tuple[str, ...],
+    executor: concurrent.futures.ThreadPoolExecutor | None,
+) -> None:
+    loop = asyncio.get_running_loop()
+    header: list[str] = []
+    transform: transformer.TupleTransform | None = None
+
+    while (block := await blocks.get()) is not None:
+        records = block
+        if transform is None:
+            header, records = await loop.run_in_executor(
+                executor,
+                reader.split_header,
+                block,
+                source_meta,
+                extractor_schemas.CsvSourceSchemaRequired,
+            )
+            transform = transformer.TupleTransform.compile(
+                plan=mapping.plan, fieldnames=header, drop_columns=drop_columns
+            )
+
+        rows = await loop.run_in_executor(
+            executor, _transform_block, transform, records, source_meta, header
+        )
+        if rows:
+            await batches.put(rows)
+
+    if transform is None:
+        raise InvalidCsvSchemaError("Header fieldnames are missing")
+    await batches.put(None)
+
+
+async def _group_batches(
+    batches: asyncio.Queue[list[reader.Row] | None],
+    catalog: catalog_grouper.Catalog,
+    executor: concurrent.futures.ThreadPoolExecutor | None,
+) -> None:
+    loop = asyncio.get_running_loop()
+    # Batches are grouped one at a time, so the catalog is never shared
+    # by two threads
+    while (rows := await batches.get()) is not None:
+        await loop.run_in_executor(executor, _group_rows, catalog, rows)
+
+
+async def _write_catalog(
+    catalog: catalog_grouper.Catalog | hierarchy.GroupedCatalog,
+    output: loader_schemas.OutputMeta,
+    sink: AsyncSink,
+    executor: concurrent.futures.ThreadPoolExecutor | None,
+) -> None:
+    loop = asyncio.get_running_loop()
+    # The encoder runs on the executor, so the queue is bounded by a
+    # semaphore it can wait on: a slot is taken per chunk and given back
+    # once the chunk is written
+    chunks: asyncio.Queue[str | None] = asyncio.Queue()
+    slots = threading.Semaphore(STAGE_QUEUE_SIZE)
+    stopped = threading.Event()
+
+    def put(chunk: str | None) -> None:
+        while not slots.acquire(timeout=OUTPUT_POLL_SECONDS):
+            if stopped.is_set():
+                raise _WriteStoppedError
+        loop.call_soon_threadsafe(chunks.put_nowait, chunk)
+
+    def encode() -> None:
+        try:
+            with _ChunkStream(put) as stream:
+                loader.write_catalog(
+                    catalog=catalog,
+                    stream=stream,
+                    output=output,
+                    encoder_cls=loader_enc.DataClassJsonEncoder,
+                )
+        finally:
+            if not stopped.is_set():
+                put(None)
+
+    encoding = loop.run_in_executor(executor, encode)
+    try:
+        while (chunk := await chunks.get()) is not None:
+            await sink.write(chunk.encode(output.encoding))
+            slots.release()
+    except BaseException:
+        # Stop the encoder, which may wait for a slot
+        stopped.set()
+        encoding.add_done_callback(_ignore_result)
+        raise
+    await encoding
+
+
+class _WriteStoppedError(Exception):
+    pass
+
+
+def _ignore_result(future: asyncio.Future[tp.Any]) -> None:
+    # Retrieve the error of an abandoned future, so it is not logged
+    if not future.cancelled():
+        future.exception()
+
+
+class _ChunkStream(io.StringIO):
+    """A text stream handing its content over in chunks of bounded size."""
+
+    def __init__(self, put: tp.Callable[[str], None]) -> None:
+        super().__init__()
+        self._put = put
+
+    def write(self, s: str) -> int:
+        written = super().write(s)
+        if self.tell() >= OUTPUT_CHUNK_SIZE:
+            self.flush()
+        return written
+
+    def flush(self) -> None:
+        if not self.closed and self.tell():
+            self._put(self.getvalue())
+            self.seek(0)
+            self.truncate()
+
+    def close(self) -> None:
+        self.flush()
+        super().close()
+
+
+def _transform_block(
+    transform: transformer.TupleTransform,
+    block: bytes,
+    source_meta: extractor_schemas.CsvStreamMeta,
+    fieldnames: list[str],
+) -> list[reader.Row]:
+    rows = reader.read_block(
+        block, stream_meta=source_meta, fieldnames=fieldnames, columns=transform.columns
+    )
+    return list(transform.apply_batches(rows))
+
+
+def _group_rows(catalog: catalog_grouper.Catalog, rows: list[reader.Row]) -> None:
+    for row in rows:
+        catalog.add(flat_data_row=row)
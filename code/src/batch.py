@@ -0,0 +1,331 @@
+import argparse
+import collections
+import concurrent.futures
+import dataclasses
+import json
+import os
+import pathlib
+import sys
+import time
+import typing as tp
+
+from src import cli
+from src import main as pipeline
+from src import schemas as pipeline_schemas
+from src.extractor import reader
+from src.loader import schemas as loader_schemas
+from src.transformer import cache as mapping_cache
+from src.transformer import transformer
+
+MANIFEST_COMMENT = "#"
+
+# Set once per worker process by `_init_worker`
+_worker_mapping: transformer.Mapping | None = None
+
+
+@dataclasses.dataclass(frozen=True)
+class FileResult:
+    """Result of the pipeline run on one source file of a batch.
+
+    Attributes:
+        source (pathlib.Path): The source file.
+        output (pathlib.Path): The output file. It is removed on failure.
+        seconds (float): Wall time of the run on a worker.
+        error (str | None): The error of a failed run, or None on success.
+    """
+
+    source: pathlib.Path
+    output: pathlib.Path
+    seconds: float
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclasses.dataclass(frozen=True)
+class BatchSummary:
+    """Results of a batch, in the order of source files.
+
+    Attributes:
+        results (tuple[FileResult, ...]): Results of every source file.
+    """
+
+    results: tuple[FileResult, ...]
+
+    @property
+    def failed(self) -> list[FileResult]:
+        return [result for result in self.results if not result.ok]
+
+    def to_dict(self) -> dict[str, tp.Any]:
+        """Represent the summary as a dictionary for serialization.
+
+        Returns:
+            dict[str, tp.Any]: Counts of files, and the errors of failed files.
+        """
+        failed = self.failed
+        return {
+            "files": len(self.results),
+            "succeeded": len(self.results) - len(failed),
+            "failed": len(failed),
+            "failures": [
+                {"source": str(result.source), "error": result.error}
+                for result in failed
+            ],
+        }
+
+
+def collect_sources(path: pathlib.Path) -> list[pathlib.Path]:
+    """Collect the source files of a batch from a directory or a manifest.
+
+    A directory contributes its CSV files, compressed or not, sorted by
+    name. A manifest is a
+    text file with one source path per line, relative to the manifest;
+    blank lines and lines starting with '#' are skipped.
+
+    Args:
+        path (pathlib.Path): The directory or the manifest.
+
+    Returns:
+        list[pathlib.Path]: The source files.
+    """
+    if path.is_dir():
+        return sorted(
+            source
+            for source in path.iterdir()
+            if reader.csv_stem(source) is not None and source.is_file()
+        )
+
+    sources = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if line and not line.startswith(MANIFEST_COMMENT):
+            sources.append(path.parent / line)
+    return sources
+
+
+def duplicate_stems(sources: tp.Iterable[pathlib.Path]) -> list[str]:
+    """Find output stems shared by several source files of a batch.
+
+    Catalogs are named by the stem of their source file, so sources with the
+    same stem, e.g. in different directories of a manifest, would overwrite
+    each other's output.
+
+    Args:
+        sources (tp.Iterable[pathlib.Path]): The source files.
+
+    Returns:
+        list[str]: The shared stems, in the order of their first source.
+    """
+    counts = collections.Counter(_output_stem(source) for source in sources)
+    return [stem for stem, count in counts.items() if count > 1]
+
+
+def run_batch(
+    sources: tp.Sequence[pathlib.Path],
+    mappings_file: reader.CsvFileReaderMeta,
+    output_dir: pathlib.Path,
+    delimiter: str = cli.CSV_DELIMITER_DEFAULT,
+    output: loader_schemas.OutputMeta | None = None,
+    options: pipeline_schemas.PipelineOptions | None = None,
+    concurrency: int | None = None,
+) -> BatchSummary:
+    """Run the ETL pipeline on many source files with one mappings file.
+
+    The mapping is built once and sent once to every worker process, which
+    runs the pipeline on one source file at a time, so the interpreter start,
+    imports and the mapping build are paid per worker rather than per file.
+    Every catalog is written to `<output_dir>/<source stem>.<format>`, with the
+    stem of a compressed source also without `.csv`.
+    A failure of a file is recorded in the summary and does not stop the
+    batch; its partial output is removed.
+
+    Args:
+        sources (tp.Sequence[pathlib.Path]): The source CSV files. Their
+            stems must be unique.
+        mappings_file (reader.CsvFileReaderMeta): Metadata for the mappings
+            CSV file.
+        output_dir (pathlib.Path): The directory to write catalogs to.
+            It is created on demand.
+        delimiter (str): The delimiter of the source files.
+        output (loader_schemas.OutputMeta | None): The format of the output;
+            its path is not used. Defaults to JSON.
+        options (pipeline_schemas.PipelineOptions | None): Pipeline options
+            of every file. Defaults to grouping in memory.
+        concurrency (int | None): The number of worker processes. Defaults
+            to the number of CPUs.
+
+    Raises:
+        ValueError: If stems of source files are not unique, or options use
+            worker processes or a catalog store.
+
+    Returns:
+        BatchSummary: Results of every source file.
+    """
+    if output is None:
+        output = loader_schemas.OutputMeta()
+    if options is None:
+        options = pipeline_schemas.PipelineOptions()
+    if options.workers > 1 or options.store is not None:
+        raise ValueError("Batches do not support worker processes or a store")
+
+    duplicates = duplicate_stems(sources)
+    if duplicates:
+        raise ValueError(
+            "Source files of a batch must have unique names, "
+            f"got duplicates: {', '.join(duplicates)}"
+        )
+    outputs = [
+        output_dir / f"{_output_stem(source)}.{output.format}" for source in sources
+    ]
+
+    if not sources:
+        return BatchSummary(results=())
+
+    mapping = mapping_cache.load_mapping(
+        mappings_file=mappings_file, cache_directory=options.mappings_cache
+    )
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    results: dict[pathlib.Path, FileResult] = {}
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=min(concurrency or os.cpu_count() or 1, len(sources)),
+        initializer=_init_worker,
+        initargs=(mapping,),
+    ) as executor:
+        futures = {
+            executor.submit(
+                _run_file,
+                source_file=reader.CsvFileReaderMeta(path=source, delimiter=delimiter),
+                mappings_file=mappings_file,
+                output=dataclasses.replace(output, path=output_path),
+                options=options,
+            ): (source, output_path)
+            for source, output_path in zip(sources, outputs, strict=True)
+        }
+        for future in concurrent.futures.as_completed(futures):
+            source, output_path = futures[future]
+            try:
+                results[source] = future.result()
+            except Exception as e:  # noqa: BLE001
+                # The worker process died, e.g. of running out of memory
+                results[source] = FileResult(
+                    source=source, output=output_path, seconds=0.0, error=repr(e)
+                )
+
+    return BatchSummary(results=tuple(results[source] for source in sources))
+
+
+def _output_stem(source: pathlib.Path) -> str:
+    return reader.csv_stem(source) or source.stem
+
+
+def _init_worker(mapping: transformer.Mapping) -> None:
+    global _worker_mapping
+    _worker_mapping = mapping
+
+
+def _run_file(
+    source_file: reader.CsvFileReaderMeta,
+    mappings_file: reader.CsvFileReaderMeta,
+    output: loader_schemas.OutputMeta,
+    options: pipeline_schemas.PipelineOptions,
+) -> FileResult:
+    if _worker_mapping is None:
+        raise RuntimeError("Worker process is not initialized")
+    if output.path is None:
+        raise ValueError("Output path is required")
+
+    started = time.perf_counter()
+    try:
+        pipeline.run_pipeline(
+            source_file=source_file,
+            mappings_file=mappings_file,
+            output=output,
+            options=options,
+            mapping=_worker_mapping,
+        )
+    except Exception as e:  # noqa: BLE001
+        output.path.unlink(missing_ok=True)
+        return FileResult(
+            source=source_file.path,
+            output=output.path,
+            seconds=time.perf_counter() - started,
+            error=repr(e),
+        )
+
+    return FileResult(
+        source=source_file.path,
+        output=output.path,
+        seconds=time.perf_counter() - started,
+    )
+
+
+def main() -> None:
+    """Parse CLI args, run the ETL pipeline on a batch and print the summary."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-i",
+        "--input",
+        type=pathlib.Path,
+        help="Directory of source CSV files, or a manifest with one source "
+        "path per line",
+        required=True,
+    )
+    parser.add_argument(
+        "-m",
+        "--mappings",
+        type=pathlib.Path,
+        help="Path to the mappings file",
+        required=True,
+    )
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        type=pathlib.Path,
+        help="Directory to write one catalog per source file to",
+        required=True,
+    )
+    parser.add_argument(
+        "-c",
+        "--concurrency",
+        type=int,
+        help="Number of worker processes (default: number of CPUs)",
+        required=False,
+        default=None,
+    )
+    cli.add_options(parser)
+    args = parser.parse_args()
+    output, options = cli.options_from_args(parser=parser, args=args)
+    if options.workers > 1 or options.store is not None:
+        parser.error("argument -w/--workers, --store: not allowed in batches")
+    if args.concurrency is not None and args.concurrency < 1:
+        parser.error("argument -c/--concurrency: must be at least 1")
+    sources = collect_sources(args.input)
+    duplicates = duplicate_stems(sources)
+    if duplicates:
+        parser.error(
+            "argument -i/--input: source files must have unique names, "
+            f"got duplicates: {', '.join(duplicates)}"
+        )
+
+    summary = run_batch(
+        sources=sources,
+        mappings_file=reader.CsvFileReaderMeta(
+            path=args.mappings, delimiter=args.delimiter
+        ),
+        output_dir=args.output_dir,
+        delimiter=args.delimiter,
+        output=output,
+        options=options,
+        concurrency=args.concurrency,
+    )
+    json.dump(summary.to_dict(), sys.stdout)
+    sys.stdout.write("\n")
+    if summary.failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,320 @@
+import argparse
+import dataclasses
+import pathlib
+
+from src import schemas as pipeline_schemas
+from src.extractor import reader
+from src.extractor import schemas as extractor_schemas
+from src.grouper import catalog as catalog_grouper
+from src.loader import schemas as loader_schemas
+
+CSV_DELIMITER_DEFAULT = ";"
+BYTES_IN_MB = 1024 * 1024
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the parser of CLI args of the pipeline.
+
+    Returns:
+        argparse.ArgumentParser: The parser, to extend with more args.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-s",
+        "--source",
+        type=pathlib.Path,
+        help="Path to the source file, optionally compressed with gzip, bzip2 or xz",
+        required=True,
+    )
+    parser.add_argument(
+        "-m",
+        "--mappings",
+        type=pathlib.Path,
+        help="Path to the mappings file",
+        required=True,
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        type=pathlib.Path,
+        help="Path to the output file (default: stdout)",
+        required=False,
+        default=None,
+    )
+    add_options(parser)
+    return parser
+
+
+def add_options(parser: argparse.ArgumentParser) -> None:
+    """Add args of the output and of pipeline options to a parser.
+
+    They are shared by entry points, which turn them into options with
+    `options_from_args`.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser to extend.
+    """
+    parser.add_argument(
+        "-d",
+        "--delimiter",
+        type=str,
+        help="Delimiter",
+        required=False,
+        default=CSV_DELIMITER_DEFAULT,
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        type=loader_schemas.OutputFormat,
+        choices=list(loader_schemas.OutputFormat),
+        help="Output format: a single JSON document, NDJSON with a header line "
+        "for catalog attributes followed by one line per article, or a binary "
+        "columnar catalog file",
+        required=False,
+        default=loader_schemas.OutputFormat.JSON,
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write JSON without indentation",
+    )
+    parser.add_argument(
+        "--layout",
+        type=loader_schemas.OutputLayout,
+        choices=list(loader_schemas.OutputLayout),
+        help="Layout of variations: an object per variation, or a table per "
+        "article with the variation keys as columns and a row of values per "
+        "variation",
+        required=False,
+        default=loader_schemas.OutputLayout.OBJECTS,
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        help="Number of worker processes to read, transform and group "
+        "shards of the source file",
+        required=False,
+        default=1,
+    )
+    parser.add_argument(
+        "--max-memory",
+        type=int,
+        help="Memory budget for grouping, in MB. If the source file does not fit, "
+        "rows are spilled to temp files and grouped partition by partition",
+        required=False,
+        default=None,
+    )
+    parser.add_argument(
+        "--sorted-input",
+        action="store_true",
+        help="Source rows are sorted by article number in ascending order: emit every article as "
+        "soon as it is complete instead of keeping the whole catalog in memory",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Write wall and CPU time, throughput and peak memory of pipeline "
+        "stages to stderr as a JSON line, with progress lines while reading",
+    )
+    parser.add_argument(
+        "--trace-memory",
+        action="store_true",
+        help="Like --stats, and also measure peak memory allocated by every "
+        "phase with tracemalloc, which slows the pipeline down",
+    )
+    parser.add_argument(
+        "--drop-columns",
+        type=lambda value: tuple(column for column in value.split(",") if column),
+        help="Comma-separated source columns to leave out of the output. "
+        "They are not read unless a mapping reads them",
+        required=False,
+        default=(),
+    )
+    parser.add_argument(
+        "--mappings-cache",
+        type=pathlib.Path,
+        help="Directory to cache compiled mappings in, keyed by the content "
+        "of the mappings file. Later runs with the same file load them",
+        required=False,
+        default=None,
+    )
+    parser.add_argument(
+        "--store",
+        type=pathlib.Path,
+        help="Path to a SQLite catalog store. The source file is applied to "
+        "the stored catalog as a delta, and the updated catalog is output",
+        required=False,
+        default=None,
+    )
+    parser.add_argument(
+        "--group-by",
+        type=lambda value: tuple(key for key in value.split(",") if key),
+        help="Comma-separated grouping hierarchy, starting with "
+        f"'{catalog_grouper.GROUPER_ROW_NAME}', e.g. "
+        f"'{catalog_grouper.GROUPER_ROW_NAME},color_code'. Variations of every "
+        "article are split into nested groups with their own common attributes",
+        required=False,
+        default=(catalog_grouper.GROUPER_ROW_NAME,),
+    )
+    parser.add_argument(
+        "--default-share",
+        type=float,
+        help="Lift the most frequent value of an attribute to its article as a "
+        "default when at least this share of the variations have it, e.g. 0.8. "
+        "Other variations keep an override",
+        required=False,
+        default=None,
+    )
+
+
+def from_args(
+    parser: argparse.ArgumentParser, args: argparse.Namespace
+) -> tuple[
+    extractor_schemas.CsvFileReaderMeta,
+    extractor_schemas.CsvFileReaderMeta,
+    loader_schemas.OutputMeta,
+    pipeline_schemas.PipelineOptions,
+]:
+    """Validate parsed CLI args and turn them into pipeline arguments.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser, to report errors with.
+        args (argparse.Namespace): The parsed args.
+
+    Returns:
+        tuple[extractor_schemas.CsvFileReaderMeta, extractor_schemas.CsvFileReaderMeta,
+            loader_schemas.OutputMeta, pipeline_schemas.PipelineOptions]:
+            Arguments of `run_pipeline`.
+    """
+    source = pathlib.Path(args.source)
+    output, options = options_from_args(parser=parser, args=args, source=source)
+    return (
+        extractor_schemas.CsvFileReaderMeta(path=source, delimiter=args.delimiter),
+        extractor_schemas.CsvFileReaderMeta(
+            path=pathlib.Path(args.mappings), delimiter=args.delimiter
+        ),
+        dataclasses.replace(output, path=args.output),
+        options,
+    )
+
+
+def options_from_args(
+    parser: argparse.ArgumentParser,
+    args: argparse.Namespace,
+    source: pathlib.Path | None = None,
+) -> tuple[loader_schemas.OutputMeta, pipeline_schemas.PipelineOptions]:
+    """Validate parsed args of `add_options` and turn them into options.
+
+    Args:
+        parser (argparse.ArgumentParser): The parser, to report errors with.
+        args (argparse.Namespace): The parsed args.
+        source (pathlib.Path | None): The source file the options apply to,
+            or None if there are many, e.g. in batches.
+
+    Returns:
+        tuple[loader_schemas.OutputMeta, pipeline_schemas.PipelineOptions]:
+            The output, without a path, and the pipeline options.
+    """
+    output = loader_schemas.OutputMeta(
+        format=args.format, compact=args.compact, layout=args.layout
+    )
+    options = pipeline_schemas.PipelineOptions(
+        workers=args.workers,
+        max_memory=(
+            args.max_memory * BYTES_IN_MB if args.max_memory is not None else None
+        ),
+        sorted_input=args.sorted_input,
+        stats=args.stats,
+        trace_memory=args.trace_memory,
+        drop_columns=args.drop_columns,
+        mappings_cache=args.mappings_cache,
+        store=args.store,
+        group_by=args.group_by,
+        default_share=args.default_share,
+    )
+    try:
+        validate_options(output=output, options=options, source=source)
+    except ValueError as e:
+        parser.error(str(e))
+    return output, options
+
+
+def validate_options(
+    output: loader_schemas.OutputMeta,
+    options: pipeline_schemas.PipelineOptions,
+    source: pathlib.Path | None = None,
+) -> None:
+    """Validate a combination of output and pipeline options.
+
+    Every entry point, e.g. the CLI, batches and the daemon, accepts the
+    same combinations.
+
+    Args:
+        output (loader_schemas.OutputMeta): The output.
+        options (pipeline_schemas.PipelineOptions): The pipeline options.
+        source (pathlib.Path | None): The source file, to validate options
+            against its compression. Not validated if None or missing.
+
+    Raises:
+        ValueError: If an option is invalid or not allowed with another one.
+            The message names the CLI args of the options.
+    """
+    row_name = catalog_grouper.GROUPER_ROW_NAME
+    if row_name in options.drop_columns:
+        raise ValueError(f"argument --drop-columns: '{row_name}' cannot be dropped")
+    if not options.group_by or options.group_by[0] != row_name:
+        raise ValueError(f"argument --group-by: must start with '{row_name}'")
+    if len(set(options.group_by)) != len(options.group_by):
+        raise ValueError("argument --group-by: keys must be unique")
+    if set(options.group_by) & set(options.drop_columns):
+        raise ValueError("argument --group-by: keys cannot be dropped")
+    if options.default_share is not None:
+        if not 0 < options.default_share <= 1:
+            raise ValueError("argument --default-share: must be in (0, 1]")
+        if len(options.group_by) > 1 or options.store is not None:
+            raise ValueError(
+                "argument --default-share: not allowed with --group-by or --store"
+            )
+        if output.layout is loader_schemas.OutputLayout.TABLE:
+            # Null already overrides defaults of variations without them
+            raise ValueError(
+                "argument --default-share: not allowed with --layout table"
+            )
+    if output.format is loader_schemas.OutputFormat.BINARY and (
+        len(options.group_by) > 1 or output.layout is loader_schemas.OutputLayout.TABLE
+    ):
+        raise ValueError(
+            "argument -f/--format: bin is not allowed with --group-by or --layout table"
+        )
+    if options.workers < 1:
+        raise ValueError("argument -w/--workers: must be at least 1")
+    if options.max_memory is not None and options.max_memory < 1:
+        raise ValueError("argument --max-memory: must be at least 1")
+    if options.max_memory is not None and options.workers > 1:
+        # Spilling runs in a single process
+        raise ValueError("argument --max-memory: not allowed with -w/--workers")
+    if options.workers > 1 and source is not None and _is_compressed(source):
+        # Records of a compressed file cannot be split into chunks
+        raise ValueError(
+            "argument -w/--workers: not allowed with a compressed source file"
+        )
+    if options.sorted_input and (options.workers > 1 or options.max_memory is not None):
+        raise ValueError(
+            "argument --sorted-input: not allowed with -w/--workers or --max-memory"
+        )
+    if options.store is not None and (
+        options.workers > 1 or options.max_memory is not None or options.sorted_input
+    ):
+        raise ValueError(
+            "argument --store: not allowed with -w/--workers, --max-memory "
+            "or --sorted-input"
+        )
+
+
+def _is_compressed(path: pathlib.Path) -> bool:
+    try:
+        return reader.detect_compression(path) is not None
+    except OSError:
+        # A missing source is reported when it is read
+        return False
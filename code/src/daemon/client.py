@@ -0,0 +1,126 @@
+import dataclasses
+import json
+import os
+import pathlib
+import shutil
+import socket
+import sys
+import tempfile
+
+from src import cli
+from src.daemon import schemas as daemon_schemas
+from src.daemon.exceptions import DaemonError
+from src.extractor import schemas as extractor_schemas
+from src.loader import schemas as loader_schemas
+
+
+def submit(
+    job: daemon_schemas.Job,
+    socket_path: pathlib.Path = daemon_schemas.SOCKET_PATH_DEFAULT,
+) -> daemon_schemas.JobResult:
+    """Submit a job to a running daemon and wait for its result.
+
+    Args:
+        job (daemon_schemas.Job): The job, with absolute paths.
+        socket_path (pathlib.Path): The socket the daemon listens on.
+
+    Raises:
+        DaemonError: If Unix domain sockets are not available, or the daemon
+            does not answer.
+
+    Returns:
+        daemon_schemas.JobResult: The result of the job.
+    """
+    if sys.platform == "win32":
+        raise DaemonError("Unix domain sockets are not available on Windows")
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        try:
+            connection.connect(str(socket_path))
+        except OSError as e:
+            raise DaemonError(f"No daemon listens on {socket_path}: {e}") from e
+        connection.sendall(json.dumps(job.to_dict()).encode() + b"\n")
+        with connection.makefile("rb") as response:
+            line = response.readline()
+
+    if not line:
+        raise DaemonError("The daemon closed the connection without a result")
+    return daemon_schemas.JobResult.from_dict(json.loads(line))
+
+
+def main() -> None:
+    """Parse CLI args like `src.main` does and run the job on the daemon.
+
+    Without an output path, the daemon writes to a temp file, which is
+    copied to stdout. Statistics are written to stderr, as by `src.main`.
+    """
+    parser = cli.build_parser()
+    parser.add_argument(
+        "--socket",
+        type=pathlib.Path,
+        help="Path of the Unix domain socket the daemon listens on",
+        required=False,
+        default=daemon_schemas.SOCKET_PATH_DEFAULT,
+    )
+    args = parser.parse_args()
+    source_file, mappings_file, output, options = cli.from_args(
+        parser=parser, args=args
+    )
+
+    temp_output = None
+    output_path = output.path
+    if output_path is None:
+        fd, temp_name = tempfile.mkstemp(suffix=f".{output.format}")
+        os.close(fd)
+        output_path = temp_output = pathlib.Path(temp_name)
+
+    try:
+        result = submit(
+            job=daemon_schemas.Job(
+                source_file=_absolute(source_file),
+                mappings_file=_absolute(mappings_file),
+                output=dataclasses.replace(output, path=output_path.absolute()),
+                options=dataclasses.replace(
+                    options,
+                    store=options.store.absolute() if options.store else None,
+                ),
+            ),
+            socket_path=args.socket,
+        )
+    except DaemonError as e:
+        sys.stderr.write(f"{e}\n")
+        sys.exit(1)
+    else:
+        if result.status is daemon_schemas.JobStatus.OK and temp_output is not None:
+            _copy_to_stdout(path=temp_output, output=output)
+    finally:
+        if temp_output is not None:
+            temp_output.unlink(missing_ok=True)
+
+    if result.stats is not None:
+        sys.stderr.write(json.dumps({"stats": result.stats}) + "\n")
+    if result.status is daemon_schemas.JobStatus.ERROR:
+        sys.stderr.write(f"{result.error}\n")
+        sys.exit(1)
+
+
+def _copy_to_stdout(path: pathlib.Path, output: loader_schemas.OutputMeta) -> None:
+    if output.format is loader_schemas.OutputFormat.BINARY:
+        with open(path, "rb") as binary_stream:
+            shutil.copyfileobj(binary_stream, sys.stdout.buffer)
+        sys.stdout.buffer.flush()
+        return
+
+    with open(path, encoding=output.encoding) as stream:
+        shutil.copyfileobj(stream, sys.stdout)
+    sys.stdout.flush()
+
+
+def _absolute(
+    file_meta: extractor_schemas.CsvFileReaderMeta,
+) -> extractor_schemas.CsvFileReaderMeta:
+    return dataclasses.replace(file_meta, path=file_meta.path.absolute())
+
+
+if __name__ == "__main__":
+    main()
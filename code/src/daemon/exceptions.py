@@ -0,0 +1,9 @@
+from src.exceptions import ApplicationError
+
+
+class DaemonError(ApplicationError):
+    message = "Daemon error"
+
+
+class InvalidJobError(DaemonError):
+    message = "Invalid job"
@@ -0,0 +1,149 @@
+import dataclasses
+import enum
+import pathlib
+import tempfile
+import typing as tp
+
+from src import schemas as pipeline_schemas
+from src.daemon.exceptions import InvalidJobError
+from src.extractor import schemas as extractor_schemas
+from src.loader import schemas as loader_schemas
+
+SOCKET_PATH_DEFAULT = pathlib.Path(tempfile.gettempdir()) / "pricat-pipeline.sock"
+
+
+class JobStatus(enum.StrEnum):
+    OK = "ok"
+    ERROR = "error"
+
+
+@dataclasses.dataclass(frozen=True)
+class Job:
+    """A pipeline run requested from the daemon.
+
+    Paths must be absolute: the daemon does not share the working directory
+    of its clients.
+
+    Attributes:
+        source_file (extractor_schemas.CsvFileReaderMeta): Metadata for the
+            source CSV file.
+        mappings_file (extractor_schemas.CsvFileReaderMeta): Metadata for the
+            mappings CSV file.
+        output (loader_schemas.OutputMeta): Metadata for the output. The path
+            is required.
+        options (pipeline_schemas.PipelineOptions): Pipeline options.
+    """
+
+    source_file: extractor_schemas.CsvFileReaderMeta
+    mappings_file: extractor_schemas.CsvFileReaderMeta
+    output: loader_schemas.OutputMeta
+    options: pipeline_schemas.PipelineOptions = dataclasses.field(
+        default_factory=pipeline_schemas.PipelineOptions
+    )
+
+    def to_dict(self) -> dict[str, tp.Any]:
+        """Represent the job as a JSON-serializable dictionary.
+
+        Returns:
+            dict[str, tp.Any]: The job, with paths as strings.
+        """
+        return _to_json(dataclasses.asdict(self))
+
+    @classmethod
+    def from_dict(cls, data: dict[str, tp.Any]) -> tp.Self:
+        """Read a job from its dictionary representation.
+
+        Args:
+            data (dict[str, tp.Any]): The job, as made by `to_dict`.
+
+        Raises:
+            InvalidJobError: If the dictionary does not represent a job.
+
+        Returns:
+            Job: The job.
+        """
+        try:
+            output = data["output"]
+            options = data.get("options", {})
+            return cls(
+                source_file=_file_meta(data["source_file"]),
+                mappings_file=_file_meta(data["mappings_file"]),
+                output=loader_schemas.OutputMeta(
+                    path=_path(output.get("path")),
+                    format=loader_schemas.OutputFormat(
+                        output.get("format", loader_schemas.OutputFormat.JSON)
+                    ),
+                    compact=bool(output.get("compact", False)),
+                    layout=loader_schemas.OutputLayout(
+                        output.get("layout", loader_schemas.OutputLayout.OBJECTS)
+                    ),
+                    encoding=output.get("encoding", "utf-8"),
+                ),
+                options=pipeline_schemas.PipelineOptions(
+                    **{
+                        **options,
+                        "drop_columns": tuple(options.get("drop_columns", ())),
+                        "group_by": tuple(
+                            options.get(
+                                "group_by", pipeline_schemas.PipelineOptions.group_by
+                            )
+                        ),
+                        "mappings_cache": _path(options.get("mappings_cache")),
+                        "store": _path(options.get("store")),
+                    }
+                ),
+            )
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            raise InvalidJobError(f"Invalid job: {e!r}") from e
+
+
+@dataclasses.dataclass(frozen=True)
+class JobResult:
+    """The outcome of a job.
+
+    Attributes:
+        status (JobStatus): Whether the job succeeded.
+        wall_seconds (float): Wall time of the job in the daemon.
+        error (str | None): The error of a failed job.
+        stats (dict[str, tp.Any] | None): Statistics of the pipeline, if
+            requested by `options.stats`.
+    """
+
+    status: JobStatus
+    wall_seconds: float = 0.0
+    error: str | None = None
+    stats: dict[str, tp.Any] | None = None
+
+    def to_dict(self) -> dict[str, tp.Any]:
+        return dataclasses.asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, tp.Any]) -> tp.Self:
+        return cls(
+            status=JobStatus(data["status"]),
+            wall_seconds=data.get("wall_seconds", 0.0),
+            error=data.get("error"),
+            stats=data.get("stats"),
+        )
+
+
+def _to_json(value: tp.Any) -> tp.Any:
+    if isinstance(value, dict):
+        return {key: _to_json(item) for key, item in value.items()}
+    if isinstance(value, list | tuple):
+        return [_to_json(item) for item in value]
+    if isinstance(value, pathlib.Path):
+        return str(value)
+    return value
+
+
+def _file_meta(data: dict[str, tp.Any]) -> extractor_schemas.CsvFileReaderMeta:
+    return extractor_schemas.CsvFileReaderMeta(
+        path=pathlib.Path(data["path"]),
+        delimiter=data["delimiter"],
+        encoding=data.get("encoding", "utf-8"),
+    )
+
+
+def _path(value: str | None) -> pathlib.Path | None:
+    return pathlib.Path(value) if value is not None else None
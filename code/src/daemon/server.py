@@ -0,0 +1,227 @@
+import argparse
+import io
+import json
+import pathlib
+import socket
+import socketserver
+import sys
+import threading
+import time
+
+from src import cli
+from src import main as pipeline
+from src.daemon import schemas as daemon_schemas
+from src.daemon.exceptions import DaemonError, InvalidJobError
+from src.extractor import reader
+from src.transformer import cache as mapping_cache
+from src.transformer import transformer
+
+# A job is a single JSON line, far below this size
+MAX_JOB_BYTES = 1024 * 1024
+
+
+class MappingRegistry:
+    """Compiled mappings kept in memory, rebuilt when their files change.
+
+    A mappings file is considered changed when its modification time or
+    size differ from when it was built.
+
+    Attributes:
+        builds (int): The number of mappings built so far.
+    """
+
+    def __init__(self) -> None:
+        self.builds = 0
+
+        self._mappings: dict[
+            reader.CsvFileReaderMeta, tuple[tuple[int, int], transformer.Mapping]
+        ] = {}
+        self._lock = threading.Lock()
+
+    def get(self, mappings_file: reader.CsvFileReaderMeta) -> transformer.Mapping:
+        """Get the compiled mapping of a mappings file, building it if needed.
+
+        Args:
+            mappings_file (reader.CsvFileReaderMeta): Metadata for the mappings
+                CSV file.
+
+        Returns:
+            transformer.Mapping: The built mapping.
+        """
+        stat = mappings_file.path.stat()
+        version = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._mappings.get(mappings_file)
+            if cached is None or cached[0] != version:
+                cached = (version, mapping_cache.build_mapping(mappings_file))
+                self._mappings[mappings_file] = cached
+                self.builds += 1
+            return cached[1]
+
+
+class PipelineDaemon:
+    """A long-running process running pipeline jobs with warm mappings.
+
+    Jobs are received over a Unix domain socket, one JSON line per
+    connection, and run on a thread per connection. The daemon answers with
+    a JSON line of the job result. Module imports and mapping builds are paid
+    once rather than per run.
+
+    Attributes:
+        socket_path (pathlib.Path): The path of the socket.
+        mappings (MappingRegistry): The compiled mappings.
+    """
+
+    def __init__(self, socket_path: pathlib.Path) -> None:
+        self.socket_path = socket_path
+        self.mappings = MappingRegistry()
+
+        self._server: socketserver.BaseServer | None = None
+
+    def run_job(self, job: daemon_schemas.Job) -> daemon_schemas.JobResult:
+        """Run a job, turning its errors into a failed result.
+
+        Args:
+            job (daemon_schemas.Job): The job.
+
+        Returns:
+            daemon_schemas.JobResult: The result of the job.
+        """
+        started = time.perf_counter()
+        stats_stream = io.StringIO() if job.options.stats else None
+        try:
+            if job.output.path is None:
+                raise InvalidJobError("Output path is required")
+            if job.options.trace_memory:
+                # tracemalloc is process-wide, so concurrent jobs would mix
+                raise InvalidJobError("Memory tracing is not supported by the daemon")
+            if job.options.workers > 1:
+                # Forking a process pool from a threaded server is unsafe
+                raise InvalidJobError(
+                    "Worker processes are not supported by the daemon"
+                )
+            # Jobs accept the same combinations of options as the CLI
+            cli.validate_options(output=job.output, options=job.options)
+
+            pipeline.run_pipeline(
+                source_file=job.source_file,
+                mappings_file=job.mappings_file,
+                output=job.output,
+                options=job.options,
+                mapping=self.mappings.get(job.mappings_file),
+                stats_stream=stats_stream,
+            )
+        except Exception as e:  # noqa: BLE001
+            return daemon_schemas.JobResult(
+                status=daemon_schemas.JobStatus.ERROR,
+                wall_seconds=time.perf_counter() - started,
+                error=f"{type(e).__name__}: {e}",
+            )
+
+        stats = None
+        if stats_stream is not None:
+            # Progress lines come first, the summary last
+            stats = json.loads(stats_stream.getvalue().splitlines()[-1])["stats"]
+        return daemon_schemas.JobResult(
+            status=daemon_schemas.JobStatus.OK,
+            wall_seconds=time.perf_counter() - started,
+            stats=stats,
+        )
+
+    def handle(self, line: bytes) -> bytes:
+        """Run a job received as a JSON line.
+
+        Args:
+            line (bytes): The job, as a JSON line.
+
+        Returns:
+            bytes: The result of the job, as a JSON line.
+        """
+        try:
+            job = daemon_schemas.Job.from_dict(json.loads(line))
+        except (InvalidJobError, ValueError) as e:
+            result = daemon_schemas.JobResult(
+                status=daemon_schemas.JobStatus.ERROR, error=str(e)
+            )
+        else:
+            result = self.run_job(job)
+        return json.dumps(result.to_dict()).encode() + b"\n"
+
+    def serve_forever(self) -> None:
+        """Listen on the socket and run jobs until `shutdown` is called.
+
+        Raises:
+            DaemonError: If Unix domain sockets are not available, or another
+                daemon listens on the socket.
+        """
+        if sys.platform == "win32":
+            raise DaemonError("Unix domain sockets are not available on Windows")
+        else:
+            if self.socket_path.exists():
+                if _is_listening(self.socket_path):
+                    raise DaemonError(f"A daemon is listening on {self.socket_path}")
+                # Left over by a daemon that did not shut down cleanly
+                self.socket_path.unlink()
+
+            server = _Server(str(self.socket_path), _Handler)
+            server.daemon = self
+            self._server = server
+            try:
+                server.serve_forever()
+            finally:
+                server.server_close()
+                self.socket_path.unlink(missing_ok=True)
+
+    def shutdown(self) -> None:
+        """Stop serving, from another thread, after running jobs finish."""
+        if self._server is not None:
+            self._server.shutdown()
+
+
+def _is_listening(socket_path: pathlib.Path) -> bool:
+    if sys.platform == "win32":
+        return False
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        try:
+            connection.connect(str(socket_path))
+        except OSError:
+            return False
+    return True
+
+
+if sys.platform != "win32":
+
+    class _Server(socketserver.ThreadingUnixStreamServer):
+        daemon_threads = True
+        daemon: PipelineDaemon
+
+    class _Handler(socketserver.StreamRequestHandler):
+        server: _Server
+
+        def handle(self) -> None:
+            line = self.rfile.readline(MAX_JOB_BYTES)
+            if line:
+                self.wfile.write(self.server.daemon.handle(line))
+
+
+def main() -> None:
+    """Parse CLI args and run the daemon until interrupted."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--socket",
+        type=pathlib.Path,
+        help="Path of the Unix domain socket to listen on",
+        required=False,
+        default=daemon_schemas.SOCKET_PATH_DEFAULT,
+    )
+    args = parser.parse_args()
+
+    daemon = PipelineDaemon(socket_path=args.socket)
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
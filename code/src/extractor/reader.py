@@ -1,19 +1,60 @@
+import bz2
+import contextlib
 import csv
 import dataclasses
+import io
+import itertools
+import lzma
+import mmap
+import operator
+import os
+import pathlib
+import queue
+import threading
 import typing as tp
+import zlib
 
 from src.extractor.exceptions import (
     CsvReaderError,
     InvalidCsvSchemaError,
 )
 from src.extractor.schemas import (
+    ByteRange,
+    Compression,
+    CsvChunk,
     CsvFileReaderMeta,
     CsvMappingSchemaRequired,
     CsvSourceSchemaRequired,
+    CsvStreamMeta,
 )
 
 CsvFieldnames = tp.Sequence[str]
 Row = dict[str, str]
+TupleRow = tuple[str, ...]
+
+NEWLINE = b"\n"
+QUOTE_CHAR = b'"'
+COUNT_BLOCK_SIZE = 1024 * 1024
+
+CSV_SUFFIX = ".csv"
+COMPRESSED_SUFFIXES = (".gz", ".bz2", ".xz")
+COMPRESSION_MAGIC = {
+    b"\x1f\x8b": Compression.GZIP,
+    b"BZh": Compression.BZIP2,
+    b"\xfd7zXZ\x00": Compression.XZ,
+}
+# CSV files compress about tenfold, or better for repetitive catalogs
+COMPRESSION_RATIO_ESTIMATE = 10
+# Added to window bits of zlib to read a gzip header and trailer
+GZIP_WBITS = 16
+# Blocks of decompressed bytes buffered ahead of parsing, decompressed
+# from reads of compressed bytes
+DECOMPRESS_BLOCK_SIZE = 1024 * 1024
+DECOMPRESS_READ_SIZE = 256 * 1024
+DECOMPRESS_QUEUE_SIZE = 8
+# How often the decompression thread waiting on a full queue checks
+# whether reading stopped
+DECOMPRESS_POLL_SECONDS = 0.1
 
 
 class CsvReader:
@@ -27,9 +68,28 @@ class CsvReader:
 
         self._validation_schema = validation_schema
         self._validate_file()
+        self.compression = detect_compression(self.file_meta.path)
+
+        self._csv_file: tp.TextIO | None = None
+
+    @property
+    def position(self) -> int:
+        """Approximate byte offset of `read_by_row` in the file.
+
+        The offset is rounded up to the read-ahead buffer of the file,
+        so it suits progress reporting. For a compressed file, it is the
+        offset in the compressed bytes. It is 0 if the file is not being read.
+        """
+        if self._csv_file is None or self._csv_file.closed:
+            return 0
+        raw = getattr(self._csv_file.buffer, "raw", None)
+        if isinstance(raw, _DecompressedStream):
+            return raw.position
+        return self._csv_file.buffer.tell()
 
     def read_by_row(self) -> tp.Generator[Row, None, None]:
-        with open(self.file_meta.path, encoding=self.file_meta.encoding) as csv_file:
+        with self._open() as csv_file:
+            self._csv_file = csv_file
             reader = csv.DictReader(csv_file, delimiter=self.file_meta.delimiter)
 
             if not reader.fieldnames:
@@ -38,18 +98,645 @@ class CsvReader:
 
             yield from reader
 
+    def read_by_tuple(
+        self, columns: CsvFieldnames | None = None
+    ) -> tp.Generator[TupleRow, None, None]:
+        """Read rows as tuples of values, optionally projected to some columns.
+
+        The header is resolved into column indexes once, so rows are not
+        turned into dictionaries and unneeded values are never kept.
+
+        Args:
+            columns (CsvFieldnames | None): The columns to read, in the order
+                of values in tuples. Defaults to all columns of the header.
+
+        Raises:
+            InvalidCsvSchemaError: If the header is missing or does not contain
+                required fields or the requested columns.
+
+        Yields:
+            TupleRow: Values of a row. Values missing from short rows are None.
+        """
+        with self._open(newline="") as csv_file:
+            self._csv_file = csv_file
+            rows = csv.reader(csv_file, delimiter=self.file_meta.delimiter)
+
+            header = next(rows, [])
+            if not header:
+                raise InvalidCsvSchemaError("Header fieldnames are missing")
+            self._validate_schema(header=header)
+
+            yield from _project(rows=rows, header=header, columns=columns)
+
+    def read_header(self) -> list[str]:
+        """Read and validate the header of the CSV file.
+
+        Returns:
+            list[str]: The header fieldnames.
+        """
+        with self._open() as csv_file:
+            header = next(csv.reader(csv_file, delimiter=self.file_meta.delimiter), [])
+
+        if not header:
+            raise InvalidCsvSchemaError("Header fieldnames are missing")
+        self._validate_schema(header=header)
+
+        return header
+
+    def split_into_byte_ranges(self, count: int) -> list[ByteRange]:
+        """Split records of the CSV file into byte ranges.
+
+        Ranges are aligned to record boundaries: a newline inside a quoted
+        field is not a boundary, which is told by the parity of quote chars
+        before it. The header record is not included in any range. Ranges are
+        roughly equal in size; fewer ranges are returned for small files.
+        The encoding of the file must be ASCII-compatible, e.g. UTF-8.
+
+        Args:
+            count (int): The desired number of ranges.
+
+        Raises:
+            CsvReaderError: If the file is compressed, so offsets of records
+                are not known without decompressing it.
+
+        Returns:
+            list[ByteRange]: Non-empty byte ranges in file order.
+        """
+        if self.compression is not None:
+            raise CsvReaderError(
+                f"Compressed CSV file cannot be split: {self.file_meta.path}"
+            )
+        with open(self.file_meta.path, "rb") as csv_file:
+            if not os.fstat(csv_file.fileno()).st_size:
+                return []
+            with mmap.mmap(csv_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return _split_records(data=data, count=count)
+
+    def chunks(self, count: int) -> list[CsvChunk]:
+        """Validate the header once and split records into chunks.
+
+        Chunks are small descriptors, cheap to send to other processes,
+        which read them with `read_chunk`.
+
+        Args:
+            count (int): The desired number of chunks.
+
+        Returns:
+            list[CsvChunk]: Non-empty chunks in file order.
+        """
+        fieldnames = tuple(self.read_header())
+        return [
+            CsvChunk(file_meta=self.file_meta, fieldnames=fieldnames, byte_range=r)
+            for r in self.split_into_byte_ranges(count=count)
+        ]
+
+    def read_byte_range(
+        self, byte_range: ByteRange, fieldnames: CsvFieldnames
+    ) -> tp.Generator[Row, None, None]:
+        """Read rows from a byte range of the CSV file.
+
+        Args:
+            byte_range (ByteRange): The range to read, aligned to records.
+            fieldnames (CsvFieldnames): The header fieldnames of the file.
+
+        Yields:
+            Row: A row of the range.
+        """
+        with _map_lines(file_meta=self.file_meta, byte_range=byte_range) as lines:
+            yield from csv.DictReader(
+                lines, fieldnames=fieldnames, delimiter=self.file_meta.delimiter
+            )
+
+    def read_byte_range_by_tuple(
+        self,
+        byte_range: ByteRange,
+        fieldnames: CsvFieldnames,
+        columns: CsvFieldnames | None = None,
+    ) -> tp.Generator[TupleRow, None, None]:
+        """Read rows from a byte range of the CSV file as tuples of values.
+
+        Args:
+            byte_range (ByteRange): The range to read, aligned to records.
+            fieldnames (CsvFieldnames): The header fieldnames of the file.
+            columns (CsvFieldnames | None): The columns to read, in the order
+                of values in tuples. Defaults to all fieldnames.
+
+        Yields:
+            TupleRow: Values of a row of the range.
+        """
+        yield from read_chunk(
+            chunk=CsvChunk(
+                file_meta=self.file_meta,
+                fieldnames=tuple(fieldnames),
+                byte_range=byte_range,
+            ),
+            columns=columns,
+        )
+
     def _validate_file(self) -> None:
         if not self.file_meta.path.exists():
             raise FileNotFoundError(f"{self.file_meta.path}")
 
-        if not self.file_meta.path.is_file() or self.file_meta.path.suffix != ".csv":
+        if not self.file_meta.path.is_file() or csv_stem(self.file_meta.path) is None:
             raise CsvReaderError(f"File is not a CSV file: {self.file_meta.path}")
 
+    @contextlib.contextmanager
+    def _open(self, newline: str | None = None) -> tp.Iterator[tp.TextIO]:
+        # Compressed files are decompressed by a thread ahead of parsing
+        if self.compression is None:
+            with open(
+                self.file_meta.path, encoding=self.file_meta.encoding, newline=newline
+            ) as csv_file:
+                yield csv_file
+            return
+
+        stream = _DecompressedStream(
+            path=self.file_meta.path, compression=self.compression
+        )
+        with (
+            contextlib.closing(stream),
+            io.TextIOWrapper(
+                io.BufferedReader(stream, buffer_size=DECOMPRESS_BLOCK_SIZE),
+                encoding=self.file_meta.encoding,
+                newline=newline,
+            ) as csv_file,
+        ):
+            yield csv_file
+
     def _validate_schema(self, header: CsvFieldnames) -> None:
         """Validate a CSV header to contain required fields."""
+        _validate_header(
+            header=header,
+            validation_schema=self._validation_schema,
+            name=str(self.file_meta.path),
+        )
 
-        required_fields = dataclasses.fields(self._validation_schema)
-        if not any(field.name in header for field in required_fields):
-            raise InvalidCsvSchemaError(
-                f"Missing required fields in CSV file: {self.file_meta.path}"
-            )
+
+class RecordSplitter:
+    """Splitter of a CSV byte stream into blocks of complete records.
+
+    Bytes are fed as they arrive, e.g. from a network upload, and every
+    block returned ends at a record boundary: a newline outside of quoted
+    fields, told by the parity of quote chars before it. The encoding of
+    the stream must be ASCII-compatible, e.g. UTF-8.
+    """
+
+    def __init__(self) -> None:
+        self._data = bytearray()
+        # Quote chars counted from the start of the buffer up to `_counted`
+        self._quotes = 0
+        self._counted = 0
+
+    def feed(self, data: bytes) -> bytes:
+        """Buffer bytes of the stream and take the complete records.
+
+        Args:
+            data (bytes): The next bytes of the stream.
+
+        Returns:
+            bytes: The complete records buffered so far, possibly none.
+        """
+        self._data += data
+        end = self._data.rfind(NEWLINE, self._counted)
+        while end != -1:
+            quotes = self._quotes + self._data.count(QUOTE_CHAR, self._counted, end)
+            if not quotes % 2:
+                records = bytes(self._data[: end + 1])
+                del self._data[: end + 1]
+                self._quotes = self._counted = 0
+                return records
+            end = self._data.rfind(NEWLINE, self._counted, end)
+
+        self._quotes += self._data.count(QUOTE_CHAR, self._counted)
+        self._counted = len(self._data)
+        return b""
+
+    def close(self) -> bytes:
+        """Take the rest of the stream, e.g. the last record without a newline.
+
+        Returns:
+            bytes: The buffered bytes.
+        """
+        records = bytes(self._data)
+        self._data.clear()
+        self._quotes = self._counted = 0
+        return records
+
+
+class _DecompressedStream(io.RawIOBase):
+    """A compressed file, decompressed by a thread ahead of reading.
+
+    The thread fills a bounded queue with blocks of decompressed bytes, so
+    decompression, which releases the GIL, overlaps with parsing earlier
+    blocks, and at most `DECOMPRESS_QUEUE_SIZE` blocks are buffered.
+    Decompressors are fed large reads rather than through `gzip.GzipFile`
+    and alike, which decompress small reads and so contend for the GIL with
+    the parser far more often. Closing the stream stops the thread.
+    """
+
+    def __init__(self, path: pathlib.Path, compression: Compression) -> None:
+        super().__init__()
+        self.path = path
+        # Offset in the compressed file of the blocks read so far
+        self.position = 0
+
+        self._blocks: queue.Queue[tuple[bytes, int] | Exception | None] = queue.Queue(
+            maxsize=DECOMPRESS_QUEUE_SIZE
+        )
+        self._block = memoryview(b"")
+        self._eof = False
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(
+            target=self._decompress,
+            args=(compression,),
+            name=f"decompress-{path.name}",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: tp.Any) -> int:
+        if not self._block:
+            if self._eof:
+                return 0
+            item = self._blocks.get()
+            if item is None or isinstance(item, Exception):
+                self._eof = True
+                if item is None:
+                    return 0
+                raise CsvReaderError(f"Cannot decompress {self.path}: {item}") from item
+            block, self.position = item
+            self._block = memoryview(block)
+
+        size = min(len(buffer), len(self._block))
+        buffer[:size] = self._block[:size]
+        self._block = self._block[size:]
+        return size
+
+    def close(self) -> None:
+        if not self.closed:
+            self._stopped.set()
+            self._thread.join()
+        super().close()
+
+    def _decompress(self, compression: Compression) -> None:
+        try:
+            with open(self.path, "rb") as compressed:
+                for block in _iter_decompressed(compressed, compression):
+                    if not self._put((block, compressed.tell())):
+                        return
+        except Exception as e:  # noqa: BLE001
+            # Raised by the reader, e.g. for a truncated file
+            self._put(e)
+            return
+        self._put(None)
+
+    def _put(self, item: tuple[bytes, int] | Exception | None) -> bool:
+        # Wait for room in the queue unless reading stopped
+        while not self._stopped.is_set():
+            try:
+                self._blocks.put(item, timeout=DECOMPRESS_POLL_SECONDS)
+            except queue.Full:
+                continue
+            return True
+        return False
+
+
+class _Decompressor(tp.Protocol):
+    @property
+    def eof(self) -> bool: ...
+
+    @property
+    def unused_data(self) -> bytes: ...
+
+    @property
+    def needs_input(self) -> bool: ...
+
+    def decompress(self, data: bytes, max_length: int = -1) -> bytes: ...
+
+
+class _GzipDecompressor:
+    """A decompressor of a gzip member, like `bz2.BZ2Decompressor`."""
+
+    def __init__(self) -> None:
+        self._decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | GZIP_WBITS)
+
+    @property
+    def eof(self) -> bool:
+        return self._decompressor.eof
+
+    @property
+    def unused_data(self) -> bytes:
+        return self._decompressor.unused_data
+
+    @property
+    def needs_input(self) -> bool:
+        return not self._decompressor.unconsumed_tail
+
+    def decompress(self, data: bytes, max_length: int = -1) -> bytes:
+        # Input left over by a call with a maximum length is not kept by zlib
+        data = data or self._decompressor.unconsumed_tail
+        return self._decompressor.decompress(data, max(max_length, 0))
+
+
+_DECOMPRESSORS: dict[Compression, tp.Callable[[], _Decompressor]] = {
+    Compression.GZIP: _GzipDecompressor,
+    Compression.BZIP2: bz2.BZ2Decompressor,
+    Compression.XZ: lzma.LZMADecompressor,
+}
+
+
+def _iter_decompressed(
+    compressed: tp.BinaryIO, compression: Compression
+) -> tp.Iterator[bytes]:
+    # Decompress blocks of at most `DECOMPRESS_BLOCK_SIZE` bytes, stream
+    # after stream: files may be concatenated, e.g. by parallel compressors
+    decompressor = _DECOMPRESSORS[compression]()
+    # gzip members may be followed by zero padding, skipped as `gzip.open` does
+    padding = b"\x00" if compression is Compression.GZIP else b""
+    data = b""
+    while True:
+        if decompressor.eof:
+            data = decompressor.unused_data.lstrip(padding)
+            while not data:
+                data = compressed.read(DECOMPRESS_READ_SIZE)
+                if not data:
+                    return
+                data = data.lstrip(padding)
+            decompressor = _DECOMPRESSORS[compression]()
+        elif decompressor.needs_input:
+            data = compressed.read(DECOMPRESS_READ_SIZE)
+            if not data:
+                raise EOFError("Compressed file ended before the end of its stream")
+
+        block = decompressor.decompress(data, DECOMPRESS_BLOCK_SIZE)
+        data = b""
+        if block:
+            yield block
+
+
+def _project(
+    rows: tp.Iterable[list[str]],
+    header: CsvFieldnames,
+    columns: CsvFieldnames | None,
+) -> tp.Iterator[TupleRow]:
+    if columns is None:
+        columns = header
+
+    indexes = {column: index for index, column in enumerate(header)}
+    missing_columns = [column for column in columns if column not in indexes]
+    if missing_columns:
+        raise InvalidCsvSchemaError(
+            f"Missing columns in CSV file: {', '.join(missing_columns)}"
+        )
+    project: tp.Callable[[list[str]], TupleRow]
+    if len(columns) > 1:
+        project = operator.itemgetter(*(indexes[column] for column in columns))
+    else:
+        # itemgetter returns a scalar for a single index
+        column_indexes = [indexes[column] for column in columns]
+        project = lambda row: tuple(row[index] for index in column_indexes)
+
+    width = len(header)
+    padding = tp.cast(list[str], [None] * width)
+    for row in rows:
+        if not row:
+            # Skip blank lines, like csv.DictReader
+            continue
+        if len(row) < width:
+            row = row + padding[len(row) :]
+        # Values of extra fields of long rows are left out
+        yield project(row)
+
+
+def read_chunk(
+    chunk: CsvChunk, columns: CsvFieldnames | None = None
+) -> tp.Generator[TupleRow, None, None]:
+    """Read rows of a chunk as tuples of values, parsed from a memory map.
+
+    The header is not read again: it was validated when the file was split.
+
+    Args:
+        chunk (CsvChunk): The chunk to read.
+        columns (CsvFieldnames | None): The columns to read, in the order
+            of values in tuples. Defaults to all fieldnames.
+
+    Yields:
+        TupleRow: Values of a row of the chunk.
+    """
+    with _map_lines(file_meta=chunk.file_meta, byte_range=chunk.byte_range) as lines:
+        yield from _project(
+            rows=csv.reader(lines, delimiter=chunk.file_meta.delimiter),
+            header=chunk.fieldnames,
+            columns=columns,
+        )
+
+
+def split_header(
+    block: bytes,
+    stream_meta: CsvStreamMeta,
+    validation_schema: type[CsvSourceSchemaRequired] | type[CsvMappingSchemaRequired],
+) -> tuple[list[str], bytes]:
+    """Read and validate the header record at the start of a stream.
+
+    Args:
+        block (bytes): The first block of complete records of the stream.
+        stream_meta (CsvStreamMeta): Metadata for the stream.
+        validation_schema (type[CsvSourceSchemaRequired] |
+            type[CsvMappingSchemaRequired]): The schema of required fields.
+
+    Raises:
+        InvalidCsvSchemaError: If the header is missing or does not contain
+            required fields.
+
+    Returns:
+        tuple[list[str], bytes]: The header fieldnames and the records
+            of the block after the header.
+    """
+    end = _record_end(block)
+    header = next(read_records(block[:end], stream_meta=stream_meta), [])
+    if not header:
+        raise InvalidCsvSchemaError("Header fieldnames are missing")
+    _validate_header(
+        header=header, validation_schema=validation_schema, name=stream_meta.name
+    )
+    return header, block[end:]
+
+
+def read_block(
+    block: bytes,
+    stream_meta: CsvStreamMeta,
+    fieldnames: CsvFieldnames,
+    columns: CsvFieldnames | None = None,
+) -> tp.Generator[TupleRow, None, None]:
+    """Read rows of a block of complete records as tuples of values.
+
+    Args:
+        block (bytes): Records of the stream, see `RecordSplitter`.
+        stream_meta (CsvStreamMeta): Metadata for the stream.
+        fieldnames (CsvFieldnames): The header fieldnames of the stream.
+        columns (CsvFieldnames | None): The columns to read, in the order
+            of values in tuples. Defaults to all fieldnames.
+
+    Yields:
+        TupleRow: Values of a row of the block.
+    """
+    yield from _project(
+        rows=read_records(block, stream_meta=stream_meta),
+        header=fieldnames,
+        columns=columns,
+    )
+
+
+def read_records(block: bytes, stream_meta: CsvStreamMeta) -> tp.Iterator[list[str]]:
+    """Parse a block of complete records into lists of values.
+
+    Args:
+        block (bytes): Records of the stream.
+        stream_meta (CsvStreamMeta): Metadata for the stream.
+
+    Returns:
+        tp.Iterator[list[str]]: Values of every record.
+    """
+    text = io.StringIO(block.decode(stream_meta.encoding), newline="")
+    return csv.reader(text, delimiter=stream_meta.delimiter)
+
+
+def csv_stem(path: pathlib.Path) -> str | None:
+    """Get the name of a CSV file without its suffixes.
+
+    A CSV file name ends with `.csv`, optionally followed by the suffix of
+    a compression, e.g. `prices.csv.gz`.
+
+    Args:
+        path (pathlib.Path): The path of the file.
+
+    Returns:
+        str | None: The name without suffixes, or None if it is not the name
+            of a CSV file.
+    """
+    if path.suffix in COMPRESSED_SUFFIXES:
+        path = path.with_suffix("")
+    return path.stem if path.suffix == CSV_SUFFIX else None
+
+
+def detect_compression(path: pathlib.Path) -> Compression | None:
+    """Detect the compression of a file from its magic bytes.
+
+    Args:
+        path (pathlib.Path): The path of the file.
+
+    Returns:
+        Compression | None: The compression, or None if the file is not
+            compressed.
+    """
+    with open(path, "rb") as file:
+        head = file.read(max(map(len, COMPRESSION_MAGIC)))
+    for magic, compression in COMPRESSION_MAGIC.items():
+        if head.startswith(magic):
+            return compression
+    return None
+
+
+def estimate_size(path: pathlib.Path) -> int:
+    """Estimate the size of a CSV file once decompressed.
+
+    The size is not stored by every compression, so it is estimated from
+    the size of the compressed file.
+
+    Args:
+        path (pathlib.Path): The path of the file.
+
+    Returns:
+        int: The estimated size, in bytes.
+    """
+    size = path.stat().st_size
+    if detect_compression(path) is not None:
+        size *= COMPRESSION_RATIO_ESTIMATE
+    return size
+
+
+def _validate_header(
+    header: CsvFieldnames,
+    validation_schema: type[CsvSourceSchemaRequired] | type[CsvMappingSchemaRequired],
+    name: str,
+) -> None:
+    required_fields = dataclasses.fields(validation_schema)
+    if not any(field.name in header for field in required_fields):
+        raise InvalidCsvSchemaError(f"Missing required fields in CSV file: {name}")
+
+
+def _record_end(data: bytes) -> int:
+    # The offset after the first record, whose newline is outside of quotes
+    quotes = position = 0
+    while (newline := data.find(NEWLINE, position)) != -1:
+        quotes += data.count(QUOTE_CHAR, position, newline)
+        if not quotes % 2:
+            return newline + 1
+        position = newline + 1
+    return len(data)
+
+
+def _split_records(data: mmap.mmap, count: int) -> list[ByteRange]:
+    size = len(data)
+    # Quote chars counted from the start of the file up to `counted`
+    quotes = counted = 0
+
+    def next_boundary(position: int) -> int:
+        nonlocal quotes, counted
+        while (newline := data.find(NEWLINE, position)) != -1:
+            quotes += _count(data, QUOTE_CHAR, counted, newline)
+            counted = newline
+            if not quotes % 2:
+                return newline + 1
+            position = newline + 1
+        return size
+
+    start = next_boundary(0)
+    boundaries = [start]
+    for i in range(1, max(count, 1)):
+        offset = start + (size - start) * i // count
+        if offset <= boundaries[-1]:
+            continue
+        boundaries.append(next_boundary(offset - 1))
+    boundaries.append(size)
+
+    return [
+        ByteRange(start=range_start, end=range_end)
+        for range_start, range_end in itertools.pairwise(boundaries)
+        if range_end > range_start
+    ]
+
+
+def _count(data: mmap.mmap, sub: bytes, start: int, end: int) -> int:
+    # mmap has no count, so count in slices of bounded size
+    return sum(
+        data[offset : min(offset + COUNT_BLOCK_SIZE, end)].count(sub)
+        for offset in range(start, end, COUNT_BLOCK_SIZE)
+    )
+
+
+@contextlib.contextmanager
+def _map_lines(
+    file_meta: CsvFileReaderMeta, byte_range: ByteRange
+) -> tp.Iterator[tp.Iterator[str]]:
+    with (
+        open(file_meta.path, "rb") as csv_file,
+        mmap.mmap(csv_file.fileno(), 0, access=mmap.ACCESS_READ) as data,
+    ):
+        data.seek(byte_range.start)
+        yield _iter_lines(data=data, end=byte_range.end, encoding=file_meta.encoding)
+
+
+def _iter_lines(
+    data: mmap.mmap, end: int, encoding: str
+) -> tp.Generator[str, None, None]:
+    position = data.tell()
+    while position < end:
+        line = data.readline()
+        if not line:
+            return
+        position += len(line)
+        yield line.decode(encoding)
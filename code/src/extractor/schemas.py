@@ -1,7 +1,16 @@
 import dataclasses
+import enum
 import pathlib
 
 
+class Compression(enum.StrEnum):
+    """The compression of a CSV file, told by its magic bytes."""
+
+    GZIP = "gzip"
+    BZIP2 = "bzip2"
+    XZ = "xz"
+
+
 @dataclasses.dataclass(frozen=True)
 class CsvSourceSchemaRequired:
     article_number: str
@@ -20,3 +29,47 @@ class CsvFileReaderMeta:
     path: pathlib.Path
     delimiter: str
     encoding: str = "utf-8"
+
+
+@dataclasses.dataclass(frozen=True)
+class CsvStreamMeta:
+    """Metadata for a CSV byte stream, e.g. an upload.
+
+    Attributes:
+        delimiter (str): The field delimiter.
+        encoding (str): The encoding, which must be ASCII-compatible.
+        name (str): The name of the stream in error messages.
+    """
+
+    delimiter: str
+    encoding: str = "utf-8"
+    name: str = "stream"
+
+
+@dataclasses.dataclass(frozen=True)
+class ByteRange:
+    """A range of bytes of a file, aligned to line boundaries.
+
+    Attributes:
+        start (int): The offset of the first byte.
+        end (int): The offset after the last byte.
+    """
+
+    start: int
+    end: int
+
+
+@dataclasses.dataclass(frozen=True)
+class CsvChunk:
+    """A byte range of a CSV file with everything needed to parse it.
+
+    Attributes:
+        file_meta (CsvFileReaderMeta): Metadata for the CSV file.
+        fieldnames (tuple[str, ...]): The validated header fieldnames.
+        byte_range (ByteRange): The range of records, aligned to record
+            boundaries.
+    """
+
+    file_meta: CsvFileReaderMeta
+    fieldnames: tuple[str, ...]
+    byte_range: ByteRange
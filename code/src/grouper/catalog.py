@@ -1,46 +1,183 @@
 import dataclasses
+import sys
 import typing as tp
 
 from src.grouper.exceptions import RequiredFieldMissingError
+from src.grouper.storage import (
+    AttributeTable,
+    CompactVariation,
+    SharedValues,
+    count_values,
+)
 from src.grouper.utils import (
     collect_common_attributes,
+    intersect_attributes_inplace,
     remove_attributes_inplace,
+    split_default_attributes,
 )
 
+GROUPER_ROW_NAME = "article_number"
+
+_MISSING = object()
+
 FlatDictRow = dict[str, str]
-Variation = dict[str, tp.Any]
+Variation = tp.Mapping[str, tp.Any]
 Attributes = dict[str, tp.Any]
 
 
-@dataclasses.dataclass()
+@dataclasses.dataclass(slots=True)
 class Article:
     """An article with its variations and common attributes.
 
+    Variations are stored as they were added, as dicts or as compact
+    variations encoded by the catalog. Attributes lifted to the article
+    (or catalog) level are stripped lazily, when variations are serialized.
+
+    Default attributes are lifted from most, but not all, variations. A
+    variation keeps a default attribute only to override it: with its own
+    value if it differs, or with None if it does not have the attribute.
+
     Attributes:
         article_number (str): The unique identifier for the article.
         variations (list[Variation]): A list of variations for the article.
         common_attributes (Attributes): A dictionary of attributes common to
             all variations of the article.
+        shared_attributes (Variation | None): A running intersection of the
+            attributes of all variations added with `add_variation`, by value
+            ids for compact variations. None if it is not tracked, e.g. for
+            variations passed directly, or once the article is consolidated.
+        lifted_keys (frozenset[str]): Keys that were lifted from variations
+            during consolidation.
+        default_attributes (Attributes | None): Default attributes of the
+            variations of the article, or None if defaults are not lifted.
     """
 
     article_number: str
     variations: list[Variation]
     common_attributes: Attributes
+    shared_attributes: Variation | None = dataclasses.field(
+        default=None, compare=False, repr=False
+    )
+    lifted_keys: frozenset[str] = dataclasses.field(
+        default=frozenset(), compare=False, repr=False
+    )
+    default_attributes: Attributes | None = None
+
+    def add_variation(self, variation: Variation) -> None:
+        """Add a variation and update the running intersection of attributes.
+
+        Args:
+            variation (Variation): The variation to add.
+        """
+        shared = self.shared_attributes
+        if not self.variations:
+            if isinstance(variation, CompactVariation):
+                shared = SharedValues(variation)
+            else:
+                shared = dict(variation)
+        elif not (isinstance(shared, SharedValues) and shared.intersect(variation)):
+            if shared is None:
+                shared = collect_common_attributes(self.variations)
+            elif not isinstance(shared, dict):
+                shared = dict(shared)
+            intersect_attributes_inplace(common=shared, d=variation)
+
+        self.shared_attributes = shared
+        self.variations.append(variation)
+
+    def iter_variations(self) -> tp.Iterator[dict[str, tp.Any]]:
+        """Iterate over variations without the lifted attributes.
+
+        Yields:
+            dict[str, tp.Any]: A variation without the lifted attributes,
+                with overrides of the default attributes.
+        """
+        lifted_keys = self.lifted_keys
+        default_attributes = self.default_attributes
+        for variation in self.variations:
+            if isinstance(variation, CompactVariation):
+                stripped = variation.to_dict(exclude=lifted_keys)
+            else:
+                stripped = {
+                    key: value
+                    for key, value in variation.items()
+                    if key not in lifted_keys
+                }
+
+            if default_attributes:
+                for key, default in default_attributes.items():
+                    value = stripped.get(key, _MISSING)
+                    if value is _MISSING:
+                        stripped[key] = None
+                    elif value == default:
+                        del stripped[key]
+            yield stripped
+
+    def to_dict(self) -> dict[str, tp.Any]:
+        """Represent the article as a dictionary for serialization.
+
+        Returns:
+            dict[str, tp.Any]: The article with lifted attributes stripped
+                from its variations, and its default attributes if they
+                are lifted.
+        """
+        record = {
+            "article_number": self.article_number,
+            "variations": list(self.iter_variations()),
+            "common_attributes": self.common_attributes,
+        }
+        if self.default_attributes is not None:
+            record["default_attributes"] = self.default_attributes
+        return record
+
+
+@dataclasses.dataclass(frozen=True)
+class MemoryReport:
+    """Estimated memory used by a catalog, in bytes.
+
+    Attributes:
+        articles_count (int): The number of articles.
+        variations_count (int): The number of variations.
+        table_bytes (int): Memory used by the shared attribute table.
+        articles_bytes (int): Memory used by articles, without variations.
+        variations_bytes (int): Memory used by variations.
+        total_bytes (int): Memory used by the catalog.
+        bytes_per_article (float): Total memory per article.
+        bytes_per_variation (float): Memory used by one variation,
+            including its share of the attribute table.
+    """
+
+    articles_count: int
+    variations_count: int
+    table_bytes: int
+    articles_bytes: int
+    variations_bytes: int
+    total_bytes: int
+    bytes_per_article: float
+    bytes_per_variation: float
 
 
 @dataclasses.dataclass()
 class Catalog:
     """A catalog containing multiple articles and their common attributes.
 
+    Variations added with `add` are encoded against the shared
+    `attribute_table`, so every distinct key and value is stored once.
+
     Attributes:
         articles (dict[str, Article]): A dictionary of articles
             indexed by their article number.
         common_attributes (Attributes): A dictionary of attributes
             common to all articles in the catalog.
+        attribute_table (AttributeTable): The schema of keys and interned
+            values shared by the variations of the catalog.
     """
 
     articles: dict[str, Article]
     common_attributes: Attributes
+    attribute_table: AttributeTable = dataclasses.field(
+        default_factory=AttributeTable, compare=False, repr=False
+    )
 
     @classmethod
     def new(cls) -> tp.Self:
@@ -51,6 +188,10 @@ class Catalog:
         """
         return cls(articles={}, common_attributes={})
 
+    @property
+    def articles_count(self) -> int:
+        return len(self.articles)
+
     def add(self, flat_data_row: FlatDictRow) -> tp.Self:
         """Add a new article or variation to the catalog from a flat data row.
 
@@ -67,7 +208,7 @@ class Catalog:
         if not self.articles:
             self.articles: dict[str, Article] = {}
 
-        grouper_row_name = "article_number"
+        grouper_row_name = GROUPER_ROW_NAME
 
         article_number = flat_data_row.get(grouper_row_name)
         if not article_number:
@@ -75,49 +216,209 @@ class Catalog:
                 f"Required field missing: '{grouper_row_name}'"
             )
 
-        variations_without_grouper = flat_data_row.copy()
-        variations_without_grouper.pop(grouper_row_name, None)
+        variations_without_grouper = self.attribute_table.encode(
+            attributes=flat_data_row, exclude=grouper_row_name
+        )
 
-        if existing_article := self.articles.get(article_number):
-            existing_article.variations.append(variations_without_grouper)
-        else:
-            self.articles[article_number] = Article(
+        article = self.articles.get(article_number)
+        if article is None:
+            article = self.articles[article_number] = Article(
                 article_number=article_number,
-                variations=[variations_without_grouper],
+                variations=[],
                 common_attributes={},
             )
+        article.add_variation(variations_without_grouper)
+
+        return self
+
+    def merge(self, other: "Catalog") -> tp.Self:
+        """Merge articles and variations of another catalog into this one.
+
+        Variations of articles present in both catalogs are appended after
+        the existing ones. Catalogs should be merged before consolidation.
+
+        Args:
+            other (Catalog): The catalog to merge, e.g. built from a shard
+                of the source file. It is not modified.
+
+        Returns:
+            Catalog: The updated instance of the Catalog class.
+        """
+        for article_number, other_article in other.articles.items():
+            variations: list[Variation] = [
+                self.attribute_table.encode(attributes=variation)
+                for variation in other_article.variations
+            ]
+            other_shared = other_article.shared_attributes
+
+            article = self.articles.get(article_number)
+            if article is None:
+                self.articles[article_number] = Article(
+                    article_number=article_number,
+                    variations=variations,
+                    common_attributes={},
+                    shared_attributes=(
+                        None if other_shared is None else dict(other_shared)
+                    ),
+                )
+                continue
+
+            if article.shared_attributes is not None and other_shared is not None:
+                shared = dict(article.shared_attributes)
+                intersect_attributes_inplace(common=shared, d=other_shared)
+                article.shared_attributes = shared
+            else:
+                # Recomputed from variations during consolidation
+                article.shared_attributes = None
+            article.variations.extend(variations)
 
         return self
 
+    def iter_articles(self) -> tp.Iterator[Article]:
+        """Iterate over articles of the catalog.
+
+        Yields:
+            Article: An article of the catalog.
+        """
+        yield from self.articles.values()
+
+    def to_dict(self) -> dict[str, tp.Any]:
+        """Represent the catalog as a dictionary for serialization.
+
+        Returns:
+            dict[str, tp.Any]: The articles and the common attributes.
+        """
+        return {
+            "articles": self.articles,
+            "common_attributes": self.common_attributes,
+        }
+
+    def memory_report(self) -> MemoryReport:
+        """Estimate the memory used by the catalog.
+
+        Shared values are counted once, in the attribute table. The numbers
+        are estimates based on `sys.getsizeof` and are meant for sizing.
+
+        Returns:
+            MemoryReport: The memory used by the catalog.
+        """
+        table_bytes = self.attribute_table.size_in_bytes()
+        articles_bytes = sys.getsizeof(self.articles)
+        variations_bytes = 0
+        variations_count = 0
+
+        for article in self.articles.values():
+            articles_bytes += (
+                sys.getsizeof(article)
+                + sys.getsizeof(article.variations)
+                + sys.getsizeof(article.common_attributes)
+                + sys.getsizeof(article.shared_attributes)
+            )
+            variations_count += len(article.variations)
+            for variation in article.variations:
+                if isinstance(variation, CompactVariation):
+                    variations_bytes += variation.size_in_bytes()
+                else:
+                    variations_bytes += sys.getsizeof(variation) + sum(
+                        sys.getsizeof(value) for value in variation.values()
+                    )
+
+        total_bytes = table_bytes + articles_bytes + variations_bytes
+        return MemoryReport(
+            articles_count=len(self.articles),
+            variations_count=variations_count,
+            table_bytes=table_bytes,
+            articles_bytes=articles_bytes,
+            variations_bytes=variations_bytes,
+            total_bytes=total_bytes,
+            bytes_per_article=total_bytes / len(self.articles) if self.articles else 0,
+            bytes_per_variation=(
+                (variations_bytes + table_bytes) / variations_count
+                if variations_count
+                else 0
+            ),
+        )
 
-def consolidate_common_attributes(catalog: Catalog) -> Catalog:
+
+def consolidate_common_attributes(
+    catalog: Catalog, default_share: float | None = None
+) -> Catalog:
     """Consolidate common attributes at both the article and catalog levels.
 
     Args:
         catalog (Catalog): The catalog to consolidate.
+        default_share (float | None): The share of the variations of an
+            article that must have the most frequent value of an attribute
+            for it to be lifted as a default. Defaults are not lifted if None.
 
     Returns:
         Catalog: The updated catalog with common attributes consolidated.
     """
     for article in catalog.articles.values():
-        _level_up_common_attributes_to_article_level(article=article)
+        _level_up_common_attributes_to_article_level(
+            article=article, default_share=default_share
+        )
 
     _level_up_common_attributes_to_catalog_level(catalog=catalog)
 
     return catalog
 
 
-def _level_up_common_attributes_to_article_level(article: Article) -> None:
+def iter_consolidated_articles(
+    catalog: Catalog, default_share: float | None = None
+) -> tp.Iterator[Article]:
+    """Consolidate common attributes at the article level, article by article.
+
+    Catalog level is left as it is, e.g. when it is combined from articles
+    that are not all in memory at once.
+
+    Args:
+        catalog (Catalog): The catalog to consolidate.
+        default_share (float | None): The share of the variations of an
+            article that must have the most frequent value of an attribute
+            for it to be lifted as a default. Defaults are not lifted if None.
+
+    Yields:
+        Article: An article with common attributes consolidated.
+    """
+    for article in catalog.iter_articles():
+        _level_up_common_attributes_to_article_level(
+            article=article, default_share=default_share
+        )
+        yield article
+
+
+def _level_up_common_attributes_to_article_level(
+    article: Article, default_share: float | None = None
+) -> None:
     """Level up common attributes from variations to the article level.
 
+    The common attributes are tracked while variations are added, so
+    variations are only scanned if the article was built without tracking,
+    or once to count values if default attributes are lifted.
+    Lifted attributes are stripped from variations when they are serialized.
+
     Args:
         article (Article): The article to update.
+        default_share (float | None): The share of variations that must
+            have the most frequent value of an attribute for it to be lifted
+            as a default. Defaults are not lifted if None.
     """
-    common = collect_common_attributes(dicts=article.variations)
-    article.common_attributes = common
+    if default_share is None:
+        common = article.shared_attributes
+        if common is None:
+            common = collect_common_attributes(dicts=article.variations)
+    else:
+        common, article.default_attributes = split_default_attributes(
+            value_counts=count_values(article.variations),
+            total=len(article.variations),
+            default_share=default_share,
+        )
 
-    for variation in article.variations:
-        remove_attributes_inplace(target_dict=variation, dict_to_remove=common)
+    article.common_attributes = dict(common)
+    article.lifted_keys = frozenset(common)
+    # Only tracked until the article is consolidated
+    article.shared_attributes = None
 
 
 def _level_up_common_attributes_to_catalog_level(catalog: Catalog) -> None:
@@ -126,12 +427,21 @@ def _level_up_common_attributes_to_catalog_level(catalog: Catalog) -> None:
     Args:
         catalog (Catalog): The catalog to update.
     """
-    # Collect common attributes across all articles
-    common_attributes_from_articles: list[dict] = []
+    # Intersect common attributes across all articles
+    common_attributes: Attributes | None = None
     for article in catalog.articles.values():
-        common_attributes_from_articles.append(article.common_attributes)
+        if common_attributes is None:
+            common_attributes = dict(article.common_attributes)
+        else:
+            intersect_attributes_inplace(
+                common=common_attributes, d=article.common_attributes
+            )
+        if not common_attributes:
+            break
 
-    common_attributes = collect_common_attributes(common_attributes_from_articles)
+    if not common_attributes:
+        catalog.common_attributes = {}
+        return
 
     # Remove common attributes from all articles
     for article in catalog.articles.values():
@@ -7,3 +7,11 @@ class GrouperError(ApplicationError):
 
 class RequiredFieldMissingError(GrouperError):
     message = "Required field missing"
+
+
+class UnsortedInputError(GrouperError):
+    message = "Input is not sorted"
+
+
+class CatalogStoreError(GrouperError):
+    message = "Catalog store error"
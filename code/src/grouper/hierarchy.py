@@ -0,0 +1,155 @@
+import dataclasses
+import typing as tp
+
+from src.grouper.catalog import GROUPER_ROW_NAME, Article, Attributes
+from src.grouper.utils import intersect_attributes_inplace
+
+ArticleRecord = dict[str, tp.Any]
+GroupRecord = dict[str, tp.Any]
+
+
+class ConsolidatedCatalog(tp.Protocol):
+    """A consolidated catalog of any grouping mode, e.g. in memory or spilled."""
+
+    common_attributes: Attributes
+
+    @property
+    def articles_count(self) -> int: ...
+
+    def iter_articles(self) -> tp.Iterator[Article] | tp.Iterator[ArticleRecord]: ...
+
+
+@dataclasses.dataclass()
+class GroupedCatalog:
+    """A consolidated catalog whose articles are split into nested groups.
+
+    Variations of an article are grouped by the value of the first key of
+    `group_by`, the variations of every group by the second key, and so on.
+    Every group has the common attributes of its variations, lifted from
+    them as articles are lifted from theirs, and either nested groups or,
+    at the last level, variations:
+
+        {"article_number": "15189-02",
+         "groups": {"1": {"color_code": "1",
+                          "variations": [{"size_code": "36", ...}, ...],
+                          "common_attributes": {"color": "Nero", ...}}, ...},
+         "common_attributes": {...}}
+
+    The key of a group is not repeated in its common attributes or variations.
+    A key that consolidation lifted to the article or the catalog, e.g. the
+    colour of a single-colour article, is resolved from there, and is left out
+    of their common attributes. Variations without the key are grouped under
+    null.
+
+    Attributes:
+        catalog (ConsolidatedCatalog): The consolidated catalog.
+        group_by (tuple[str, ...]): The keys of the levels below articles.
+    """
+
+    catalog: ConsolidatedCatalog
+    group_by: tuple[str, ...]
+
+    @property
+    def common_attributes(self) -> Attributes:
+        return _without_keys(self.catalog.common_attributes, self.group_by)
+
+    @property
+    def articles_count(self) -> int:
+        return self.catalog.articles_count
+
+    def iter_articles(self) -> tp.Iterator[ArticleRecord]:
+        """Iterate over articles with their variations in nested groups.
+
+        Yields:
+            ArticleRecord: An article represented as a dictionary.
+        """
+        for article in self.catalog.iter_articles():
+            record = article.to_dict() if isinstance(article, Article) else article
+            # Group keys common to all variations were lifted by consolidation
+            lifted = {**self.catalog.common_attributes, **record["common_attributes"]}
+            yield {
+                GROUPER_ROW_NAME: record[GROUPER_ROW_NAME],
+                "groups": group_variations(
+                    variations=record["variations"],
+                    group_by=self.group_by,
+                    lifted={key: lifted[key] for key in self.group_by if key in lifted},
+                ),
+                "common_attributes": _without_keys(
+                    record["common_attributes"], self.group_by
+                ),
+            }
+
+    def to_dict(self) -> dict[str, tp.Any]:
+        """Represent the catalog as a dictionary for serialization.
+
+        Returns:
+            dict[str, tp.Any]: Articles as an iterator of (article number,
+                article) pairs, and the common attributes.
+        """
+        return {
+            "articles": (
+                (record[GROUPER_ROW_NAME], record) for record in self.iter_articles()
+            ),
+            "common_attributes": self.common_attributes,
+        }
+
+
+def group_variations(
+    variations: tp.Iterable[tp.Mapping[str, tp.Any]],
+    group_by: tp.Sequence[str],
+    lifted: tp.Mapping[str, tp.Any] | None = None,
+) -> dict[tp.Any, GroupRecord]:
+    """Group variations into nested groups with their common attributes.
+
+    Keys of nested levels are not lifted to the common attributes of groups,
+    so every variation still has them when it is grouped at its level.
+
+    Args:
+        variations (tp.Iterable[tp.Mapping[str, tp.Any]]): Variations of an
+            article, without the attributes lifted to the article.
+        group_by (tp.Sequence[str]): The keys of the levels, outermost first.
+        lifted (tp.Mapping[str, tp.Any] | None): Values of keys of the levels
+            that were lifted from all variations, e.g. to the article.
+
+    Returns:
+        dict[tp.Any, GroupRecord]: Groups indexed by the value of the first
+            key, in the order of their first variations.
+    """
+    if lifted is None:
+        lifted = {}
+    key, nested_keys = group_by[0], group_by[1:]
+
+    members_by_value: dict[tp.Any, list[tp.Mapping[str, tp.Any]]] = {}
+    for variation in variations:
+        value = variation.get(key, lifted.get(key))
+        members_by_value.setdefault(value, []).append(variation)
+
+    groups = {}
+    for value, members in members_by_value.items():
+        common_attributes = dict(members[0])
+        for member in members[1:]:
+            intersect_attributes_inplace(common=common_attributes, d=member)
+        for level_key in group_by:
+            common_attributes.pop(level_key, None)
+
+        lifted_keys = {key, *common_attributes}
+        members = [
+            {name: item for name, item in member.items() if name not in lifted_keys}
+            for member in members
+        ]
+
+        group: GroupRecord = {key: value}
+        if nested_keys:
+            group["groups"] = group_variations(
+                variations=members, group_by=nested_keys, lifted=lifted
+            )
+        else:
+            group["variations"] = members
+        group["common_attributes"] = common_attributes
+        groups[value] = group
+
+    return groups
+
+
+def _without_keys(attributes: Attributes, keys: tp.Collection[str]) -> Attributes:
+    return {key: value for key, value in attributes.items() if key not in keys}
@@ -0,0 +1,274 @@
+import dataclasses
+import math
+import pathlib
+import pickle
+import typing as tp
+import zlib
+
+from src.grouper.catalog import (
+    GROUPER_ROW_NAME,
+    Article,
+    Attributes,
+    Catalog,
+    FlatDictRow,
+    iter_consolidated_articles,
+)
+from src.grouper.exceptions import RequiredFieldMissingError
+from src.grouper.utils import intersect_attributes_inplace
+
+# Estimated bytes of a grouped catalog in memory per byte of the source file
+MEMORY_PER_SOURCE_BYTE = 2
+# Estimated bytes of a transformed row buffered in memory before it is spilled
+MEMORY_PER_BUFFERED_ROW = 2048
+SPILL_BATCH_SIZE = 1024
+
+ArticleRecord = dict[str, tp.Any]
+
+
+def estimate_partitions_count(source_size: int, max_memory: int) -> int:
+    """Estimate how many partitions keep grouping within a memory budget.
+
+    Args:
+        source_size (int): The size of the source file, in bytes.
+        max_memory (int): The memory budget, in bytes.
+
+    Returns:
+        int: The number of partitions; 1 if the source fits in memory.
+    """
+    return max(math.ceil(source_size * MEMORY_PER_SOURCE_BYTE / max_memory), 1)
+
+
+def estimate_buffered_rows(max_memory: int) -> int:
+    """Estimate how many rows can be buffered before spilling within a budget.
+
+    Args:
+        max_memory (int): The memory budget, in bytes.
+
+    Returns:
+        int: The number of rows buffered across all partitions; at least 1.
+    """
+    return max(max_memory // MEMORY_PER_BUFFERED_ROW, 1)
+
+
+class ExternalGrouper:
+    """Group rows into a catalog that does not have to fit in memory.
+
+    Rows are spilled to temp files partitioned by a stable hash of the
+    article number, so all variations of an article are in one partition.
+    Partitions are then grouped and consolidated one at a time.
+
+    Rows are buffered per partition and spilled in batches. A partition is
+    spilled when its batch is full, and the largest batch is spilled when
+    the rows buffered across all partitions reach `max_buffered_rows`, so
+    more partitions do not buffer more rows.
+
+    Attributes:
+        directory (pathlib.Path): The directory for temp files. It should be
+            removed by the caller when the catalog is written.
+        partitions_count (int): The number of partitions.
+        max_buffered_rows (int | None): The number of rows buffered across
+            all partitions before the largest batch is spilled. Only batches
+            are limited if None.
+    """
+
+    def __init__(
+        self,
+        directory: pathlib.Path,
+        partitions_count: int,
+        max_buffered_rows: int | None = None,
+    ) -> None:
+        self.directory = directory
+        self.partitions_count = partitions_count
+        self.max_buffered_rows = max_buffered_rows
+
+        self._paths = [
+            directory / f"partition-{i}.pickle" for i in range(partitions_count)
+        ]
+        self._batches: list[list[FlatDictRow]] = [[] for _ in self._paths]
+        self._buffered_rows = 0
+
+    @property
+    def buffered_rows(self) -> int:
+        """The number of rows buffered in memory across all partitions."""
+        return self._buffered_rows
+
+    def add(self, flat_data_row: FlatDictRow) -> tp.Self:
+        """Spill a flat data row to its partition.
+
+        Args:
+            flat_data_row (FlatDictRow): A dictionary representing a flat data row.
+
+        Raises:
+            RequiredFieldMissingError: If the required 'article_number'
+                field is missing from the data row.
+
+        Returns:
+            ExternalGrouper: The updated instance of the ExternalGrouper class.
+        """
+        article_number = flat_data_row.get(GROUPER_ROW_NAME)
+        if not article_number:
+            raise RequiredFieldMissingError(
+                f"Required field missing: '{GROUPER_ROW_NAME}'"
+            )
+
+        i = zlib.crc32(article_number.encode()) % self.partitions_count
+        batch = self._batches[i]
+        batch.append(flat_data_row)
+        self._buffered_rows += 1
+        if len(batch) >= SPILL_BATCH_SIZE:
+            self._spill(i)
+        elif (
+            self.max_buffered_rows is not None
+            and self._buffered_rows >= self.max_buffered_rows
+        ):
+            self._spill(
+                max(range(self.partitions_count), key=lambda j: len(self._batches[j]))
+            )
+
+        return self
+
+    def consolidate(self, default_share: float | None = None) -> "SpilledCatalog":
+        """Group and consolidate partitions one at a time.
+
+        Every partition is grouped into a catalog and consolidated at the
+        article level. Consolidated articles are written to temp files, and
+        common attributes of partitions are combined at the catalog level.
+
+        Args:
+            default_share (float | None): The share of the variations of an
+                article that must have the most frequent value of an attribute
+                for it to be lifted as a default. Defaults are not lifted
+                if None.
+
+        Returns:
+            SpilledCatalog: The consolidated catalog backed by temp files.
+        """
+        for i, batch in enumerate(self._batches):
+            if batch:
+                self._spill(i)
+
+        spool = ArticleSpool(directory=self.directory)
+        for path in self._paths:
+            if not path.exists():
+                continue
+
+            catalog = Catalog.new()
+            for batch in _load_pickles(path):
+                for row in batch:
+                    catalog.add(flat_data_row=row)
+            path.unlink()
+
+            spool.write(iter_consolidated_articles(catalog, default_share))
+
+        return spool.to_catalog()
+
+    def _spill(self, partition: int) -> None:
+        batch = self._batches[partition]
+        with open(self._paths[partition], "ab") as file:
+            pickle.dump(batch, file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._buffered_rows -= len(batch)
+        batch.clear()
+
+
+class ArticleSpool:
+    """Temp files with articles consolidated at the article level.
+
+    Catalog common attributes are known only after all articles are seen, so
+    articles are spooled with all their common attributes, while the common
+    attributes of the catalog are combined incrementally.
+
+    Attributes:
+        directory (pathlib.Path): The directory for temp files.
+    """
+
+    def __init__(self, directory: pathlib.Path) -> None:
+        self.directory = directory
+
+        self._paths: list[pathlib.Path] = []
+        self._common_attributes: Attributes | None = None
+        self._articles_count = 0
+
+    def write(self, articles: tp.Iterable[Article]) -> None:
+        """Write consolidated articles to a new temp file.
+
+        Args:
+            articles (tp.Iterable[Article]): Articles consolidated at the
+                article level.
+        """
+        path = self.directory / f"articles-{len(self._paths)}.pickle"
+        with open(path, "wb") as file:
+            for article in articles:
+                if self._common_attributes is None:
+                    self._common_attributes = dict(article.common_attributes)
+                else:
+                    intersect_attributes_inplace(
+                        common=self._common_attributes, d=article.common_attributes
+                    )
+
+                pickle.dump(article.to_dict(), file, protocol=pickle.HIGHEST_PROTOCOL)
+                self._articles_count += 1
+        self._paths.append(path)
+
+    def to_catalog(self) -> "SpilledCatalog":
+        """Represent the spooled articles as a catalog.
+
+        Returns:
+            SpilledCatalog: The consolidated catalog backed by temp files.
+        """
+        return SpilledCatalog(
+            common_attributes=self._common_attributes or {},
+            articles_paths=list(self._paths),
+            articles_count=self._articles_count,
+        )
+
+
+@dataclasses.dataclass()
+class SpilledCatalog:
+    """A consolidated catalog whose articles are stored in temp files.
+
+    Attributes:
+        common_attributes (Attributes): A dictionary of attributes
+            common to all articles in the catalog.
+        articles_paths (list[pathlib.Path]): Temp files with consolidated
+            articles, one per non-empty partition.
+        articles_count (int): The number of articles in the temp files.
+    """
+
+    common_attributes: Attributes
+    articles_paths: list[pathlib.Path]
+    articles_count: int = 0
+
+    def iter_articles(self) -> tp.Iterator[ArticleRecord]:
+        """Iterate over articles with catalog common attributes removed.
+
+        Yields:
+            ArticleRecord: An article represented as a dictionary.
+        """
+        for path in self.articles_paths:
+            for record in _load_pickles(path):
+                for key in self.common_attributes:
+                    record["common_attributes"].pop(key, None)
+                yield record
+
+    def to_dict(self) -> dict[str, tp.Any]:
+        """Represent the catalog as a dictionary for serialization.
+
+        Returns:
+            dict[str, tp.Any]: Articles as an iterator of (article number,
+                article) pairs, and the common attributes.
+        """
+        return {
+            "articles": (
+                (record["article_number"], record) for record in self.iter_articles()
+            ),
+            "common_attributes": self.common_attributes,
+        }
+
+
+def _load_pickles(path: pathlib.Path) -> tp.Iterator[tp.Any]:
+    with open(path, "rb") as file:
+        while True:
+            try:
+                yield pickle.load(file)
+            except EOFError:
+                return
@@ -0,0 +1,350 @@
+import array
+import collections
+import collections.abc
+import itertools
+import operator
+import sys
+import typing as tp
+
+# Value id reserved for attributes that a variation does not have
+MISSING_VALUE_ID = 0
+VALUE_ID_TYPECODE = "I"
+
+# Stands for attributes that a row does not have while it is encoded
+_ABSENT = object()
+
+_Layout = tuple[operator.itemgetter | None, int | None]
+
+
+class _ValueIds(dict):
+    """Value ids, indexed by value; unseen values are interned on lookup."""
+
+    __slots__ = ("_values",)
+
+    def __init__(self, values: list[tp.Any]) -> None:
+        super().__init__({_ABSENT: MISSING_VALUE_ID})
+        self._values = values
+
+    def __missing__(self, value: tp.Any) -> int:
+        value_id = self[value] = len(self._values)
+        self._values.append(value)
+        return value_id
+
+
+class AttributeTable:
+    """A per-catalog schema of attribute keys and a table of interned values.
+
+    Every distinct key and value is stored once; variations refer to them
+    by their ids.
+
+    Rows usually share their keys, so the order of value ids is computed
+    once per distinct tuple of keys, and every row is encoded in one pass
+    over its values. An excluded key has a key id but no values.
+
+    Attributes:
+        keys (list[str]): Attribute keys, indexed by key id.
+        key_ids (dict[str, int]): Key ids, indexed by key.
+        values (list[tp.Any]): Attribute values, indexed by value id.
+        value_ids (dict[tp.Any, int]): Value ids, indexed by value.
+    """
+
+    __slots__ = ("_layouts", "key_ids", "keys", "value_ids", "values")
+
+    def __init__(self) -> None:
+        self.keys: list[str] = []
+        self.key_ids: dict[str, int] = {}
+        self.values: list[tp.Any] = [None]
+        self.value_ids: dict[tp.Any, int] = _ValueIds(self.values)
+        self._layouts: dict[tuple[tuple[str, ...], str | None], _Layout] = {}
+
+    def encode(
+        self, attributes: tp.Mapping[str, tp.Any], exclude: str | None = None
+    ) -> "CompactVariation":
+        """Encode attributes into a compact variation.
+
+        Args:
+            attributes (tp.Mapping[str, tp.Any]): The attributes to encode.
+            exclude (str | None): A key to leave out, e.g. the grouper key.
+
+        Returns:
+            CompactVariation: A dict-like view over the encoded attributes.
+        """
+        layout_key = (tuple(attributes), exclude)
+        layout = self._layouts.get(layout_key)
+        if layout is None:
+            layout = self._layouts[layout_key] = self._add_layout(*layout_key)
+        reorder, excluded = layout
+
+        if reorder is None:
+            # Keys are in the order of key ids
+            ids = array.array(
+                VALUE_ID_TYPECODE, map(self.value_ids.__getitem__, attributes.values())
+            )
+            if excluded is not None:
+                ids[excluded] = MISSING_VALUE_ID
+        else:
+            # Values in the order of key ids, with attributes the row does not
+            # have as the last value
+            values = reorder((*attributes.values(), _ABSENT))
+            ids = array.array(
+                VALUE_ID_TYPECODE, map(self.value_ids.__getitem__, values)
+            )
+
+        return CompactVariation(table=self, ids=ids)
+
+    def __getstate__(self) -> tuple[list[str], list[tp.Any]]:
+        # Lookups are rebuilt, so the absent value keeps its identity
+        return self.keys, self.values
+
+    def __setstate__(self, state: tuple[list[str], list[tp.Any]]) -> None:
+        keys, self.values = state
+        self.keys = [sys.intern(key) for key in keys]
+        self.key_ids = {key: key_id for key_id, key in enumerate(self.keys)}
+        self.value_ids = _ValueIds(self.values)
+        self.value_ids.update(
+            (value, value_id)
+            for value_id, value in enumerate(self.values)
+            if value_id != MISSING_VALUE_ID
+        )
+        self._layouts = {}
+
+    def _add_layout(self, keys: tuple[str, ...], exclude: str | None) -> _Layout:
+        """Add keys of a row and compute how its values are ordered by key id.
+
+        Returns:
+            _Layout: A getter that orders values by key id, or None if keys
+                are already in that order, and the position of the excluded
+                key, or None if the row does not have it.
+        """
+        key_ids = []
+        for key in keys:
+            key_id = self.key_ids.get(key)
+            if key_id is None:
+                key_id = self.key_ids[key] = len(self.keys)
+                self.keys.append(sys.intern(key))
+            key_ids.append(key_id)
+
+        excluded = keys.index(exclude) if exclude in keys else None
+        if key_ids == list(range(len(keys))):
+            return None, excluded
+
+        # The position of the appended absent value
+        absent = len(keys)
+        positions = {
+            key_id: position
+            for position, key_id in enumerate(key_ids)
+            if position != excluded
+        }
+        # At least two positions, so that the getter returns a tuple
+        reorder = operator.itemgetter(
+            *(positions.get(key_id, absent) for key_id in range(len(self.keys))),
+            *[absent] * (2 - len(self.keys)),
+        )
+        return reorder, None
+
+    def size_in_bytes(self) -> int:
+        """Estimate the memory used by the table, including keys and values."""
+        return (
+            sys.getsizeof(self)
+            + sys.getsizeof(self.keys)
+            + sys.getsizeof(self.key_ids)
+            + sys.getsizeof(self.values)
+            + sys.getsizeof(self.value_ids)
+            + sum(sys.getsizeof(key) for key in self.keys)
+            + sum(sys.getsizeof(value) for value in self.values)
+        )
+
+
+def count_values(
+    variations: tp.Sequence[tp.Mapping[str, tp.Any]],
+) -> dict[str, collections.Counter]:
+    """Count the values of every attribute key in one pass over variations.
+
+    Compact variations of one table are counted by value ids, column by
+    column, so they are not decoded.
+
+    Args:
+        variations (tp.Sequence[tp.Mapping[str, tp.Any]]): The variations.
+
+    Returns:
+        dict[str, collections.Counter]: Counts of values, indexed by key.
+            Values are counted in the order of the variations.
+    """
+    value_counts: dict[str, collections.Counter] = {}
+    if not variations:
+        return value_counts
+
+    compact = [
+        variation for variation in variations if isinstance(variation, CompactVariation)
+    ]
+    table = compact[0]._table if compact else None
+    if len(compact) < len(variations) or any(
+        variation._table is not table for variation in compact
+    ):
+        for variation in variations:
+            for key, value in variation.items():
+                counts = value_counts.get(key)
+                if counts is None:
+                    counts = value_counts[key] = collections.Counter()
+                counts[value] += 1
+        return value_counts
+
+    keys = compact[0]._table.keys
+    values = compact[0]._table.values
+    columns = itertools.zip_longest(
+        *(variation._ids for variation in compact), fillvalue=MISSING_VALUE_ID
+    )
+    for key_id, column in enumerate(columns):
+        id_counts = collections.Counter(column)
+        id_counts.pop(MISSING_VALUE_ID, None)
+        if id_counts:
+            value_counts[keys[key_id]] = collections.Counter(
+                {values[value_id]: count for value_id, count in id_counts.items()}
+            )
+    return value_counts
+
+
+class CompactVariation(collections.abc.Mapping):
+    """A read-only, dict-like view over a variation encoded as value ids.
+
+    The ids are stored in an array indexed by key id of the attribute table,
+    where missing attributes have `MISSING_VALUE_ID`.
+    """
+
+    __slots__ = ("_ids", "_table")
+
+    def __init__(self, table: AttributeTable, ids: array.array) -> None:
+        self._table = table
+        self._ids = ids
+
+    def __getitem__(self, key: str) -> tp.Any:
+        value_id = self._value_id(key)
+        if value_id == MISSING_VALUE_ID:
+            raise KeyError(key)
+        return self._table.values[value_id]
+
+    def __iter__(self) -> tp.Iterator[str]:
+        keys = self._table.keys
+        for key_id, value_id in enumerate(self._ids):
+            if value_id != MISSING_VALUE_ID:
+                yield keys[key_id]
+
+    def __len__(self) -> int:
+        return len(self._ids) - self._ids.count(MISSING_VALUE_ID)
+
+    def items(self) -> tp.ItemsView[str, tp.Any]:
+        return self.to_dict().items()
+
+    def get(self, key: str, default: tp.Any = None) -> tp.Any:
+        value_id = self._value_id(key)
+        if value_id == MISSING_VALUE_ID:
+            return default
+        return self._table.values[value_id]
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    def to_dict(self, exclude: tp.Container[str] = ()) -> dict[str, tp.Any]:
+        """Decode the variation into a dictionary.
+
+        Args:
+            exclude (tp.Container[str]): Keys to leave out.
+
+        Returns:
+            dict[str, tp.Any]: The decoded variation.
+        """
+        keys = self._table.keys
+        values = self._table.values
+        return {
+            keys[key_id]: values[value_id]
+            for key_id, value_id in enumerate(self._ids)
+            if value_id != MISSING_VALUE_ID and keys[key_id] not in exclude
+        }
+
+    def size_in_bytes(self) -> int:
+        """Estimate the memory used by the variation, without shared values."""
+        return sys.getsizeof(self) + sys.getsizeof(self._ids)
+
+    def _value_id(self, key: str) -> int:
+        key_id = self._table.key_ids.get(key)
+        if key_id is None or key_id >= len(self._ids):
+            return MISSING_VALUE_ID
+        return self._ids[key_id]
+
+
+class SharedValues(collections.abc.Mapping):
+    """A running intersection of compact variations of one table.
+
+    Variations are intersected by value ids, so they are not decoded. The
+    intersection is a read-only, dict-like view of the shared attributes.
+    """
+
+    __slots__ = ("_getter", "_key_ids", "_table", "_value_ids")
+
+    def __init__(self, variation: CompactVariation) -> None:
+        self._table = variation._table
+        self._set(
+            {
+                key_id: value_id
+                for key_id, value_id in enumerate(variation._ids)
+                if value_id != MISSING_VALUE_ID
+            }
+        )
+
+    def intersect(self, variation: tp.Mapping[str, tp.Any]) -> bool:
+        """Keep only the attributes that a variation has with the same values.
+
+        Args:
+            variation (tp.Mapping[str, tp.Any]): The variation to intersect with.
+
+        Returns:
+            bool: Whether the variation was intersected; False if it is not
+                a compact variation of the same table.
+        """
+        if not isinstance(variation, CompactVariation) or variation._table is not (
+            self._table
+        ):
+            return False
+
+        ids = variation._ids
+        # Most variations have all the shared values
+        if (
+            self._getter is not None
+            and len(ids) > self._key_ids[-1]
+            and self._getter(ids) == self._value_ids
+        ):
+            return True
+
+        self._set(
+            {
+                key_id: value_id
+                for key_id, value_id in zip(self._key_ids, self._value_ids, strict=True)
+                if key_id < len(ids) and ids[key_id] == value_id
+            }
+        )
+        return True
+
+    def __getitem__(self, key: str) -> tp.Any:
+        key_id = self._table.key_ids.get(key)
+        if key_id not in self._key_ids:
+            raise KeyError(key)
+        return self._table.values[self._value_ids[self._key_ids.index(key_id)]]
+
+    def __iter__(self) -> tp.Iterator[str]:
+        keys = self._table.keys
+        for key_id in self._key_ids:
+            yield keys[key_id]
+
+    def __len__(self) -> int:
+        return len(self._key_ids)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    def _set(self, shared: dict[int, int]) -> None:
+        self._key_ids = tuple(shared)
+        self._value_ids = tuple(shared.values())
+        # Key ids increase, so the last one bounds the ids a variation needs
+        self._getter = (
+            operator.itemgetter(*self._key_ids) if len(self._key_ids) > 1 else None
+        )
@@ -0,0 +1,285 @@
+import dataclasses
+import json
+import pathlib
+import sqlite3
+import typing as tp
+
+from src.grouper.catalog import GROUPER_ROW_NAME, Attributes, FlatDictRow
+from src.grouper.exceptions import CatalogStoreError, RequiredFieldMissingError
+from src.grouper.utils import collect_common_attributes
+
+# Variations with the same value of this key are updated in place
+VARIATION_KEY_DEFAULT = "ean"
+# Bump when the stored form of articles changes incompatibly
+STORE_VERSION = 1
+
+ArticleRecord = dict[str, tp.Any]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    article_number TEXT PRIMARY KEY,
+    variations TEXT NOT NULL,
+    common_attributes TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS attribute_counts (
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    articles_count INTEGER NOT NULL,
+    PRIMARY KEY (key, value)
+);
+CREATE INDEX IF NOT EXISTS attribute_counts_by_articles_count
+    ON attribute_counts (articles_count);
+"""
+
+
+@dataclasses.dataclass(frozen=True)
+class UpdateReport:
+    """Changes made to a catalog store by a delta.
+
+    Attributes:
+        rows (int): The number of rows applied.
+        articles_added (int): The number of new articles.
+        articles_updated (int): The number of existing articles touched.
+    """
+
+    rows: int
+    articles_added: int
+    articles_updated: int
+
+
+class CatalogStore:
+    """A grouped catalog persisted in SQLite, updated incrementally by deltas.
+
+    Every article is stored as one row with all attributes of its variations
+    and its article-level common attributes. For every attribute key and value,
+    the store counts the articles that have it in common, so catalog-level
+    common attributes are the items counted for all articles, found without
+    reading any article. Variations and attributes are stored as JSON.
+
+    Attributes:
+        path (pathlib.Path): The path of the SQLite database.
+        variation_key (str | None): The attribute identifying a variation within
+            an article, e.g. `ean`. Delta rows replace the variation with the
+            same value and are appended otherwise. If None, rows are appended.
+    """
+
+    def __init__(
+        self,
+        path: pathlib.Path,
+        variation_key: str | None = VARIATION_KEY_DEFAULT,
+    ) -> None:
+        self.path = path
+        self.variation_key = variation_key
+
+        self._connection = sqlite3.connect(path)
+        try:
+            self._check_version()
+        except CatalogStoreError:
+            self._connection.close()
+            raise
+        self._connection.executescript(_SCHEMA)
+        self._connection.execute(f"PRAGMA user_version = {STORE_VERSION}")
+
+    def __enter__(self) -> tp.Self:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def apply(self, rows: tp.Iterable[FlatDictRow]) -> UpdateReport:
+        """Apply transformed delta rows to the stored catalog in one transaction.
+
+        Only the articles of the rows are read and written; counters of their
+        old and new common attributes are adjusted.
+
+        Args:
+            rows (tp.Iterable[FlatDictRow]): Transformed rows of the delta.
+
+        Raises:
+            RequiredFieldMissingError: If the required 'article_number'
+                field is missing from a row.
+
+        Returns:
+            UpdateReport: The changes made.
+        """
+        rows_count = 0
+        delta: dict[str, list[Attributes]] = {}
+        for row in rows:
+            rows_count += 1
+            variation = dict(row)
+            article_number = variation.pop(GROUPER_ROW_NAME, None)
+            if not article_number:
+                raise RequiredFieldMissingError(
+                    f"Required field '{GROUPER_ROW_NAME}' is missing from the "
+                    f"data row: {row}"
+                )
+            delta.setdefault(article_number, []).append(variation)
+
+        articles_added = 0
+        with self._connection as connection:
+            for article_number, new_variations in delta.items():
+                stored = connection.execute(
+                    "SELECT variations, common_attributes FROM articles "
+                    "WHERE article_number = ?",
+                    (article_number,),
+                ).fetchone()
+
+                if stored is None:
+                    articles_added += 1
+                    variations = []
+                else:
+                    variations = json.loads(stored[0])
+                    self._count(connection, json.loads(stored[1]), increment=-1)
+
+                self._merge_variations(variations, new_variations)
+                common_attributes = collect_common_attributes(variations)
+                self._count(connection, common_attributes, increment=1)
+
+                connection.execute(
+                    "INSERT INTO articles VALUES (?, ?, ?) "
+                    "ON CONFLICT (article_number) DO UPDATE SET "
+                    "variations = excluded.variations, "
+                    "common_attributes = excluded.common_attributes",
+                    (
+                        article_number,
+                        json.dumps(variations),
+                        json.dumps(common_attributes),
+                    ),
+                )
+            connection.execute("DELETE FROM attribute_counts WHERE articles_count = 0")
+
+        return UpdateReport(
+            rows=rows_count,
+            articles_added=articles_added,
+            articles_updated=len(delta) - articles_added,
+        )
+
+    def to_catalog(self) -> "StoredCatalog":
+        """Represent the stored catalog, consolidated, for serialization.
+
+        Returns:
+            StoredCatalog: The catalog read from the store on demand.
+        """
+        (articles_count,) = self._connection.execute(
+            "SELECT COUNT(*) FROM articles"
+        ).fetchone()
+        common_items = self._connection.execute(
+            "SELECT key, value FROM attribute_counts WHERE articles_count = ?",
+            (articles_count,),
+        ).fetchall()
+
+        return StoredCatalog(
+            common_attributes={key: json.loads(value) for key, value in common_items}
+            if articles_count
+            else {},
+            articles_count=articles_count,
+            connection=self._connection,
+        )
+
+    def _check_version(self) -> None:
+        (version,) = self._connection.execute("PRAGMA user_version").fetchone()
+        (tables_count,) = self._connection.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'table'"
+        ).fetchone()
+        if tables_count and version != STORE_VERSION:
+            raise CatalogStoreError(
+                f"Catalog store {self.path} has version {version}, "
+                f"expected {STORE_VERSION}: rebuild it from the source files"
+            )
+
+    def _merge_variations(
+        self, variations: list[Attributes], new_variations: list[Attributes]
+    ) -> None:
+        if self.variation_key is None:
+            variations.extend(new_variations)
+            return
+
+        positions = {
+            variation[self.variation_key]: position
+            for position, variation in enumerate(variations)
+            if self.variation_key in variation
+        }
+        for variation in new_variations:
+            position = positions.get(variation.get(self.variation_key))
+            if position is None:
+                if self.variation_key in variation:
+                    positions[variation[self.variation_key]] = len(variations)
+                variations.append(variation)
+            else:
+                variations[position] = variation
+
+    @staticmethod
+    def _count(
+        connection: sqlite3.Connection, attributes: Attributes, increment: int
+    ) -> None:
+        connection.executemany(
+            "INSERT INTO attribute_counts VALUES (?, ?, ?) "
+            "ON CONFLICT (key, value) DO UPDATE SET "
+            "articles_count = articles_count + excluded.articles_count",
+            [(key, json.dumps(value), increment) for key, value in attributes.items()],
+        )
+
+
+@dataclasses.dataclass()
+class StoredCatalog:
+    """A consolidated catalog whose articles are read from a catalog store.
+
+    Attributes:
+        common_attributes (Attributes): A dictionary of attributes
+            common to all articles in the catalog.
+        articles_count (int): The number of articles in the store.
+        connection (sqlite3.Connection): The connection to the store.
+    """
+
+    common_attributes: Attributes
+    articles_count: int
+    connection: sqlite3.Connection = dataclasses.field(repr=False)
+
+    def iter_articles(self) -> tp.Iterator[ArticleRecord]:
+        """Iterate over articles in the order they were first stored.
+
+        Article common attributes are lifted from variations, and catalog
+        common attributes are removed from articles.
+
+        Yields:
+            ArticleRecord: An article represented as a dictionary.
+        """
+        cursor = self.connection.execute(
+            "SELECT article_number, variations, common_attributes FROM articles "
+            "ORDER BY rowid"
+        )
+        for article_number, variations, common_attributes in cursor:
+            article_common_attributes = json.loads(common_attributes)
+            yield {
+                "article_number": article_number,
+                "variations": [
+                    {
+                        key: value
+                        for key, value in variation.items()
+                        if key not in article_common_attributes
+                    }
+                    for variation in json.loads(variations)
+                ],
+                "common_attributes": {
+                    key: value
+                    for key, value in article_common_attributes.items()
+                    if key not in self.common_attributes
+                },
+            }
+
+    def to_dict(self) -> dict[str, tp.Any]:
+        """Represent the catalog as a dictionary for serialization.
+
+        Returns:
+            dict[str, tp.Any]: Articles as an iterator of (article number,
+                article) pairs, and the common attributes.
+        """
+        return {
+            "articles": (
+                (article["article_number"], article) for article in self.iter_articles()
+            ),
+            "common_attributes": self.common_attributes,
+        }
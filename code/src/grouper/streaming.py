@@ -0,0 +1,64 @@
+import typing as tp
+
+from src.grouper.catalog import (
+    GROUPER_ROW_NAME,
+    Article,
+    Catalog,
+    FlatDictRow,
+    iter_consolidated_articles,
+)
+from src.grouper.exceptions import RequiredFieldMissingError, UnsortedInputError
+
+
+def group_sorted(
+    rows: tp.Iterable[FlatDictRow], default_share: float | None = None
+) -> tp.Iterator[Article]:
+    """Group rows sorted by article number into articles as they complete.
+
+    Only the variations of the current article are kept in memory. Every
+    article is consolidated at the article level before it is yielded.
+    Article numbers are compared as strings with the previous one only, so
+    the order is checked without remembering completed articles.
+
+    Args:
+        rows (tp.Iterable[FlatDictRow]): Flat data rows, sorted by article
+            number in ascending order.
+        default_share (float | None): The share of the variations of an
+            article that must have the most frequent value of an attribute
+            for it to be lifted as a default. Defaults are not lifted if None.
+
+    Raises:
+        RequiredFieldMissingError: If the required 'article_number'
+            field is missing from a data row.
+        UnsortedInputError: If an article number is less than the previous
+            one, e.g. rows of a completed article appear again.
+
+    Yields:
+        Article: A complete article, consolidated at the article level.
+    """
+    current = Catalog.new()
+    current_article_number: str | None = None
+
+    for row in rows:
+        article_number = row.get(GROUPER_ROW_NAME)
+        if not article_number:
+            raise RequiredFieldMissingError(
+                f"Required field missing: '{GROUPER_ROW_NAME}'"
+            )
+
+        if article_number != current_article_number:
+            if current_article_number is not None and (
+                article_number < current_article_number
+            ):
+                raise UnsortedInputError(
+                    f"Input is not sorted by '{GROUPER_ROW_NAME}': "
+                    f"'{article_number}' follows '{current_article_number}'"
+                )
+            yield from iter_consolidated_articles(current, default_share)
+
+            current = Catalog.new()
+            current_article_number = article_number
+
+        current.add(flat_data_row=row)
+
+    yield from iter_consolidated_articles(current, default_share)
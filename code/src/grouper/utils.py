@@ -1,4 +1,10 @@
-def collect_common_attributes(dicts: list[dict]) -> dict:
+import collections
+import typing as tp
+
+_MISSING = object()
+
+
+def collect_common_attributes(dicts: tp.Sequence[tp.Mapping]) -> dict:
     if not dicts:
         return {}
 
@@ -10,6 +16,36 @@ def collect_common_attributes(dicts: list[dict]) -> dict:
     return dict(common_items)
 
 
+def split_default_attributes(
+    value_counts: tp.Mapping[str, collections.Counter], total: int, default_share: float
+) -> tuple[dict, dict]:
+    """Split attributes into common ones and defaults by counts of their values.
+
+    A value that all `total` dicts have is common; otherwise the most
+    frequent value of a key, the first counted on ties, is a default if at
+    least `default_share` of the dicts have it.
+
+    Returns:
+        tuple[dict, dict]: The common attributes and the default attributes.
+    """
+    common = {}
+    defaults = {}
+    for key, counts in value_counts.items():
+        value, count = counts.most_common(1)[0]
+        if count == total:
+            common[key] = value
+        elif count >= default_share * total:
+            defaults[key] = value
+    return common, defaults
+
+
+def intersect_attributes_inplace(common: dict, d: tp.Mapping) -> None:
+    """Keep only the items of `common` that are also present in `d`."""
+    stale_keys = [key for key, value in common.items() if d.get(key, _MISSING) != value]
+    for key in stale_keys:
+        del common[key]
+
+
 def remove_attributes_inplace(target_dict: dict, dict_to_remove: dict) -> None:
     for key in dict_to_remove:
         target_dict.pop(key, None)
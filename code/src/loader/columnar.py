@@ -0,0 +1,546 @@
+import argparse
+import array
+import itertools
+import json
+import mmap
+import pathlib
+import struct
+import sys
+import typing as tp
+
+from src.loader import loader
+from src.loader.encoders import DataClassJsonEncoder
+from src.loader.exceptions import InvalidCatalogFileError, LoaderError
+
+MAGIC = b"PCAT"
+VERSION = 1
+MISSING_ID = 0
+NULL_ID = 0xFFFFFFFF
+NO_DEFAULTS = 0xFFFFFFFF
+
+HEADER = struct.Struct("<4sHH")
+FOOTER = struct.Struct("<QQQ4s")
+U32 = struct.Struct("<I")
+BLOCK_SIZES = struct.Struct("<II")
+
+_MISSING = object()
+
+
+class CatalogFileWriter:
+    """Write a consolidated catalog to a binary columnar file, article by article.
+
+    All integers are little-endian. The file is laid out as:
+
+        header      magic b"PCAT", u16 version, u16 reserved
+        articles    one block per article, in the order they are written
+        dictionary  u32 count N, u64 offsets[N + 1] into the blob, UTF-8 blob
+        index       u32 count M, u32 article number ids[M], u64 block offsets[M]
+        attributes  u32 count K, K pairs of (u32 key id, u32 value id): the
+                    common attributes of the catalog
+        footer      u64 dictionary offset, u64 index offset,
+                    u64 attributes offset, magic b"PCAT"
+
+    Every key and value is stored once in the dictionary and referred to by its
+    id, starting at 1. An article block is:
+
+        u32 article number id
+        u32 count, pairs of (u32 key id, u32 value id): common attributes
+        u32 count or NO_DEFAULTS, pairs: default attributes
+        u32 columns count C, u32 rows count R
+        u32 key ids[C]
+        u32 value ids[C * R], column by column
+
+    In variation columns, `MISSING_ID` marks a variation without the attribute
+    and `NULL_ID` a null value, e.g. a variation overriding a default attribute
+    it does not have. The dictionary, index and catalog attributes are written
+    after the articles, so articles are written as they come and the file is
+    never sought.
+
+    Strings are collected into the dictionary as articles are written, so
+    only distinct keys and values are kept in memory.
+
+    Attributes:
+        articles_count (int): The number of articles written so far.
+    """
+
+    def __init__(self, stream: tp.BinaryIO) -> None:
+        self.articles_count = 0
+
+        self._stream = stream
+        self._position = 0
+        self._ids = _StringDictionary()
+        self._index_ids = array.array("I")
+        self._index_offsets = array.array("Q")
+
+        self._write(HEADER.pack(MAGIC, VERSION, 0))
+
+    def write_article(self, article: tp.Any) -> None:
+        """Write an article as a block of dictionary-encoded columns.
+
+        Args:
+            article (tp.Any): An article, or an article represented as a
+                dictionary with `article_number`, `variations`,
+                `common_attributes` and optionally `default_attributes`.
+        """
+        record = article.to_dict() if hasattr(article, "to_dict") else article
+        variations: list[dict[str, tp.Any]] = record["variations"]
+        # A dict keeps the order in which columns first appear
+        columns = list(dict.fromkeys(itertools.chain.from_iterable(variations)))
+
+        ids = self._ids
+        article_number_id = ids[record["article_number"]]
+        self._index_ids.append(article_number_id)
+        self._index_offsets.append(self._position)
+
+        default_attributes = record.get("default_attributes")
+        value_ids = array.array("I")
+        for key in columns:
+            # Looked up column by column without a Python-level loop
+            value_ids.extend(
+                map(
+                    ids.__getitem__,
+                    map(
+                        dict.get,
+                        variations,
+                        itertools.repeat(key),
+                        itertools.repeat(_MISSING),
+                    ),
+                )
+            )
+
+        self._write(U32.pack(article_number_id))
+        self._write(self._pack_attributes(record["common_attributes"]))
+        if default_attributes is None:
+            self._write(U32.pack(NO_DEFAULTS))
+        else:
+            self._write(self._pack_attributes(default_attributes))
+        self._write(BLOCK_SIZES.pack(len(columns), len(variations)))
+        self._write(_pack_array("I", map(ids.__getitem__, columns)))
+        self._write(_pack_array("I", value_ids))
+        self.articles_count += 1
+
+    def close(self, common_attributes: tp.Mapping[str, tp.Any]) -> None:
+        """Write the dictionary, the index and the catalog common attributes.
+
+        Args:
+            common_attributes (tp.Mapping[str, tp.Any]): Attributes common to
+                all articles of the catalog.
+        """
+        # Catalog attributes may add strings, so they are packed first
+        attributes = self._pack_attributes(common_attributes)
+
+        dictionary_offset = self._position
+        strings = self._ids.strings
+        self._write(U32.pack(len(strings)))
+        self._write(
+            _pack_array("Q", itertools.accumulate(map(len, strings), initial=0))
+        )
+        for encoded in strings:
+            self._write(encoded)
+
+        index_offset = self._position
+        self._write(U32.pack(self.articles_count))
+        self._write(_pack_array("I", self._index_ids))
+        self._write(_pack_array("Q", self._index_offsets))
+
+        attributes_offset = self._position
+        self._write(attributes)
+        self._write(
+            FOOTER.pack(dictionary_offset, index_offset, attributes_offset, MAGIC)
+        )
+
+    def _write(self, data: bytes) -> None:
+        self._stream.write(data)
+        self._position += len(data)
+
+    def _pack_attributes(self, attributes: tp.Mapping[str, tp.Any]) -> bytes:
+        ids = array.array("I")
+        for key, value in attributes.items():
+            ids.append(self._ids[key])
+            ids.append(self._ids[value])
+        return U32.pack(len(attributes)) + _pack_array("I", ids)
+
+
+class _StringDictionary(dict[tp.Any, int]):
+    """Ids of strings, assigned as strings are first looked up.
+
+    Missing and null values have their reserved ids.
+    """
+
+    def __init__(self) -> None:
+        super().__init__({_MISSING: MISSING_ID, None: NULL_ID})
+        self.strings: list[bytes] = []
+
+    def __missing__(self, value: tp.Any) -> int:
+        if not isinstance(value, str):
+            raise LoaderError(
+                "Only strings can be written to a catalog file, "
+                f"got {type(value).__name__}"
+            )
+        self.strings.append(value.encode())
+        string_id = self[value] = len(self.strings)
+        return string_id
+
+
+def write_catalog(catalog: tp.Any, stream: tp.BinaryIO) -> None:
+    """Write a consolidated catalog to a binary columnar file.
+
+    Args:
+        catalog (tp.Any): The catalog, with `common_attributes` and
+            `iter_articles`.
+        stream (tp.BinaryIO): The binary stream to write to.
+    """
+    writer = CatalogFileWriter(stream=stream)
+    for article in catalog.iter_articles():
+        writer.write_article(article)
+    writer.close(common_attributes=catalog.common_attributes)
+
+
+class CatalogFile:
+    """A binary columnar catalog file mapped into memory.
+
+    Opening the file reads only its dictionary offsets, index and catalog
+    common attributes. Articles are decoded when they are accessed, and
+    strings when they are first used. Articles must not be used after the
+    file is closed.
+
+    Attributes:
+        path (pathlib.Path): The path of the file.
+        common_attributes (dict[str, str]): Attributes common to all
+            articles of the catalog.
+    """
+
+    def __init__(self, path: pathlib.Path) -> None:
+        self.path = path
+
+        with open(path, "rb") as file:
+            try:
+                self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:
+                # An empty file cannot be mapped
+                raise InvalidCatalogFileError(f"{path} is not a catalog file") from e
+
+        try:
+            self._open()
+        except (InvalidCatalogFileError, struct.error) as e:
+            self._buffer.close()
+            raise InvalidCatalogFileError(
+                f"{path} is not a valid catalog file: {e}"
+            ) from e
+
+    def __enter__(self) -> tp.Self:
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._buffer.close()
+
+    @property
+    def articles_count(self) -> int:
+        return len(self._index_ids)
+
+    def __contains__(self, article_number: object) -> bool:
+        return article_number in self._article_offsets()
+
+    def article_numbers(self) -> tp.Iterator[str]:
+        """Iterate over article numbers in the order articles were written.
+
+        Yields:
+            str: An article number.
+        """
+        return map(self.string, self._index_ids)
+
+    def get(self, article_number: str) -> "MappedArticle":
+        """Get an article by its number, decoding only its block.
+
+        Args:
+            article_number (str): The article number.
+
+        Raises:
+            KeyError: If there is no such article.
+
+        Returns:
+            MappedArticle: The article.
+        """
+        return MappedArticle(
+            catalog_file=self, offset=self._article_offsets()[article_number]
+        )
+
+    def iter_articles(self) -> tp.Iterator["MappedArticle"]:
+        """Iterate over articles in the order they were written.
+
+        Yields:
+            MappedArticle: An article.
+        """
+        for offset in self._index_offsets:
+            yield MappedArticle(catalog_file=self, offset=offset)
+
+    def to_dict(self) -> dict[str, tp.Any]:
+        """Represent the catalog as a dictionary for serialization.
+
+        Returns:
+            dict[str, tp.Any]: Articles as an iterator of (article number,
+                article) pairs, and the common attributes.
+        """
+        return {
+            "articles": (
+                (article.article_number, article) for article in self.iter_articles()
+            ),
+            "common_attributes": self.common_attributes,
+        }
+
+    def string(self, string_id: int) -> str:
+        """Decode a string of the dictionary, caching it.
+
+        Args:
+            string_id (int): The id of the string, starting at 1.
+
+        Returns:
+            str: The string.
+        """
+        string = self._strings[string_id]
+        if string is None:
+            start = self._blob_offset + self._string_offsets[string_id - 1]
+            end = self._blob_offset + self._string_offsets[string_id]
+            string = self._strings[string_id] = self._buffer[start:end].decode()
+        return string
+
+    def value(self, value_id: int) -> str | None:
+        """Decode a value id, with None for missing and null values."""
+        if value_id == MISSING_ID or value_id == NULL_ID:
+            return None
+        return self.string(value_id)
+
+    def _open(self) -> None:
+        buffer = self._buffer
+        if len(buffer) < HEADER.size + FOOTER.size:
+            raise InvalidCatalogFileError("File is truncated")
+        magic, version, _ = HEADER.unpack_from(buffer, 0)
+        dictionary_offset, index_offset, attributes_offset, footer_magic = (
+            FOOTER.unpack_from(buffer, len(buffer) - FOOTER.size)
+        )
+        if magic != MAGIC or footer_magic != MAGIC:
+            raise InvalidCatalogFileError("Magic bytes do not match")
+        if version != VERSION:
+            raise InvalidCatalogFileError(f"Unsupported version {version}")
+
+        (strings_count,) = U32.unpack_from(buffer, dictionary_offset)
+        offsets_position = dictionary_offset + U32.size
+        self._string_offsets = _unpack_array(
+            "Q", buffer, offsets_position, strings_count + 1
+        )
+        self._blob_offset = offsets_position + 8 * (strings_count + 1)
+        self._strings: list[str | None] = [None] * (strings_count + 1)
+
+        (articles_count,) = U32.unpack_from(buffer, index_offset)
+        self._index_ids = _unpack_array(
+            "I", buffer, index_offset + U32.size, articles_count
+        )
+        self._index_offsets = _unpack_array(
+            "Q", buffer, index_offset + U32.size + 4 * articles_count, articles_count
+        )
+        self._offsets_by_number: dict[str, int] | None = None
+
+        self.common_attributes, _ = self._read_attributes(attributes_offset)
+
+    def _article_offsets(self) -> dict[str, int]:
+        if self._offsets_by_number is None:
+            self._offsets_by_number = dict(
+                zip(self.article_numbers(), self._index_offsets, strict=True)
+            )
+        return self._offsets_by_number
+
+    def _read_attributes(self, offset: int) -> tuple[dict[str, tp.Any], int]:
+        (count,) = U32.unpack_from(self._buffer, offset)
+        ids = _unpack_array("I", self._buffer, offset + U32.size, 2 * count)
+        attributes = {
+            self.string(key_id): self.value(value_id)
+            for key_id, value_id in zip(ids[::2], ids[1::2], strict=True)
+        }
+        return attributes, offset + U32.size + 4 * len(ids)
+
+    def _read_u32s(self, offset: int, count: int) -> array.array:
+        return _unpack_array("I", self._buffer, offset, count)
+
+
+class MappedArticle:
+    """An article of a catalog file, with variations decoded on access.
+
+    The attributes and columns of the article are decoded when it is
+    created; values of a column or of all variations only when they are
+    accessed. Like `Article`, variations are without the attributes lifted
+    to the article, and override default attributes.
+
+    Attributes:
+        article_number (str): The unique identifier for the article.
+        common_attributes (dict[str, tp.Any]): Attributes common to all
+            variations of the article.
+        default_attributes (dict[str, tp.Any] | None): Default attributes of
+            the variations, or None if defaults were not lifted.
+        columns (list[str]): Keys of the variations, in the order they
+            first appear.
+        variations_count (int): The number of variations.
+    """
+
+    __slots__ = (
+        "_catalog_file",
+        "_values_offset",
+        "article_number",
+        "columns",
+        "common_attributes",
+        "default_attributes",
+        "variations_count",
+    )
+
+    def __init__(self, catalog_file: CatalogFile, offset: int) -> None:
+        self._catalog_file = catalog_file
+        buffer = catalog_file._buffer
+
+        (article_number_id,) = U32.unpack_from(buffer, offset)
+        self.article_number = catalog_file.string(article_number_id)
+        self.common_attributes, offset = catalog_file._read_attributes(
+            offset + U32.size
+        )
+
+        self.default_attributes: dict[str, tp.Any] | None = None
+        (defaults_count,) = U32.unpack_from(buffer, offset)
+        if defaults_count == NO_DEFAULTS:
+            offset += U32.size
+        else:
+            self.default_attributes, offset = catalog_file._read_attributes(offset)
+
+        columns_count, self.variations_count = BLOCK_SIZES.unpack_from(buffer, offset)
+        offset += BLOCK_SIZES.size
+        self.columns = [
+            catalog_file.string(key_id)
+            for key_id in catalog_file._read_u32s(offset, columns_count)
+        ]
+        self._values_offset = offset + 4 * columns_count
+
+    def column(self, key: str) -> list[str | None]:
+        """Decode the values of one column, reading no other column.
+
+        Args:
+            key (str): The key of the column.
+
+        Raises:
+            KeyError: If no variation of the article has the key.
+
+        Returns:
+            list[str | None]: A value per variation, with None for the
+                variations without it.
+        """
+        try:
+            position = self.columns.index(key)
+        except ValueError as e:
+            raise KeyError(key) from e
+
+        rows_count = self.variations_count
+        value_ids = self._catalog_file._read_u32s(
+            self._values_offset + 4 * rows_count * position, rows_count
+        )
+        return list(map(self._catalog_file.value, value_ids))
+
+    def iter_variations(self) -> tp.Iterator[dict[str, tp.Any]]:
+        """Iterate over variations, decoding all columns of the article.
+
+        Yields:
+            dict[str, tp.Any]: A variation, without the attributes it does
+                not have.
+        """
+        catalog_file = self._catalog_file
+        rows_count = self.variations_count
+        value_ids = catalog_file._read_u32s(
+            self._values_offset, len(self.columns) * rows_count
+        )
+        # Every distinct value of the article is decoded once
+        decoded: dict[int, tp.Any] = {MISSING_ID: _MISSING, NULL_ID: None}
+        for value_id in set(value_ids).difference(decoded):
+            decoded[value_id] = catalog_file.string(value_id)
+        values = list(map(decoded.__getitem__, value_ids))
+
+        columns = [
+            values[position * rows_count : (position + 1) * rows_count]
+            for position in range(len(self.columns))
+        ]
+        for row in zip(*columns, strict=True):
+            yield {
+                key: value
+                for key, value in zip(self.columns, row, strict=True)
+                if value is not _MISSING
+            }
+
+    @property
+    def variations(self) -> list[dict[str, tp.Any]]:
+        return list(self.iter_variations())
+
+    def to_dict(self) -> dict[str, tp.Any]:
+        """Represent the article as a dictionary for serialization.
+
+        Returns:
+            dict[str, tp.Any]: The article, as `Article.to_dict` represents it.
+        """
+        record = {
+            "article_number": self.article_number,
+            "variations": self.variations,
+            "common_attributes": self.common_attributes,
+        }
+        if self.default_attributes is not None:
+            record["default_attributes"] = self.default_attributes
+        return record
+
+
+def _pack_array(typecode: str, values: tp.Iterable[int]) -> bytes:
+    packed = array.array(typecode, values)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def _unpack_array(
+    typecode: str, buffer: mmap.mmap, offset: int, count: int
+) -> array.array:
+    unpacked = array.array(typecode)
+    end = offset + unpacked.itemsize * count
+    if end > len(buffer):
+        raise InvalidCatalogFileError("File is truncated")
+    unpacked.frombytes(buffer[offset:end])
+    if sys.byteorder == "big":
+        unpacked.byteswap()
+    return unpacked
+
+
+def main() -> None:
+    """Parse CLI args and write articles of a catalog file as JSON to stdout."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("path", type=pathlib.Path, help="Path to the catalog file")
+    parser.add_argument(
+        "articles",
+        nargs="*",
+        help="Article numbers to write (default: all articles)",
+    )
+    args = parser.parse_args()
+
+    with CatalogFile(args.path) as catalog_file:
+        if not args.articles:
+            loader.write_json(
+                obj=catalog_file, stream=sys.stdout, encoder_cls=DataClassJsonEncoder
+            )
+            return
+
+        missing = [number for number in args.articles if number not in catalog_file]
+        if missing:
+            parser.error(f"articles not found: {', '.join(missing)}")
+        json.dump(
+            [catalog_file.get(number).to_dict() for number in args.articles],
+            sys.stdout,
+            ensure_ascii=False,
+            indent=loader.JSON_INDENT,
+        )
+        sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
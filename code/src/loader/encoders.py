@@ -5,6 +5,12 @@ import typing as tp
 
 class DataClassJsonEncoder(json.JSONEncoder):
     def default(self, o: tp.Any) -> dict:
+        if hasattr(o, "to_dict"):
+            return o.to_dict()
         if hasattr(o, "__dataclass_fields__"):
-            return dataclasses.asdict(o)
+            # Shallow, field by field: nested values are encoded as they are
+            # reached instead of being deep-copied upfront by `asdict`.
+            return {
+                field.name: getattr(o, field.name) for field in dataclasses.fields(o)
+            }
         return super().default(o)
@@ -0,0 +1,9 @@
+from src.exceptions import ApplicationError
+
+
+class LoaderError(ApplicationError):
+    message = "Loader error"
+
+
+class InvalidCatalogFileError(LoaderError):
+    message = "Invalid catalog file"
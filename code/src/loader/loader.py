@@ -1,6 +1,15 @@
+import collections.abc
+import contextlib
 import json
+import sys
 import typing as tp
 
+from src.loader import tables
+from src.loader.schemas import OutputFormat, OutputLayout, OutputMeta
+
+JSON_INDENT = 2
+OUTPUT_BUFFER_SIZE = 1024 * 1024
+
 
 def encode_to_json(obj: tp.Any, encoder_cls: type[json.JSONEncoder]) -> str:
     return json.dumps(
@@ -10,3 +19,175 @@ def encode_to_json(obj: tp.Any, encoder_cls: type[json.JSONEncoder]) -> str:
         ensure_ascii=False,
         sort_keys=False,
     )
+
+
+@contextlib.contextmanager
+def open_output(output: OutputMeta) -> tp.Iterator[tp.TextIO]:
+    """Open the output stream: a buffered file or stdout.
+
+    Args:
+        output (OutputMeta): Metadata for the output.
+
+    Yields:
+        tp.TextIO: A text stream to write to.
+    """
+    if output.path is None:
+        yield sys.stdout
+        sys.stdout.flush()
+        return
+
+    with open(
+        output.path, "w", encoding=output.encoding, buffering=OUTPUT_BUFFER_SIZE
+    ) as stream:
+        yield stream
+
+
+@contextlib.contextmanager
+def open_binary_output(output: OutputMeta) -> tp.Iterator[tp.BinaryIO]:
+    """Open the binary output stream: a buffered file or stdout.
+
+    Args:
+        output (OutputMeta): Metadata for the output.
+
+    Yields:
+        tp.BinaryIO: A binary stream to write to.
+    """
+    if output.path is None:
+        yield sys.stdout.buffer
+        sys.stdout.buffer.flush()
+        return
+
+    with open(output.path, "wb", buffering=OUTPUT_BUFFER_SIZE) as stream:
+        yield stream
+
+
+def write_catalog(
+    catalog: tp.Any,
+    stream: tp.TextIO,
+    output: OutputMeta,
+    encoder_cls: type[json.JSONEncoder],
+) -> None:
+    """Write a consolidated catalog in the output format and layout.
+
+    Args:
+        catalog (tp.Any): The catalog, with `common_attributes` and
+            `iter_articles`.
+        stream (tp.TextIO): The stream to write to.
+        output (OutputMeta): Metadata for the output.
+        encoder_cls (type[json.JSONEncoder]): The encoder for the values.
+    """
+    if output.layout is OutputLayout.TABLE:
+        # Variations are turned into tables as articles are written
+        catalog = tables.TableCatalog(catalog=catalog)
+
+    if output.format is OutputFormat.NDJSON:
+        # Header line with catalog attributes, then one line per article
+        write_ndjson(
+            header={"common_attributes": catalog.common_attributes},
+            records=catalog.iter_articles(),
+            stream=stream,
+            encoder_cls=encoder_cls,
+        )
+    else:
+        write_json(
+            obj=catalog,
+            stream=stream,
+            encoder_cls=encoder_cls,
+            compact=output.compact,
+        )
+
+
+def write_json(
+    obj: tp.Any,
+    stream: tp.TextIO,
+    encoder_cls: type[json.JSONEncoder],
+    compact: bool = False,
+) -> None:
+    """Write an object as JSON, streaming its top-level mappings item by item.
+
+    Only one item of a top-level mapping (e.g. one article of a catalog) is
+    encoded into a string at a time. Top-level values that are iterators of
+    (key, value) pairs are written as objects, so they may be produced lazily.
+    In the default mode the output is the same as `encode_to_json` produces.
+
+    Args:
+        obj (tp.Any): A dataclass or a dict to write.
+        stream (tp.TextIO): The stream to write to.
+        encoder_cls (type[json.JSONEncoder]): The encoder for the values.
+        compact (bool): Write without indentation and whitespace.
+    """
+    if compact:
+        encoder = encoder_cls(ensure_ascii=False, separators=(",", ":"))
+    else:
+        encoder = encoder_cls(ensure_ascii=False, indent=JSON_INDENT)
+
+    fields = obj if isinstance(obj, dict) else encoder.default(obj)
+    _write_object(
+        items=fields.items(),
+        stream=stream,
+        encoder=encoder,
+        level=0,
+        compact=compact,
+        stream_values=True,
+    )
+    stream.write("\n")
+
+
+def write_ndjson(
+    header: dict[str, tp.Any],
+    records: tp.Iterable[tp.Any],
+    stream: tp.TextIO,
+    encoder_cls: type[json.JSONEncoder],
+) -> None:
+    """Write a header record followed by one JSON record per line.
+
+    Every line is a complete JSON document, so consumers can split the output
+    by lines and parse the records in parallel.
+
+    Args:
+        header (dict[str, tp.Any]): The first record, e.g. catalog attributes.
+        records (tp.Iterable[tp.Any]): The records to write after the header.
+        stream (tp.TextIO): The stream to write to.
+        encoder_cls (type[json.JSONEncoder]): The encoder for the records.
+    """
+    encoder = encoder_cls(ensure_ascii=False, separators=(",", ":"))
+
+    stream.write(encoder.encode(header))
+    stream.write("\n")
+    for record in records:
+        stream.write(encoder.encode(record))
+        stream.write("\n")
+
+
+def _write_object(
+    items: tp.Iterable[tuple[str, tp.Any]],
+    stream: tp.TextIO,
+    encoder: json.JSONEncoder,
+    level: int,
+    compact: bool,
+    stream_values: bool,
+) -> None:
+    key_separator = ":" if compact else ": "
+    item_indent = "" if compact else "\n" + " " * JSON_INDENT * (level + 1)
+    closing_indent = "" if compact else "\n" + " " * JSON_INDENT * level
+
+    is_empty = True
+    for key, value in items:
+        stream.write("{" if is_empty else ",")
+        stream.write(item_indent + encoder.encode(key) + key_separator)
+        is_empty = False
+
+        if stream_values and isinstance(value, dict | collections.abc.Iterator):
+            _write_object(
+                items=value.items() if isinstance(value, dict) else value,
+                stream=stream,
+                encoder=encoder,
+                level=level + 1,
+                compact=compact,
+                stream_values=False,
+            )
+        else:
+            encoded = encoder.encode(value)
+            stream.write(encoded if compact else encoded.replace("\n", item_indent))
+
+    stream.write("{}" if is_empty else closing_indent + "}")
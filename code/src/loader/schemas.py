@@ -0,0 +1,25 @@
+import dataclasses
+import enum
+import pathlib
+
+
+class OutputFormat(enum.StrEnum):
+    JSON = "json"
+    NDJSON = "ndjson"
+    BINARY = "bin"
+
+
+class OutputLayout(enum.StrEnum):
+    """The layout of variations: an object each, or a table per article."""
+
+    OBJECTS = "objects"
+    TABLE = "table"
+
+
+@dataclasses.dataclass(frozen=True)
+class OutputMeta:
+    path: pathlib.Path | None = None
+    format: OutputFormat = OutputFormat.JSON
+    compact: bool = False
+    layout: OutputLayout = OutputLayout.OBJECTS
+    encoding: str = "utf-8"
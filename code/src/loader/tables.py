@@ -0,0 +1,174 @@
+import dataclasses
+import itertools
+import typing as tp
+
+ArticleRecord = dict[str, tp.Any]
+
+VARIATIONS_KEY = "variations"
+GROUPS_KEY = "groups"
+COLUMNS_KEY = "columns"
+ROWS_KEY = "rows"
+
+
+class ConsolidatedCatalog(tp.Protocol):
+    """A consolidated catalog of any grouping mode, e.g. in memory or spilled."""
+
+    @property
+    def common_attributes(self) -> dict[str, tp.Any]: ...
+
+    @property
+    def articles_count(self) -> int: ...
+
+    def iter_articles(self) -> tp.Iterator[tp.Any]: ...
+
+
+@dataclasses.dataclass()
+class TableCatalog:
+    """A consolidated catalog whose variations are written as tables.
+
+    Every article (or group of variations) carries `columns`, the keys of
+    its variations in the order they first appear, and `rows`, one list of
+    values per variation, instead of `variations`. A variation that does
+    not have a column has null in it:
+
+        {"article_number": "15189-02",
+         "columns": ["ean", "size_code", "price"],
+         "rows": [["8719245200978", "38", "58.5"],
+                  ["8719245200985", "39", null]],
+         "common_attributes": {...}}
+
+    Key names are written once per article rather than once per variation.
+    `restore_variations` turns a table back into variations.
+
+    Attributes:
+        catalog (ConsolidatedCatalog): The consolidated catalog.
+    """
+
+    catalog: ConsolidatedCatalog
+
+    @property
+    def common_attributes(self) -> dict[str, tp.Any]:
+        return self.catalog.common_attributes
+
+    @property
+    def articles_count(self) -> int:
+        return self.catalog.articles_count
+
+    def iter_articles(self) -> tp.Iterator[ArticleRecord]:
+        """Iterate over articles with their variations as tables.
+
+        Yields:
+            ArticleRecord: An article represented as a dictionary.
+        """
+        for article in self.catalog.iter_articles():
+            record = article.to_dict() if hasattr(article, "to_dict") else article
+            yield tabulate_record(record)
+
+    def to_dict(self) -> dict[str, tp.Any]:
+        """Represent the catalog as a dictionary for serialization.
+
+        Returns:
+            dict[str, tp.Any]: Articles as an iterator of (article number,
+                article) pairs, and the common attributes.
+        """
+        return {
+            "articles": (
+                (record["article_number"], record) for record in self.iter_articles()
+            ),
+            "common_attributes": self.common_attributes,
+        }
+
+
+def to_table(
+    variations: tp.Sequence[tp.Mapping[str, tp.Any]],
+) -> tuple[list[str], list[list[tp.Any]]]:
+    """Encode variations as a table.
+
+    Args:
+        variations (tp.Sequence[tp.Mapping[str, tp.Any]]): The variations.
+
+    Returns:
+        tuple[list[str], list[list[tp.Any]]]: The columns, in the order they
+            first appear, and a row of values per variation, with None for
+            the columns a variation does not have.
+    """
+    # A dict keeps the order in which columns first appear
+    columns = list(dict.fromkeys(itertools.chain.from_iterable(variations)))
+    rows = [list(map(variation.get, columns)) for variation in variations]
+    return columns, rows
+
+
+def from_table(
+    columns: tp.Sequence[str], rows: tp.Iterable[tp.Sequence[tp.Any]]
+) -> list[dict[str, tp.Any]]:
+    """Decode a table into variations, leaving out null values.
+
+    Args:
+        columns (tp.Sequence[str]): The columns of the table.
+        rows (tp.Iterable[tp.Sequence[tp.Any]]): The rows of the table.
+
+    Returns:
+        list[dict[str, tp.Any]]: A variation per row.
+    """
+    return [
+        {
+            key: value
+            for key, value in zip(columns, row, strict=True)
+            if value is not None
+        }
+        for row in rows
+    ]
+
+
+def tabulate_record(record: ArticleRecord) -> ArticleRecord:
+    """Replace the variations of an article, or of its groups, by tables.
+
+    Args:
+        record (ArticleRecord): An article or a group with `variations`, or
+            with nested `groups`.
+
+    Returns:
+        ArticleRecord: The record with `columns` and `rows` in place of
+            `variations`, keeping the order of the other keys.
+    """
+    tabulated: ArticleRecord = {}
+    for key, value in record.items():
+        if key == VARIATIONS_KEY:
+            tabulated[COLUMNS_KEY], tabulated[ROWS_KEY] = to_table(value)
+        elif key == GROUPS_KEY:
+            tabulated[key] = {
+                group_key: tabulate_record(group) for group_key, group in value.items()
+            }
+        else:
+            tabulated[key] = value
+    return tabulated
+
+
+def restore_variations(record: ArticleRecord) -> ArticleRecord:
+    """Turn the tables of an article, or of its groups, back into variations.
+
+    This is the inverse of `tabulate_record` for consumers of the table
+    layout, e.g. of a parsed NDJSON line.
+
+    Args:
+        record (ArticleRecord): An article or a group with `columns` and
+            `rows`, or with nested `groups`.
+
+    Returns:
+        ArticleRecord: The record with `variations` in place of `columns`
+            and `rows`.
+    """
+    restored: ArticleRecord = {}
+    for key, value in record.items():
+        if key == COLUMNS_KEY:
+            restored[VARIATIONS_KEY] = from_table(columns=value, rows=record[ROWS_KEY])
+        elif key == ROWS_KEY:
+            continue
+        elif key == GROUPS_KEY:
+            restored[key] = {
+                group_key: restore_variations(group)
+                for group_key, group in value.items()
+            }
+        else:
+            restored[key] = value
+    return restored
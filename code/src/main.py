@@ -1,18 +1,32 @@
-import argparse
+import contextlib
 import pathlib
+import tempfile
+import typing as tp
 
+from src import cli
+from src import schemas as pipeline_schemas
+from src import stats as pipeline_stats
 from src.extractor import reader
 from src.extractor import schemas as extractor_schemas
 from src.grouper import catalog as catalog_grouper
+from src.grouper import hierarchy, spill, streaming
+from src.grouper import store as catalog_store
+from src.loader import columnar, loader
 from src.loader import encoders as loader_enc
-from src.loader import loader
+from src.loader import schemas as loader_schemas
+from src.transformer import cache as mapping_cache
 from src.transformer import transformer
 
-CSV_DELIMITER_DEFAULT = ";"
+Catalog = catalog_grouper.Catalog | spill.SpilledCatalog | catalog_store.StoredCatalog
 
 
 def run_pipeline(
-    source_file: reader.CsvFileReaderMeta, mappings_file: reader.CsvFileReaderMeta
+    source_file: reader.CsvFileReaderMeta,
+    mappings_file: reader.CsvFileReaderMeta,
+    output: loader_schemas.OutputMeta | None = None,
+    options: pipeline_schemas.PipelineOptions | None = None,
+    mapping: transformer.Mapping | None = None,
+    stats_stream: tp.TextIO | None = None,
 ) -> None:
     """Run the ETL pipeline.
 
@@ -22,77 +36,232 @@ def run_pipeline(
         - Transform it using predefined strategies.
         - Group the transformed data into a catalog.
         - Consolidate common attributes at the article and catalog levels.
-        - Serialize the catalog to JSON and output to stdout.
+        - Serialize the catalog to JSON (or NDJSON) article by article and
+          output it to stdout or a file.
 
     Args:
         source_file (reader.CsvFileReaderMeta): Metadata for the source CSV file.
         mappings_file (reader.CsvFileReaderMeta): Metadata for the mappings CSV file.
+        output (loader_schemas.OutputMeta | None): Metadata for the output.
+            Defaults to JSON written to stdout.
+        options (pipeline_schemas.PipelineOptions | None): Pipeline options,
+            e.g. the number of worker processes, the memory budget for
+            grouping or whether the source is sorted by article number.
+            Defaults to a single process grouping in memory. With
+            `options.stats`, timings, throughput and memory usage are written
+            to stderr.
+        mapping (transformer.Mapping | None): The mapping built from the
+            mappings file beforehand, e.g. once for a batch of source files.
+            If None, it is built from the mappings file.
+        stats_stream (tp.TextIO | None): The stream to write statistics to
+            instead of stderr.
     """
-    # Extract
-    # Read all mappings at once
-    mappings_reader_by_row = reader.CsvReader(
-        file_meta=mappings_file,
-        validation_schema=extractor_schemas.CsvMappingSchemaRequired,
-    ).read_by_row()
+    if output is None:
+        output = loader_schemas.OutputMeta()
+    if options is None:
+        options = pipeline_schemas.PipelineOptions()
 
-    # Transform all mappings at once
-    mapping = transformer.Mapping()
-    mapping.build(mapping_rows=mappings_reader_by_row)
+    stats: pipeline_stats.PipelineStats | None = None
+    if options.stats or options.trace_memory:
+        stats = pipeline_stats.PipelineStats(
+            stream=stats_stream, trace_memory=options.trace_memory
+        )
 
-    # Read, transform and group source file into a catalog by row
-    catalog = catalog_grouper.Catalog.new()
+    with contextlib.ExitStack() as stack:
+        if stats is not None:
+            # Entered first to report after temp files are cleaned up
+            stack.enter_context(stats)
 
-    for row in reader.CsvReader(
-        file_meta=source_file,
-        validation_schema=extractor_schemas.CsvSourceSchemaRequired,
-    ).read_by_row():
-        transformed_row = transformer.transform_row(source_row=row, mapping=mapping)
-        catalog = catalog.add(flat_data_row=transformed_row)
+        if mapping is None:
+            with pipeline_stats.phase(stats, "mappings"):
+                # Extract and transform all mappings at once,
+                # or load them compiled by an earlier run
+                mapping = mapping_cache.load_mapping(
+                    mappings_file=mappings_file,
+                    cache_directory=options.mappings_cache,
+                )
 
-    # Regroup catalog
-    catalog_grouper.consolidate_common_attributes(catalog=catalog)
+        spill_partitions_count = 1
+        spill_buffered_rows = None
+        if options.max_memory is not None:
+            spill_partitions_count = spill.estimate_partitions_count(
+                source_size=reader.estimate_size(source_file.path),
+                max_memory=options.max_memory,
+            )
+            spill_buffered_rows = spill.estimate_buffered_rows(options.max_memory)
 
-    # Load
-    serialised_catalog = loader.encode_to_json(
-        obj=catalog, encoder_cls=loader_enc.DataClassJsonEncoder
-    )
-    # Output to stdout
-    print(serialised_catalog)
-
-
-def parse_cli() -> tuple[reader.CsvFileReaderMeta, reader.CsvFileReaderMeta]:
-    parser = argparse.ArgumentParser()
-    parser.add_argument(
-        "-s",
-        "--source",
-        type=pathlib.Path,
-        help="Path to the source file",
-        required=True,
-    )
-    parser.add_argument(
-        "-m",
-        "--mappings",
-        type=pathlib.Path,
-        help="Path to the mappings file",
-        required=True,
+        # Read, transform and group source file into a catalog by row
+        catalog: Catalog
+        if options.store is not None:
+            # Apply the source file as a delta to the stored catalog
+            with pipeline_stats.phase(stats, "grouping"):
+                store = stack.enter_context(
+                    catalog_store.CatalogStore(path=options.store)
+                )
+                store.apply(rows=_transform_rows(source_file, mapping, options, stats))
+                catalog = store.to_catalog()
+        elif options.sorted_input:
+            # Group and consolidate every article as soon as it is complete,
+            # then combine catalog common attributes from spooled articles
+            with pipeline_stats.phase(stats, "grouping"):
+                spool_directory = stack.enter_context(tempfile.TemporaryDirectory())
+                spool = spill.ArticleSpool(directory=pathlib.Path(spool_directory))
+                articles = streaming.group_sorted(
+                    _transform_rows(source_file, mapping, options, stats),
+                    default_share=options.default_share,
+                )
+                if stats is not None:
+                    articles = stats.iterate("group", articles)
+                spool.write(articles=articles)
+                catalog = spool.to_catalog()
+        elif spill_partitions_count > 1:
+            # Spill rows to temp files and group them partition by partition
+            with pipeline_stats.phase(stats, "grouping"):
+                spill_directory = stack.enter_context(tempfile.TemporaryDirectory())
+                grouper = spill.ExternalGrouper(
+                    directory=pathlib.Path(spill_directory),
+                    partitions_count=spill_partitions_count,
+                    max_buffered_rows=spill_buffered_rows,
+                )
+                _group_rows(
+                    grouper.add,
+                    _transform_rows(source_file, mapping, options, stats),
+                    stats,
+                )
+
+            # Regroup catalog
+            with pipeline_stats.phase(stats, "consolidation"):
+                catalog = grouper.consolidate(default_share=options.default_share)
+        else:
+            with pipeline_stats.phase(stats, "grouping"):
+                if options.workers > 1:
+                    # Imported on demand: process pools are slow to import,
+                    # which matters for many small runs
+                    from src import parallel
+
+                    # Group shards of the source file on worker processes
+                    catalog = parallel.build_catalog(
+                        source_file=source_file,
+                        mapping=mapping,
+                        workers=options.workers,
+                        drop_columns=options.drop_columns,
+                    )
+                    if stats is not None:
+                        stats.rows = sum(
+                            len(article.variations)
+                            for article in catalog.articles.values()
+                        )
+                else:
+                    catalog = catalog_grouper.Catalog.new()
+                    _group_rows(
+                        catalog.add,
+                        _transform_rows(source_file, mapping, options, stats),
+                        stats,
+                    )
+
+            # Regroup catalog
+            with pipeline_stats.phase(stats, "consolidation"):
+                catalog_grouper.consolidate_common_attributes(
+                    catalog=catalog, default_share=options.default_share
+                )
+
+        if stats is not None:
+            stats.articles = catalog.articles_count
+
+        # Load
+        with pipeline_stats.phase(stats, "load"):
+            _load(catalog=catalog, output=output, group_by=options.group_by)
+
+
+def _transform_rows(
+    source_file: reader.CsvFileReaderMeta,
+    mapping: transformer.Mapping,
+    options: pipeline_schemas.PipelineOptions,
+    stats: pipeline_stats.PipelineStats | None = None,
+) -> tp.Iterator[reader.Row]:
+    csv_reader = reader.CsvReader(
+        file_meta=source_file,
+        validation_schema=extractor_schemas.CsvSourceSchemaRequired,
     )
-    parser.add_argument(
-        "-d",
-        "--delimiter",
-        type=str,
-        help="Delimiter",
-        required=False,
-        default=CSV_DELIMITER_DEFAULT,
+    # Read only the columns needed, as tuples of values
+    transform = transformer.TupleTransform.compile(
+        plan=mapping.plan,
+        fieldnames=csv_reader.read_header(),
+        drop_columns=options.drop_columns,
     )
-    args = parser.parse_args()
-    return (
-        reader.CsvFileReaderMeta(
-            path=pathlib.Path(args.source), delimiter=args.delimiter
-        ),
-        reader.CsvFileReaderMeta(
-            path=pathlib.Path(args.mappings), delimiter=args.delimiter
-        ),
+    rows = csv_reader.read_by_tuple(columns=transform.columns)
+    if stats is None:
+        yield from transform.apply_batches(rows)
+        return
+
+    # Time reading and transforming separately, and report reading progress
+    timed_rows = stats.iterate(
+        "read",
+        rows,
+        position=lambda: csv_reader.position,
+        total=source_file.path.stat().st_size,
     )
+    for transformed_row in stats.iterate(
+        "transform", transform.apply_batches(timed_rows)
+    ):
+        stats.rows += 1
+        yield transformed_row
+
+    if transform.cache is not None:
+        stats.counters["transform_cache"] = {
+            "hits": transform.cache.hits,
+            "misses": transform.cache.misses,
+        }
+
+
+def _group_rows(
+    add: tp.Callable[[reader.Row], tp.Any],
+    rows: tp.Iterable[reader.Row],
+    stats: pipeline_stats.PipelineStats | None = None,
+) -> None:
+    if stats is None:
+        for row in rows:
+            add(row)
+        return
+
+    for row in rows:
+        stats.call("group", add, row)
+
+
+def _load(
+    catalog: Catalog,
+    output: loader_schemas.OutputMeta,
+    group_by: tuple[str, ...] = (catalog_grouper.GROUPER_ROW_NAME,),
+) -> None:
+    if output.format is loader_schemas.OutputFormat.BINARY:
+        with loader.open_binary_output(output) as binary_stream:
+            columnar.write_catalog(catalog=catalog, stream=binary_stream)
+        return
+
+    # Variations are split into nested groups as articles are written
+    output_catalog: Catalog | hierarchy.GroupedCatalog = catalog
+    if len(group_by) > 1:
+        output_catalog = hierarchy.GroupedCatalog(
+            catalog=catalog, group_by=group_by[1:]
+        )
+
+    with loader.open_output(output) as stream:
+        loader.write_catalog(
+            catalog=output_catalog,
+            stream=stream,
+            output=output,
+            encoder_cls=loader_enc.DataClassJsonEncoder,
+        )
+
+
+def parse_cli() -> tuple[
+    reader.CsvFileReaderMeta,
+    reader.CsvFileReaderMeta,
+    loader_schemas.OutputMeta,
+    pipeline_schemas.PipelineOptions,
+]:
+    parser = cli.build_parser()
+    return cli.from_args(parser=parser, args=parser.parse_args())
 
 
 def main() -> None:
@@ -0,0 +1,78 @@
+import concurrent.futures
+import typing as tp
+
+from src.extractor import reader
+from src.extractor import schemas as extractor_schemas
+from src.grouper import catalog as catalog_grouper
+from src.transformer import transformer
+
+# More shards than workers balance the load when rows differ in cost
+SHARDS_PER_WORKER = 4
+
+# Set once per worker process by `_init_worker`
+_worker_transform: transformer.TupleTransform | None = None
+
+
+def build_catalog(
+    source_file: reader.CsvFileReaderMeta,
+    mapping: transformer.Mapping,
+    workers: int,
+    drop_columns: tp.Collection[str] = (),
+) -> catalog_grouper.Catalog:
+    """Read, transform and group the source file on multiple processes.
+
+    The source file is split into chunks aligned to record boundaries, which
+    worker processes parse from a memory map of the file without reading the
+    header again. Every worker groups its chunks into partial catalogs, which are
+    merged in file order, so the result is the same as of a single process.
+
+    Args:
+        source_file (reader.CsvFileReaderMeta): Metadata for the source CSV file.
+        mapping (transformer.Mapping): The built mapping. It is bound to the
+            header of the source file and sent once to every worker process.
+        workers (int): The number of worker processes.
+        drop_columns (tp.Collection[str]): Columns to leave out of the catalog.
+
+    Returns:
+        catalog_grouper.Catalog: The catalog, not consolidated.
+    """
+    source_reader = reader.CsvReader(
+        file_meta=source_file,
+        validation_schema=extractor_schemas.CsvSourceSchemaRequired,
+    )
+    chunks = source_reader.chunks(count=workers * SHARDS_PER_WORKER)
+    transform = transformer.TupleTransform.compile(
+        plan=mapping.plan,
+        fieldnames=source_reader.read_header(),
+        drop_columns=drop_columns,
+    )
+
+    catalog = catalog_grouper.Catalog.new()
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(transform,)
+    ) as executor:
+        partial_catalogs = executor.map(_build_partial_catalog, chunks)
+        for partial_catalog in partial_catalogs:
+            catalog.merge(partial_catalog)
+
+    return catalog
+
+
+def _init_worker(transform: transformer.TupleTransform) -> None:
+    global _worker_transform
+    _worker_transform = transform
+
+
+def _build_partial_catalog(
+    chunk: extractor_schemas.CsvChunk,
+) -> catalog_grouper.Catalog:
+    if _worker_transform is None:
+        raise RuntimeError("Worker process is not initialized")
+
+    catalog = catalog_grouper.Catalog.new()
+    rows = reader.read_chunk(chunk=chunk, columns=_worker_transform.columns)
+
+    for transformed_row in _worker_transform.apply_batches(rows):
+        catalog.add(flat_data_row=transformed_row)
+
+    return catalog
@@ -0,0 +1,46 @@
+import dataclasses
+import pathlib
+
+from src.grouper.catalog import GROUPER_ROW_NAME
+
+
+@dataclasses.dataclass(frozen=True)
+class PipelineOptions:
+    """Options of the ETL pipeline.
+
+    Attributes:
+        workers (int): The number of processes to group the source file with.
+        max_memory (int | None): The memory budget for grouping, in bytes.
+            Rows are spilled to temp files if the source file does not fit.
+        sorted_input (bool): Whether rows of an article are adjacent in the
+            source file, so articles can be grouped one at a time.
+        stats (bool): Whether to write statistics of pipeline stages to stderr.
+        trace_memory (bool): Whether to write statistics including peak memory
+            allocated by every phase, traced with tracemalloc.
+        drop_columns (tuple[str, ...]): Source columns to leave out of the
+            output. They are not read unless a mapping reads them.
+        mappings_cache (pathlib.Path | None): The directory to cache compiled
+            mappings in. Mappings are built from scratch if None.
+        store (pathlib.Path | None): The path of a catalog store to apply
+            the source file to as a delta. If None, the catalog is built
+            from the source file alone.
+        group_by (tuple[str, ...]): The grouping hierarchy: article number,
+            then the keys of nested groups of variations within articles,
+            e.g. `("article_number", "color_code")`.
+        default_share (float | None): The share of the variations of an
+            article that must have the most frequent value of an attribute
+            for it to be lifted to the article as a default, which other
+            variations override. If None, only attributes common to all
+            variations are lifted.
+    """
+
+    workers: int = 1
+    max_memory: int | None = None
+    sorted_input: bool = False
+    stats: bool = False
+    trace_memory: bool = False
+    drop_columns: tuple[str, ...] = ()
+    mappings_cache: pathlib.Path | None = None
+    store: pathlib.Path | None = None
+    group_by: tuple[str, ...] = (GROUPER_ROW_NAME,)
+    default_share: float | None = None
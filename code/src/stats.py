@@ -0,0 +1,297 @@
+import contextlib
+import dataclasses
+import json
+import sys
+import time
+import tracemalloc
+import typing as tp
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+# Check whether a progress line is due every so many items
+PROGRESS_CHECK_EVERY_ITEMS = 10_000
+PROGRESS_INTERVAL_SECONDS = 5.0
+
+T = tp.TypeVar("T")
+
+
+@dataclasses.dataclass()
+class StageStats:
+    """Statistics of a row-level stage, e.g. reading or transforming rows.
+
+    Row-level stages are interleaved, so their times are exclusive: the time
+    a stage spends waiting for an upstream stage is not counted.
+
+    Attributes:
+        wall_seconds (float): Wall time spent in the stage.
+        cpu_seconds (float): CPU time of the process spent in the stage.
+        items (int): The number of items processed by the stage.
+    """
+
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    items: int = 0
+
+    def to_dict(self) -> dict[str, tp.Any]:
+        return {
+            "wall_seconds": round(self.wall_seconds, 6),
+            "cpu_seconds": round(self.cpu_seconds, 6),
+            "items": self.items,
+            "items_per_second": _per_second(self.items, self.wall_seconds),
+        }
+
+
+@dataclasses.dataclass()
+class PhaseStats:
+    """Statistics of a pipeline phase, e.g. grouping or loading.
+
+    Attributes:
+        wall_seconds (float): Wall time of the phase.
+        cpu_seconds (float): CPU time of the process during the phase.
+        peak_rss_bytes (int | None): Peak resident set size of the process
+            by the end of the phase, if the platform reports it.
+        tracemalloc_peak_bytes (int | None): Peak memory allocated during
+            the phase, if memory tracing is enabled.
+    """
+
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    peak_rss_bytes: int | None = None
+    tracemalloc_peak_bytes: int | None = None
+
+    def to_dict(self) -> dict[str, tp.Any]:
+        return {
+            "wall_seconds": round(self.wall_seconds, 6),
+            "cpu_seconds": round(self.cpu_seconds, 6),
+            "peak_rss_bytes": self.peak_rss_bytes,
+            "tracemalloc_peak_bytes": self.tracemalloc_peak_bytes,
+        }
+
+
+class PipelineStats:
+    """Recorder of pipeline statistics.
+
+    Phases are timed as a whole, row-level stages call by call. On exit,
+    the summary is written to the stream as a single JSON line. While rows
+    are read, human-readable progress lines with an ETA are written as well.
+
+    Attributes:
+        stream (tp.TextIO): The stream for progress lines and the summary.
+        trace_memory (bool): Whether to measure peak memory of phases with
+            tracemalloc, which slows the pipeline down.
+        progress_interval (float): Seconds between progress lines.
+        phases (dict[str, PhaseStats]): Statistics of phases by name.
+        stages (dict[str, StageStats]): Statistics of row-level stages by name.
+        counters (dict[str, dict[str, int]]): Named groups of counters, e.g.
+            hits and misses of a cache.
+        rows (int): The number of source rows.
+        articles (int): The number of articles in the catalog.
+    """
+
+    def __init__(
+        self,
+        stream: tp.TextIO | None = None,
+        trace_memory: bool = False,
+        progress_interval: float = PROGRESS_INTERVAL_SECONDS,
+    ) -> None:
+        self.stream = stream if stream is not None else sys.stderr
+        self.trace_memory = trace_memory
+        self.progress_interval = progress_interval
+        self.phases: dict[str, PhaseStats] = {}
+        self.stages: dict[str, StageStats] = {}
+        self.counters: dict[str, dict[str, int]] = {}
+        self.rows = 0
+        self.articles = 0
+
+        # Wall and CPU time of nested stage calls, to subtract from the caller
+        self._nested: list[list[float]] = []
+        self._started_wall = 0.0
+        self._started_cpu = 0.0
+        self._wall_seconds = 0.0
+        self._cpu_seconds = 0.0
+
+    def __enter__(self) -> tp.Self:
+        if self.trace_memory:
+            tracemalloc.start()
+        self._started_wall = time.perf_counter()
+        self._started_cpu = time.process_time()
+        return self
+
+    def __exit__(self, exc_type: type[BaseException] | None, *args: object) -> None:
+        self._wall_seconds = time.perf_counter() - self._started_wall
+        self._cpu_seconds = time.process_time() - self._started_cpu
+        if self.trace_memory:
+            tracemalloc.stop()
+        if exc_type is None:
+            self.report()
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> tp.Iterator[PhaseStats]:
+        """Time a pipeline phase and measure its peak memory.
+
+        Args:
+            name (str): The name of the phase.
+
+        Yields:
+            PhaseStats: Statistics of the phase, filled in on exit.
+        """
+        phase = self.phases.setdefault(name, PhaseStats())
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        started_wall = time.perf_counter()
+        started_cpu = time.process_time()
+        try:
+            yield phase
+        finally:
+            phase.wall_seconds += time.perf_counter() - started_wall
+            phase.cpu_seconds += time.process_time() - started_cpu
+            phase.peak_rss_bytes = peak_rss_bytes()
+            if self.trace_memory:
+                phase.tracemalloc_peak_bytes = tracemalloc.get_traced_memory()[1]
+
+    def call(self, name: str, func: tp.Callable[..., T], *args: tp.Any) -> T:
+        """Call a function as one item of a row-level stage.
+
+        Args:
+            name (str): The name of the stage.
+            func (tp.Callable[..., T]): The function to call.
+            *args (tp.Any): Positional arguments of the function.
+
+        Returns:
+            T: The result of the function.
+        """
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = self.stages[name] = StageStats()
+
+        nested = [0.0, 0.0]
+        self._nested.append(nested)
+        started_wall = time.perf_counter()
+        started_cpu = time.process_time()
+        try:
+            return func(*args)
+        finally:
+            wall_seconds = time.perf_counter() - started_wall
+            cpu_seconds = time.process_time() - started_cpu
+            self._nested.pop()
+            if self._nested:
+                self._nested[-1][0] += wall_seconds
+                self._nested[-1][1] += cpu_seconds
+
+            stage.wall_seconds += wall_seconds - nested[0]
+            stage.cpu_seconds += cpu_seconds - nested[1]
+            stage.items += 1
+
+    def iterate(
+        self,
+        name: str,
+        iterable: tp.Iterable[T],
+        position: tp.Callable[[], int] | None = None,
+        total: int | None = None,
+    ) -> tp.Iterator[T]:
+        """Iterate over items of a row-level stage, timing every item.
+
+        Args:
+            name (str): The name of the stage.
+            iterable (tp.Iterable[T]): Items produced by the stage.
+            position (tp.Callable[[], int] | None): Returns the current byte
+                offset in the source, to report progress with an ETA.
+            total (int | None): The size of the source, in bytes.
+
+        Yields:
+            T: Items of the iterable.
+        """
+        iterator = iter(iterable)
+        started = last_progress = time.monotonic()
+        items = 0
+        while True:
+            try:
+                item = self.call(name, next, iterator)
+            except StopIteration:
+                self.stages[name].items -= 1
+                return
+
+            items += 1
+            if position is not None and not items % PROGRESS_CHECK_EVERY_ITEMS:
+                now = time.monotonic()
+                if now - last_progress >= self.progress_interval:
+                    last_progress = now
+                    self._progress(name, items, now - started, position(), total)
+            yield item
+
+    def summary(self) -> dict[str, tp.Any]:
+        """Summarize statistics of the pipeline.
+
+        Returns:
+            dict[str, tp.Any]: Totals, phases, row-level stages and counters.
+        """
+        return {
+            "wall_seconds": round(self._wall_seconds, 6),
+            "cpu_seconds": round(self._cpu_seconds, 6),
+            "rows": self.rows,
+            "articles": self.articles,
+            "rows_per_second": _per_second(self.rows, self._wall_seconds),
+            "peak_rss_bytes": peak_rss_bytes(),
+            "phases": {name: phase.to_dict() for name, phase in self.phases.items()},
+            "stages": {name: stage.to_dict() for name, stage in self.stages.items()},
+            "counters": self.counters,
+        }
+
+    def report(self) -> None:
+        """Write the summary to the stream as a single JSON line."""
+        self.stream.write(json.dumps({"stats": self.summary()}) + "\n")
+        self.stream.flush()
+
+    def _progress(
+        self, name: str, items: int, seconds: float, position: int, total: int | None
+    ) -> None:
+        line = f"{name}: {items} rows, {_per_second(items, seconds):.0f} rows/s"
+        if total and position:
+            eta = seconds * (total - min(position, total)) / position
+            line += f", {100 * position / total:.1f}%, ETA {_format_seconds(eta)}"
+        self.stream.write(line + "\n")
+        self.stream.flush()
+
+
+def phase(
+    stats: PipelineStats | None, name: str
+) -> tp.ContextManager[PhaseStats | None]:
+    """Time a pipeline phase if statistics are recorded.
+
+    Args:
+        stats (PipelineStats | None): The recorder, or None if disabled.
+        name (str): The name of the phase.
+
+    Returns:
+        tp.ContextManager[PhaseStats | None]: A context manager timing the phase.
+    """
+    if stats is None:
+        return contextlib.nullcontext()
+    return stats.phase(name)
+
+
+def peak_rss_bytes() -> int | None:
+    """Get the peak resident set size of the process so far.
+
+    Returns:
+        int | None: Peak RSS in bytes, or None if the platform does not
+            report it.
+    """
+    if sys.platform == "win32" or resource is None:
+        return None
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak_rss if sys.platform == "darwin" else peak_rss * 1024
+
+
+def _per_second(items: int, seconds: float) -> float:
+    return round(items / seconds, 1) if seconds > 0 else 0.0
+
+
+def _format_seconds(seconds: float) -> str:
+    minutes, seconds = divmod(round(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
@@ -0,0 +1,150 @@
+import hashlib
+import json
+import os
+import pathlib
+import tempfile
+
+from src.extractor import reader
+from src.extractor import schemas as extractor_schemas
+from src.transformer import transformer
+
+# Bump when the cached form of a mapping changes incompatibly
+MAPPING_CACHE_VERSION = 3
+HASH_BLOCK_SIZE = 1024 * 1024
+
+# Any change of the transformer module invalidates cached mappings
+_CODE_VERSION = (
+    f"{MAPPING_CACHE_VERSION}-"
+    f"{hashlib.sha256(pathlib.Path(transformer.__file__).read_bytes()).hexdigest()}"
+)
+
+
+class MappingCache:
+    """A directory of compiled mappings, keyed by the content of mappings files.
+
+    The key combines the hash of the mappings file content, the delimiter and
+    encoding it is read with, and the version of the transformer code, so
+    entries of changed files or of an older code are never used. Corrupt
+    entries are rebuilt. Entries are written atomically, so concurrent runs
+    can share the directory.
+
+    Entries hold the compiled plan of a mapping as JSON, which is data only,
+    so a shared directory cannot inject code. Loading an entry skips reading
+    and validating the mappings file and compiling the plan.
+
+    Attributes:
+        directory (pathlib.Path): The cache directory. It is created on demand.
+    """
+
+    def __init__(self, directory: pathlib.Path) -> None:
+        self.directory = directory
+
+    def get_or_build(
+        self, mappings_file: reader.CsvFileReaderMeta
+    ) -> transformer.Mapping:
+        """Load the compiled mapping of a mappings file, or build and cache it.
+
+        Args:
+            mappings_file (reader.CsvFileReaderMeta): Metadata for the
+                mappings CSV file.
+
+        Returns:
+            transformer.Mapping: The built mapping.
+        """
+        key = cache_key(mappings_file)
+        path = self.directory / f"mapping-{key}.json"
+
+        mapping = self._load(path=path, key=key)
+        if mapping is None:
+            mapping = build_mapping(mappings_file)
+            self._dump(path=path, key=key, mapping=mapping)
+
+        return mapping
+
+    def _load(self, path: pathlib.Path, key: str) -> transformer.Mapping | None:
+        try:
+            with open(path, encoding="utf-8") as file:
+                entry = json.load(file)
+            if entry["key"] != key:
+                return None
+            plan = transformer.TransformPlan.from_dict(entry["plan"])
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            # Missing, truncated or corrupt entry, e.g. of an interrupted write
+            return None
+        return transformer.Mapping.from_plan(plan)
+
+    def _dump(self, path: pathlib.Path, key: str, mapping: transformer.Mapping) -> None:
+        # The cache is an optimization: an unwritable directory must not fail
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, temp_name = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        except OSError:
+            return
+
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump({"key": key, "plan": mapping.plan.to_dict()}, file)
+            os.replace(temp_name, path)
+        except OSError:
+            pathlib.Path(temp_name).unlink(missing_ok=True)
+
+
+def load_mapping(
+    mappings_file: reader.CsvFileReaderMeta, cache_directory: pathlib.Path | None
+) -> transformer.Mapping:
+    """Build a mapping, or load it from a cache directory if one is given.
+
+    Args:
+        mappings_file (reader.CsvFileReaderMeta): Metadata for the mappings
+            CSV file.
+        cache_directory (pathlib.Path | None): The directory of a
+            `MappingCache`, or None to build the mapping from scratch.
+
+    Returns:
+        transformer.Mapping: The built mapping.
+    """
+    if cache_directory is None:
+        return build_mapping(mappings_file)
+    return MappingCache(directory=cache_directory).get_or_build(
+        mappings_file=mappings_file
+    )
+
+
+def build_mapping(mappings_file: reader.CsvFileReaderMeta) -> transformer.Mapping:
+    """Read and build a mapping from a mappings file.
+
+    Args:
+        mappings_file (reader.CsvFileReaderMeta): Metadata for the mappings
+            CSV file.
+
+    Returns:
+        transformer.Mapping: The built mapping.
+    """
+    mapping = transformer.Mapping()
+    mapping.build(
+        mapping_rows=reader.CsvReader(
+            file_meta=mappings_file,
+            validation_schema=extractor_schemas.CsvMappingSchemaRequired,
+        ).read_by_row()
+    )
+    return mapping
+
+
+def cache_key(mappings_file: reader.CsvFileReaderMeta) -> str:
+    """Compute the cache key of a mappings file.
+
+    Args:
+        mappings_file (reader.CsvFileReaderMeta): Metadata for the mappings
+            CSV file.
+
+    Returns:
+        str: A hex digest of the file content, reading options and code version.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"{mappings_file.delimiter}\0{mappings_file.encoding}\0".encode())
+    with open(mappings_file.path, "rb") as file:
+        while block := file.read(HASH_BLOCK_SIZE):
+            digest.update(block)
+
+    digest.update(_CODE_VERSION.encode())
+    return digest.hexdigest()
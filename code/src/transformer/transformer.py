@@ -1,13 +1,11 @@
-import abc
+import collections
 import dataclasses
+import itertools
+import operator
 import typing as tp
 
-from src.extractor.reader import Row
-from src.transformer.exceptions import (
-    MappingError,
-    RowDoesNotContainFieldError,
-    MappingBuildError,
-)
+from src.extractor.reader import CsvFieldnames, Row, TupleRow
+from src.transformer.exceptions import MappingBuildError
 
 
 @dataclasses.dataclass(frozen=True)
@@ -35,129 +33,647 @@ class MappingUnit:
         )
 
 
-class Mapping:
-    """Hash-based class that uses combined key."""
+# Rows transformed together: large enough to share lookups of repeated
+# values, small enough to keep rows streaming
+TRANSFORM_BATCH_SIZE = 1024
 
-    def __init__(self) -> None:
-        self.direct_items: dict[str, MappingUnit] = {}
-        self.composite_items: dict[str, MappingUnit] = {}
-        self.glob_items: dict[str, MappingUnit] = {}
+# Mapping signatures whose results a transform keeps across batches
+TRANSFORM_CACHE_SIZE = 4096
 
-    def build(self, mapping_rows: tp.Iterable[Row]) -> None:
-        if not mapping_rows:
-            raise MappingBuildError("mapping_rows should not be empty or None")
+DirectKey = tuple[str, str]
+CompositeIndex = dict[tuple[str, ...], dict[tuple[str | None, ...], MapAttr]]
 
-        for row in mapping_rows:
-            m = MappingUnit.from_row(row)
-            composite_key = self._generate_key(m.source.val, m.source.type_)
 
-            if m.source.val == "*" and m.destination.val == "*":
-                self.glob_items[composite_key] = m
-            elif "|" in m.source.val:
-                self.composite_items[composite_key] = m
-            else:
-                # Consider raising error if source type and source val already exist,
-                # to notify user about ambiguous data in mappings.csv
-                self.direct_items[composite_key] = m
+@dataclasses.dataclass(frozen=True)
+class GlobRule:
+    source_types: tuple[str, ...]
+    destination_type: str
 
-    def get(self, source_val: str, source_type: str) -> MappingUnit | None:
-        combined_key = self._generate_key(
-            source_val=source_val, source_type=source_type
+
+class SignatureCache:
+    """A bounded LRU cache of values written by rules, keyed by signatures.
+
+    A signature is the tuple of values of the columns that rules depend on,
+    so rows with equal signatures get equal values from the rules.
+
+    Attributes:
+        maxsize (int): The maximum number of cached signatures.
+        hits (int): The number of rows that got cached values.
+        misses (int): The number of rows the rules were evaluated for.
+    """
+
+    def __init__(self, maxsize: int = TRANSFORM_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+        self._changes: collections.OrderedDict[tp.Hashable, Row] = (
+            collections.OrderedDict()
         )
-        return self.direct_items.get(combined_key, None)
 
-    @staticmethod
-    def _generate_key(source_val: str, source_type: str) -> str:
-        return f"{source_val}.{source_type}"
+    def __len__(self) -> int:
+        return len(self._changes)
 
+    @property
+    def hit_rate(self) -> float:
+        """The share of rows that got cached values."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
 
-class IDictTransformer(abc.ABC):
-    @abc.abstractmethod
-    def transform(self, d: dict, src_val: str, src_type: str) -> dict:
-        pass
+    def get(self, signature: tp.Hashable) -> Row | None:
+        """Get the values written for a signature, marking it recently used.
 
+        Args:
+            signature (tp.Hashable): The signature.
 
-class BaseDictTransformer(IDictTransformer):
-    def __init__(self, mapping: Mapping) -> None:
-        super().__init__()
-        self.mapping = mapping
+        Returns:
+            Row | None: The values, or None if the signature is not cached.
+        """
+        changes = self._changes.get(signature)
+        if changes is not None:
+            self._changes.move_to_end(signature)
+        return changes
 
+    def put(self, signature: tp.Hashable, changes: Row) -> None:
+        """Cache the values written for a signature, evicting the oldest one.
 
-class DirectTransformer(BaseDictTransformer):
-    def transform(self, d: dict, src_val: str, src_type: str) -> dict:
-        if mapped := self.mapping.get(source_val=src_val, source_type=src_type):
-            d[mapped.destination.type_] = mapped.destination.val
-        return d
+        Args:
+            signature (tp.Hashable): The signature.
+            changes (Row): The values written by rules.
+        """
+        self._changes[signature] = changes
+        if len(self._changes) > self.maxsize:
+            self._changes.popitem(last=False)
 
 
-class UniqueCompositeTransformer(BaseDictTransformer):
-    def transform(self, d: dict, src_val: str, src_type: str) -> dict:
-        for mapped in self.mapping.composite_items.values():
-            src_vals = mapped.source.val.split("|")
-            src_types = mapped.source.type_.split("|")
+@dataclasses.dataclass(frozen=True)
+class TransformPlan:
+    """Compiled, read-only form of a Mapping that is applied to every row.
+
+    Attributes:
+        direct (dict[str, dict[str, MapAttr]]): Direct rules indexed by source
+            column and then by source value. Columns without rules are absent,
+            so they are passed through untouched.
+        composite (CompositeIndex): Composite rules indexed by their tuple of
+            source columns and then by the tuple of source values, so a row
+            resolves each column group with a single lookup.
+        glob (tuple[GlobRule, ...]): Glob rules with pre-split source columns.
+    """
+
+    direct: dict[str, dict[str, MapAttr]]
+    composite: CompositeIndex
+    glob: tuple[GlobRule, ...]
 
-            if len(src_types) != len(src_vals):
-                raise MappingError(
-                    "Mapping is incorrectly configured. Check mappings file"
-                )
+    @classmethod
+    def compile(
+        cls,
+        direct_items: dict[DirectKey, MappingUnit],
+        composite_items: dict[DirectKey, MappingUnit],
+        glob_items: dict[DirectKey, MappingUnit],
+    ) -> tp.Self:
+        """Compile mapping units into a plan.
+
+        Args:
+            direct_items (dict[DirectKey, MappingUnit]): Direct mapping units.
+            composite_items (dict[DirectKey, MappingUnit]): Composite mapping units.
+            glob_items (dict[DirectKey, MappingUnit]): Glob mapping units.
+
+        Returns:
+            TransformPlan: The compiled plan.
+        """
+        direct: dict[str, dict[str, MapAttr]] = {}
+        for m in direct_items.values():
+            direct.setdefault(m.source.type_, {})[m.source.val] = m.destination
+
+        composite: CompositeIndex = {}
+        for m in composite_items.values():
+            source_types = tuple(m.source.type_.split("|"))
+            source_vals = tuple(m.source.val.split("|"))
+            composite.setdefault(source_types, {})[source_vals] = m.destination
+
+        glob = tuple(
+            GlobRule(
+                source_types=tuple(m.source.type_.split("|")),
+                destination_type=m.destination.type_,
+            )
+            for m in glob_items.values()
+        )
+        return cls(direct=direct, composite=composite, glob=glob)
+
+    def to_dict(self) -> dict[str, tp.Any]:
+        """Represent the plan as JSON-serializable data, which `from_dict` loads.
+
+        Returns:
+            dict[str, tp.Any]: Direct rules by column and value, composite rules
+                by source columns, and glob rules, with destinations as
+                (type, value) pairs.
+        """
+        return {
+            "direct": {
+                column: {
+                    value: [destination.type_, destination.val]
+                    for value, destination in by_value.items()
+                }
+                for column, by_value in self.direct.items()
+            },
+            "composite": [
+                [
+                    list(source_types),
+                    [
+                        [list(values), destination.type_, destination.val]
+                        for values, destination in by_values.items()
+                    ],
+                ]
+                for source_types, by_values in self.composite.items()
+            ],
+            "glob": [
+                [list(glob_rule.source_types), glob_rule.destination_type]
+                for glob_rule in self.glob
+            ],
+        }
 
-            if all([d.get(type_) == val for type_, val in zip(src_types, src_vals)]):
-                d[mapped.destination.type_] = mapped.destination.val
+    @classmethod
+    def from_dict(cls, data: dict[str, tp.Any]) -> tp.Self:
+        """Load a plan represented by `to_dict`.
 
-        return d
+        Args:
+            data (dict[str, tp.Any]): The represented plan.
 
+        Raises:
+            KeyError: If a part of the plan is missing.
+            TypeError: If a part of the plan has a wrong type.
+            ValueError: If a rule has a wrong number of items.
 
-class GlobCompositeTransformer(BaseDictTransformer):
-    def transform(self, d: dict, src_val: str, src_type: str) -> dict:
-        for mapped in self.mapping.glob_items.values():
-            src_cols = mapped.source.type_.split("|")
-            dst_col = mapped.destination.type_
+        Returns:
+            TransformPlan: The plan.
+        """
+        return cls(
+            direct={
+                column: {
+                    value: MapAttr(type_=type_, val=val)
+                    for value, (type_, val) in by_value.items()
+                }
+                for column, by_value in data["direct"].items()
+            },
+            composite={
+                tuple(source_types): {
+                    tuple(values): MapAttr(type_=type_, val=val)
+                    for values, type_, val in rules
+                }
+                for source_types, rules in data["composite"]
+            },
+            glob=tuple(
+                GlobRule(
+                    source_types=tuple(source_types), destination_type=destination_type
+                )
+                for source_types, destination_type in data["glob"]
+            ),
+        )
 
-            composite_key_parts = []
-            for col in src_cols:
-                if val := d.get(col):
-                    composite_key_parts.append(val)
-                else:
-                    return d
+    def apply(self, row: Row) -> Row:
+        """Apply the plan to a row.
+
+        Direct rules are resolved against the source values in the order of
+        the columns of the row, composite rules against the row with direct
+        rules applied, and glob rules last.
+
+        Args:
+            row (Row): The source row. It is not modified.
+
+        Returns:
+            Row: A transformed copy of the row.
+        """
+        updated_row = row.copy()
+
+        direct = self.direct
+        for column, value in row.items():
+            by_value = direct.get(column)
+            if (
+                by_value is not None
+                and value is not None
+                and (destination := by_value.get(value))
+            ):
+                updated_row[destination.type_] = destination.val
+
+        self.apply_derived(updated_row)
+        return updated_row
+
+    def apply_batch(self, rows: tp.Sequence[Row]) -> list[Row]:
+        """Apply the plan to a batch of rows, column by column.
+
+        Direct rules resolve each distinct value of a column once per batch.
+        Composite and glob rules are evaluated once per distinct tuple of the
+        values they depend on, see `derived_columns`.
+
+        Args:
+            rows (tp.Sequence[Row]): The source rows. They are not modified.
+
+        Returns:
+            list[Row]: Transformed copies of the rows, in the same order.
+        """
+        updated_rows = [row.copy() for row in rows]
+        if not rows:
+            return updated_rows
+
+        # In the order of the columns of rows, as in `apply`
+        positions = {column: position for position, column in enumerate(rows[0])}
+        for column, by_value in sorted(
+            self.direct.items(), key=lambda item: positions.get(item[0], len(positions))
+        ):
+            self.apply_direct_column(
+                values=[row.get(column) for row in rows],
+                by_value=by_value,
+                updated_rows=updated_rows,
+            )
+
+        if self.composite or self.glob:
+            derived_columns = self.derived_columns
+            self.apply_derived_batch(
+                updated_rows=updated_rows,
+                keys=[tuple(row.get(c) for c in derived_columns) for row in rows],
+            )
+        return updated_rows
+
+    @property
+    def source_columns(self) -> frozenset[str]:
+        """Columns read by any rule of the plan."""
+        columns = set(self.direct)
+        for source_types in self.composite:
+            columns.update(source_types)
+        for glob_rule in self.glob:
+            columns.update(glob_rule.source_types)
+        return frozenset(columns)
+
+    @property
+    def destination_columns(self) -> frozenset[str]:
+        """Columns written by any rule of the plan."""
+        columns = {
+            destination.type_
+            for by_value in self.direct.values()
+            for destination in by_value.values()
+        }
+        columns.update(
+            destination.type_
+            for by_values in self.composite.values()
+            for destination in by_values.values()
+        )
+        columns.update(glob_rule.destination_type for glob_rule in self.glob)
+        return frozenset(columns)
+
+    @property
+    def derived_columns(self) -> tuple[str, ...]:
+        """Source columns whose values determine composite and glob results.
+
+        These are the columns read by composite and glob rules, and the source
+        columns of direct rules that write to them.
+        """
+        columns: dict[str, None] = {}
+        for source_types in self.composite:
+            columns.update(dict.fromkeys(source_types))
+        for glob_rule in self.glob:
+            columns.update(dict.fromkeys(glob_rule.source_types))
+        for column, by_value in self.direct.items():
+            if any(destination.type_ in columns for destination in by_value.values()):
+                columns[column] = None
+        return tuple(columns)
 
-            d[dst_col] = " ".join(_ for _ in composite_key_parts)
+    @staticmethod
+    def apply_direct_column(
+        values: tp.Sequence[str | None],
+        by_value: dict[str, MapAttr],
+        updated_rows: list[Row],
+    ) -> None:
+        """Apply direct rules of a column to rows holding mapped values.
+
+        Every distinct value of the column is resolved once.
+
+        Args:
+            values (tp.Sequence[str | None]): Values of the column, one per row.
+            by_value (dict[str, MapAttr]): Direct rules of the column.
+            updated_rows (list[Row]): The rows to write destination values to.
+        """
+        resolved: dict[str | None, MapAttr] = {
+            value: destination
+            for value in set(values)
+            if value is not None and (destination := by_value.get(value))
+        }
+        if not resolved:
+            return
+
+        for updated_row, value in zip(updated_rows, values, strict=True):
+            if (destination := resolved.get(value)) is not None:
+                updated_row[destination.type_] = destination.val
+
+    def apply_derived_batch(
+        self,
+        updated_rows: list[Row],
+        keys: tp.Sequence[tp.Hashable],
+        cache: SignatureCache | None = None,
+    ) -> None:
+        """Apply composite and glob rules once per distinct key of rows.
+
+        Rows with equal keys get equal results, so the rules are evaluated
+        on the first row of every key and the values they write are copied
+        to the rest. With a cache, keys of earlier batches are reused too.
+
+        Args:
+            updated_rows (list[Row]): Rows with direct rules applied. They
+                are updated in place.
+            keys (tp.Sequence[tp.Hashable]): The values of `derived_columns`
+                of every row.
+            cache (SignatureCache | None): Results of earlier batches by key.
+        """
+        changes_by_key: dict[tp.Hashable, Row] = {}
+        misses = 0
+        for updated_row, key in zip(updated_rows, keys, strict=True):
+            changes = changes_by_key.get(key)
+            if changes is None:
+                changes = cache.get(key) if cache is not None else None
+                if changes is None:
+                    misses += 1
+                    changes = self.apply_derived(updated_row)
+                    if cache is not None:
+                        cache.put(key, changes)
+                elif changes:
+                    updated_row.update(changes)
+                changes_by_key[key] = changes
+            elif changes:
+                updated_row.update(changes)
+
+        if cache is not None:
+            cache.hits += len(updated_rows) - misses
+            cache.misses += misses
+
+    def apply_derived(self, updated_row: Row) -> Row:
+        """Apply composite and glob rules to a row with direct rules applied.
+
+        Args:
+            updated_row (Row): The row. It is updated in place.
+
+        Returns:
+            Row: The values written to the row.
+        """
+        changes: Row = {}
+        for source_types, by_values in self.composite.items():
+            values = tuple(updated_row.get(type_) for type_ in source_types)
+            if destination := by_values.get(values):
+                updated_row[destination.type_] = destination.val
+                changes[destination.type_] = destination.val
+
+        for glob_rule in self.glob:
+            parts = [updated_row.get(col) for col in glob_rule.source_types]
+            if not all(parts):
+                # Rules after a glob rule with a missing part are not applied
+                break
+            value = " ".join(tp.cast(list[str], parts))
+            updated_row[glob_rule.destination_type] = value
+            changes[glob_rule.destination_type] = value
+
+        return changes
 
-        return d
 
+@dataclasses.dataclass(frozen=True)
+class TupleTransform:
+    """A plan bound to the header of a source file, applied to tuple rows.
+
+    Columns are resolved into indexes once, so direct rules read values of
+    a tuple row by index and the only dictionary built per row is the result.
+
+    Attributes:
+        plan (TransformPlan): The compiled plan.
+        columns (tuple[str, ...]): The columns to read from the source file,
+            in the order of values in tuple rows.
+        direct (tuple[tuple[int, dict[str, MapAttr]], ...]): Direct rules
+            indexed by source value, paired with the index of their column.
+        derived (tuple[int, ...]): Indexes of the derived columns of the plan,
+            whose values are the mapping signature of a row.
+        exclude (frozenset[str]): Columns to remove from transformed rows.
+        cache (SignatureCache | None): Results of composite and glob rules
+            by mapping signature, kept across batches.
+    """
+
+    plan: TransformPlan
+    columns: tuple[str, ...]
+    direct: tuple[tuple[int, dict[str, MapAttr]], ...]
+    derived: tuple[int, ...]
+    exclude: frozenset[str]
+    cache: SignatureCache | None = dataclasses.field(
+        default=None, compare=False, repr=False
+    )
 
-class DictContext:
-    def __init__(self, strategy: IDictTransformer) -> None:
-        self._strategy = strategy
+    @classmethod
+    def compile(
+        cls,
+        plan: TransformPlan,
+        fieldnames: CsvFieldnames,
+        drop_columns: tp.Collection[str] = (),
+        cache_size: int = TRANSFORM_CACHE_SIZE,
+    ) -> tp.Self:
+        """Bind a plan to the header of a source file.
+
+        Dropped columns are not read unless a rule reads them, and are
+        removed from transformed rows.
+
+        Args:
+            plan (TransformPlan): The compiled plan.
+            fieldnames (CsvFieldnames): The header fieldnames of the file.
+            drop_columns (tp.Collection[str]): Columns to leave out of
+                transformed rows.
+            cache_size (int): The number of mapping signatures whose results
+                are kept across batches, 0 to keep none.
+
+        Returns:
+            TupleTransform: The bound transform.
+        """
+        source_columns = plan.source_columns
+        columns = tuple(
+            column
+            for column in fieldnames
+            if column not in drop_columns or column in source_columns
+        )
+        indexes = {column: index for index, column in enumerate(columns)}
+        # In the order of columns, as in `TransformPlan.apply`
+        direct = tuple(
+            sorted(
+                (indexes[column], by_value)
+                for column, by_value in plan.direct.items()
+                if column in indexes
+            )
+        )
+        derived = tuple(
+            indexes[column] for column in plan.derived_columns if column in indexes
+        )
+        exclude = frozenset(drop_columns) & (
+            frozenset(columns) | plan.destination_columns
+        )
+        return cls(
+            plan=plan,
+            columns=columns,
+            direct=direct,
+            derived=derived,
+            exclude=exclude,
+            cache=SignatureCache(maxsize=cache_size)
+            if cache_size and (plan.composite or plan.glob)
+            else None,
+        )
 
-    def set_strategy(self, strategy: IDictTransformer) -> None:
-        self._strategy = strategy
+    def apply(self, values: TupleRow) -> Row:
+        """Apply the plan to a tuple row.
+
+        Args:
+            values (TupleRow): Values of a row, in the order of `columns`.
+
+        Returns:
+            Row: The transformed row.
+        """
+        updated_row = dict(zip(self.columns, values))
+
+        for index, by_value in self.direct:
+            value = values[index]
+            if value is not None and (destination := by_value.get(value)):
+                updated_row[destination.type_] = destination.val
+
+        self.plan.apply_derived(updated_row)
+
+        for column in self.exclude:
+            updated_row.pop(column, None)
+        return updated_row
+
+    def apply_batch(self, batch: tp.Sequence[TupleRow]) -> list[Row]:
+        """Apply the plan to a batch of tuple rows, column by column.
+
+        Args:
+            batch (tp.Sequence[TupleRow]): Values of rows, in the order of
+                `columns`.
+
+        Returns:
+            list[Row]: The transformed rows, in the same order.
+        """
+        updated_rows = [dict(zip(self.columns, values)) for values in batch]
+        if not batch:
+            return updated_rows
+
+        batch_columns = list(zip(*batch, strict=True)) if self.columns else []
+        for index, by_value in self.direct:
+            self.plan.apply_direct_column(
+                values=batch_columns[index],
+                by_value=by_value,
+                updated_rows=updated_rows,
+            )
+
+        if self.plan.composite or self.plan.glob:
+            self.plan.apply_derived_batch(
+                updated_rows=updated_rows,
+                keys=[tuple(values[i] for i in self.derived) for values in batch]
+                if len(self.derived) < 2
+                else list(map(operator.itemgetter(*self.derived), batch)),
+                cache=self.cache,
+            )
+
+        if self.exclude:
+            for updated_row in updated_rows:
+                for column in self.exclude:
+                    updated_row.pop(column, None)
+        return updated_rows
+
+    def apply_batches(
+        self, rows: tp.Iterable[TupleRow], batch_size: int = TRANSFORM_BATCH_SIZE
+    ) -> tp.Iterator[Row]:
+        """Apply the plan to tuple rows in batches.
+
+        Args:
+            rows (tp.Iterable[TupleRow]): Values of rows, in the order of
+                `columns`.
+            batch_size (int): The number of rows per batch.
+
+        Yields:
+            Row: A transformed row, in the order of source rows.
+        """
+        iterator = iter(rows)
+        while batch := list(itertools.islice(iterator, batch_size)):
+            yield from self.apply_batch(batch)
 
-    def apply_transform(self, d: dict[str, str], src_val: str, src_type: str) -> dict:
-        return self._strategy.transform(d=d, src_val=src_val, src_type=src_type)
 
+class Mapping:
+    """Hash-based class that uses combined key."""
 
-def transform_row(source_row: Row, mapping: Mapping) -> Row:
-    updated_row = source_row.copy()
+    def __init__(self) -> None:
+        self.direct_items: dict[DirectKey, MappingUnit] = {}
+        self.composite_items: dict[DirectKey, MappingUnit] = {}
+        self.glob_items: dict[DirectKey, MappingUnit] = {}
+        self.plan = TransformPlan(direct={}, composite={}, glob=())
 
-    strategies: tuple[IDictTransformer, ...] = (
-        DirectTransformer(mapping=mapping),
-        UniqueCompositeTransformer(mapping=mapping),
-        GlobCompositeTransformer(mapping=mapping),
-    )
+    def build(self, mapping_rows: tp.Iterable[Row]) -> None:
+        if not mapping_rows:
+            raise MappingBuildError("mapping_rows should not be empty or None")
+
+        for row in mapping_rows:
+            m = MappingUnit.from_row(row)
+            composite_key = (m.source.val, m.source.type_)
+
+            if m.source.val == "*" and m.destination.val == "*":
+                self.glob_items[composite_key] = m
+            elif "|" in m.source.val or "|" in m.source.type_:
+                if m.source.val.count("|") != m.source.type_.count("|"):
+                    raise MappingBuildError(
+                        "Composite mapping has different number of values and "
+                        f"types: '{m.source.val}' for '{m.source.type_}'"
+                    )
+                self.composite_items[composite_key] = m
+            else:
+                # Consider raising error if source type and source val already exist,
+                # to notify user about ambiguous data in mappings.csv
+                self.direct_items[composite_key] = m
 
-    # Set direct strategy by default
-    context = DictContext(strategies[0])
+        self.plan = TransformPlan.compile(
+            direct_items=self.direct_items,
+            composite_items=self.composite_items,
+            glob_items=self.glob_items,
+        )
 
-    for src_type, src_val in source_row.items():
-        for strategy in strategies:
-            context.set_strategy(strategy)
-            try:
-                updated_row = context.apply_transform(
-                    d=updated_row, src_val=src_val, src_type=src_type
+    @classmethod
+    def from_plan(cls, plan: TransformPlan) -> tp.Self:
+        """Create a mapping from its compiled plan, without building it.
+
+        Args:
+            plan (TransformPlan): The compiled plan, e.g. loaded from a cache.
+
+        Returns:
+            Mapping: The mapping with the rules of the plan.
+        """
+        mapping = cls()
+        for column, by_value in plan.direct.items():
+            for value, destination in by_value.items():
+                mapping.direct_items[(value, column)] = MappingUnit(
+                    source=MapAttr(val=value, type_=column), destination=destination
                 )
-            except KeyError as err:
-                raise RowDoesNotContainFieldError(
-                    message=f"Row does not contain field: {err.args[0]}"
+
+        for source_types, by_values in plan.composite.items():
+            source_type = "|".join(source_types)
+            for values, destination in by_values.items():
+                source_val = "|".join(tp.cast(tuple[str, ...], values))
+                mapping.composite_items[(source_val, source_type)] = MappingUnit(
+                    source=MapAttr(val=source_val, type_=source_type),
+                    destination=destination,
                 )
 
-    return updated_row
+        for glob_rule in plan.glob:
+            source_type = "|".join(glob_rule.source_types)
+            mapping.glob_items[("*", source_type)] = MappingUnit(
+                source=MapAttr(val="*", type_=source_type),
+                destination=MapAttr(val="*", type_=glob_rule.destination_type),
+            )
+
+        mapping.plan = plan
+        return mapping
+
+    def get(self, source_val: str, source_type: str) -> MappingUnit | None:
+        return self.direct_items.get((source_val, source_type), None)
+
+
+def transform_row(source_row: Row, mapping: Mapping) -> Row:
+    return mapping.plan.apply(source_row)
+
+
+def transform_rows(source_rows: tp.Sequence[Row], mapping: Mapping) -> list[Row]:
+    return mapping.plan.apply_batch(source_rows)
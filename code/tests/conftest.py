@@ -28,3 +28,9 @@ def expected_output_json() -> str:
 def expected_output_json_bonus() -> str:
     with open("tests/data/output/acceptance_bonus.json") as f:
         return f.read()
+
+
+@pytest.fixture()
+def expected_output_json_bonus_defaults() -> str:
+    with open("tests/data/output/acceptance_bonus_defaults.json") as f:
+        return f.read()
@@ -0,0 +1,154 @@
+import json
+import pathlib
+import shutil
+
+import pytest
+
+from src.batch import collect_sources, duplicate_stems, main, run_batch
+from src.extractor import reader
+
+
+@pytest.fixture()
+def sources_dir(
+    tmp_path: pathlib.Path, input_source_pricat_csv_path: pathlib.Path
+) -> pathlib.Path:
+    directory = tmp_path / "sources"
+    directory.mkdir()
+    shutil.copy(input_source_pricat_csv_path, directory / "supplier_a.csv")
+    shutil.copy(input_source_pricat_csv_path, directory / "supplier_b.csv")
+    (directory / "broken.csv").write_text("ean;price\n1;2\n", encoding="utf-8")
+    (directory / "notes.txt").write_text("not a source", encoding="utf-8")
+    return directory
+
+
+@pytest.mark.unit()
+def test_collect_sources_from_directory(sources_dir: pathlib.Path) -> None:
+    assert [source.name for source in collect_sources(sources_dir)] == [
+        "broken.csv",
+        "supplier_a.csv",
+        "supplier_b.csv",
+    ]
+
+
+@pytest.mark.unit()
+def test_collect_sources_compressed(sources_dir: pathlib.Path) -> None:
+    (sources_dir / "supplier_c.csv.gz").write_bytes(b"")
+    (sources_dir / "notes.txt.gz").write_bytes(b"")
+
+    assert [source.name for source in collect_sources(sources_dir)] == [
+        "broken.csv",
+        "supplier_a.csv",
+        "supplier_b.csv",
+        "supplier_c.csv.gz",
+    ]
+
+
+@pytest.mark.unit()
+def test_collect_sources_from_manifest(sources_dir: pathlib.Path) -> None:
+    manifest = sources_dir.parent / "manifest.txt"
+    manifest.write_text(
+        "# nightly\nsources/supplier_b.csv\n\n  sources/supplier_a.csv\n",
+        encoding="utf-8",
+    )
+
+    assert collect_sources(manifest) == [
+        sources_dir / "supplier_b.csv",
+        sources_dir / "supplier_a.csv",
+    ]
+
+
+@pytest.mark.integration()
+def test_run_batch_isolates_failures(
+    tmp_path: pathlib.Path,
+    sources_dir: pathlib.Path,
+    input_mappings_csv_path: pathlib.Path,
+    expected_output_json: str,
+) -> None:
+    output_dir = tmp_path / "output"
+
+    summary = run_batch(
+        sources=collect_sources(sources_dir),
+        mappings_file=reader.CsvFileReaderMeta(
+            path=input_mappings_csv_path, delimiter=";"
+        ),
+        output_dir=output_dir,
+        concurrency=2,
+    )
+
+    assert summary.to_dict()["files"] == 3
+    assert [result.source.name for result in summary.failed] == ["broken.csv"]
+    assert "InvalidCsvSchemaError" in str(summary.failed[0].error)
+    assert sorted(path.name for path in output_dir.iterdir()) == [
+        "supplier_a.json",
+        "supplier_b.json",
+    ]
+    for name in ("supplier_a.json", "supplier_b.json"):
+        assert json.loads((output_dir / name).read_text()) == json.loads(
+            expected_output_json
+        )
+
+
+@pytest.mark.unit()
+def test_duplicate_stems(tmp_path: pathlib.Path) -> None:
+    sources = [
+        tmp_path / "a" / "pricat.csv",
+        tmp_path / "a" / "other.csv",
+        tmp_path / "b" / "pricat.csv.gz",
+        tmp_path / "c" / "other.csv",
+        tmp_path / "c" / "pricat.csv",
+    ]
+
+    assert duplicate_stems(sources) == ["pricat", "other"]
+    assert duplicate_stems(sources[:2]) == []
+
+
+@pytest.mark.unit()
+def test_run_batch_requires_unique_names(
+    tmp_path: pathlib.Path, input_mappings_csv_path: pathlib.Path
+) -> None:
+    with pytest.raises(ValueError, match="duplicates: pricat"):
+        run_batch(
+            sources=[tmp_path / "a" / "pricat.csv", tmp_path / "b" / "pricat.csv"],
+            mappings_file=reader.CsvFileReaderMeta(
+                path=input_mappings_csv_path, delimiter=";"
+            ),
+            output_dir=tmp_path / "output",
+        )
+
+
+@pytest.mark.unit()
+@pytest.mark.parametrize(
+    "args",
+    [["-f", "bin", "--layout", "table"], ["-w", "2"], ["--store", "catalog.db"]],
+)
+def test_main_rejects_options(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path, args: list[str]
+) -> None:
+    monkeypatch.setattr(
+        "sys.argv",
+        ["batch", "-i", str(tmp_path), "-m", "mappings.csv", "-o", str(tmp_path)]
+        + args,
+    )
+
+    with pytest.raises(SystemExit):
+        main()
+
+
+@pytest.mark.unit()
+def test_main_rejects_duplicate_names(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+    tmp_path: pathlib.Path,
+) -> None:
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text("a/pricat.csv\nb/pricat.csv.gz\n", encoding="utf-8")
+    monkeypatch.setattr(
+        "sys.argv",
+        ["batch", "-i", str(manifest), "-m", "mappings.csv", "-o", str(tmp_path)],
+    )
+
+    with pytest.raises(SystemExit) as excinfo:
+        main()
+
+    assert excinfo.value.code == 2
+    assert "unique names, got duplicates: pricat" in capsys.readouterr().err
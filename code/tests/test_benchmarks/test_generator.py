@@ -0,0 +1,51 @@
+import json
+import pathlib
+
+import pytest
+
+from benchmarks.generator import PricatSpec, write_mappings, write_pricat
+from src.extractor import reader
+from src.main import run_pipeline
+
+
+@pytest.mark.unit()
+def test_write_pricat_is_deterministic(tmp_path: pathlib.Path) -> None:
+    spec = PricatSpec(articles=3, colours=2, sizes=4)
+
+    write_pricat(spec=spec, path=tmp_path / "first.csv")
+    write_pricat(spec=spec, path=tmp_path / "second.csv")
+
+    assert (tmp_path / "first.csv").read_bytes() == (
+        tmp_path / "second.csv"
+    ).read_bytes()
+    assert len((tmp_path / "first.csv").read_text().splitlines()) == spec.rows + 1
+
+
+@pytest.mark.integration()
+def test_generated_files_run_through_pipeline(
+    tmp_path: pathlib.Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    spec = PricatSpec(articles=2, colours=2, sizes=3, mapping_density=0.5)
+    write_pricat(spec=spec, path=tmp_path / "pricat.csv")
+    write_mappings(spec=spec, path=tmp_path / "mappings.csv")
+
+    run_pipeline(
+        reader.CsvFileReaderMeta(path=tmp_path / "pricat.csv", delimiter=";"),
+        reader.CsvFileReaderMeta(path=tmp_path / "mappings.csv", delimiter=";"),
+    )
+
+    output = json.loads(capsys.readouterr().out)
+    variations = [
+        variation
+        for article in output["articles"].values()
+        for variation in article["variations"]
+    ]
+    assert len(output["articles"]) == spec.articles
+    assert len(variations) == spec.rows
+    # Only the first of two colours and of three sizes are mapped
+    assert {variation.get("color") for variation in variations} == {"Nero", None}
+    assert {variation.get("size") for variation in variations} == {
+        "European size 30",
+        "European size 31",
+        None,
+    }
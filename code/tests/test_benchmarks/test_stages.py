@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from benchmarks.generator import PricatSpec
+from benchmarks.stages import benchmark, main
+
+STAGES = [
+    "read_by_row",
+    "transform_row",
+    "read_by_tuple",
+    "transform_tuple",
+    "transform_batch",
+    "catalog_add",
+    "consolidate_common_attributes",
+    "encode_to_json",
+    "write_json",
+]
+
+
+@pytest.mark.integration()
+def test_benchmark_reports_every_stage() -> None:
+    results = benchmark(PricatSpec(articles=1, colours=1, sizes=2), trace_memory=True)
+
+    assert [result.stage for result in results] == STAGES
+    assert all(result.rows == 2 for result in results)
+    assert all(result.peak_memory is not None for result in results)
+
+
+@pytest.mark.integration()
+def test_main_prints_every_stage_per_scale(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monkeypatch.setattr(
+        "sys.argv",
+        [
+            "stages",
+            "--articles",
+            "1,2",
+            "--colours",
+            "1",
+            "--sizes",
+            "2",
+            "--no-memory",
+            "--json",
+        ],
+    )
+
+    main()
+
+    results = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [result["stage"] for result in results] == STAGES * 2
+    assert [result["rows"] for result in results] == [2] * len(STAGES) + [4] * len(
+        STAGES
+    )
+    assert all(result["peak_memory"] is None for result in results)
+    assert all(result["seconds"] >= 0 for result in results)
@@ -0,0 +1,39 @@
+import gzip
+import pathlib
+
+import pytest
+
+from src import cli
+
+REQUIRED_ARGS = ["-s", "pricat.csv", "-m", "mappings.csv"]
+
+
+@pytest.mark.unit()
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["-w", "2", "--max-memory", "64"],
+        ["--sorted-input", "--max-memory", "64"],
+        ["--store", "catalog.db", "-w", "2"],
+        ["-f", "bin", "--layout", "table"],
+    ],
+)
+def test_from_args_rejects_combinations(args: list[str]) -> None:
+    parser = cli.build_parser()
+
+    with pytest.raises(SystemExit):
+        cli.from_args(parser=parser, args=parser.parse_args(REQUIRED_ARGS + args))
+
+
+@pytest.mark.unit()
+def test_from_args_rejects_workers_with_compressed_source(
+    tmp_path: pathlib.Path, input_source_pricat_csv_path: pathlib.Path
+) -> None:
+    source_path = tmp_path / "pricat.csv.gz"
+    source_path.write_bytes(gzip.compress(input_source_pricat_csv_path.read_bytes()))
+    parser = cli.build_parser()
+    args = ["-s", str(source_path), "-m", "mappings.csv"]
+
+    cli.from_args(parser=parser, args=parser.parse_args(args))
+    with pytest.raises(SystemExit):
+        cli.from_args(parser=parser, args=parser.parse_args([*args, "-w", "2"]))
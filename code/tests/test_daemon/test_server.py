@@ -0,0 +1,142 @@
+import dataclasses
+import json
+import os
+import pathlib
+import shutil
+import sys
+import tempfile
+import threading
+import typing as tp
+
+import pytest
+
+from src.daemon.client import submit
+from src.daemon.exceptions import InvalidJobError
+from src.daemon.schemas import Job, JobResult, JobStatus
+from src.daemon.server import MappingRegistry, PipelineDaemon
+from src.extractor import reader
+from src.loader.schemas import OutputFormat, OutputLayout, OutputMeta
+from src.schemas import PipelineOptions
+
+
+@pytest.fixture()
+def job(
+    tmp_path: pathlib.Path,
+    input_source_pricat_csv_path: pathlib.Path,
+    input_mappings_csv_path: pathlib.Path,
+) -> Job:
+    mappings_path = tmp_path / "mappings.csv"
+    shutil.copy(input_mappings_csv_path, mappings_path)
+    return Job(
+        source_file=reader.CsvFileReaderMeta(
+            path=input_source_pricat_csv_path, delimiter=";"
+        ),
+        mappings_file=reader.CsvFileReaderMeta(path=mappings_path, delimiter=";"),
+        output=OutputMeta(path=tmp_path / "output.json"),
+        options=PipelineOptions(stats=True),
+    )
+
+
+@pytest.mark.unit()
+def test_job_round_trips_through_dict(job: Job) -> None:
+    job = dataclasses.replace(
+        job,
+        options=PipelineOptions(drop_columns=("ean",), store=pathlib.Path("store")),
+    )
+
+    assert Job.from_dict(json.loads(json.dumps(job.to_dict()))) == job
+
+
+@pytest.mark.unit()
+def test_job_from_invalid_dict() -> None:
+    with pytest.raises(InvalidJobError):
+        Job.from_dict({"source_file": {}})
+
+
+@pytest.mark.unit()
+def test_mapping_registry_rebuilds_changed_files(job: Job) -> None:
+    registry = MappingRegistry()
+
+    mapping = registry.get(job.mappings_file)
+    assert registry.get(job.mappings_file) is mapping
+    assert registry.builds == 1
+
+    with open(job.mappings_file.path, "a", encoding="utf-8") as mappings:
+        mappings.write("\nwinter;Winter;season;season\n")
+    assert registry.get(job.mappings_file) is not mapping
+    assert registry.builds == 2
+
+
+@pytest.mark.integration()
+def test_run_job(job: Job, expected_output_json: str) -> None:
+    daemon = PipelineDaemon(socket_path=pathlib.Path("unused.sock"))
+
+    result = daemon.run_job(job)
+
+    assert result.status is JobStatus.OK
+    assert result.stats is not None
+    assert result.stats["rows"] == 49
+    output_path = tp.cast(pathlib.Path, job.output.path)
+    assert json.loads(output_path.read_text()) == json.loads(expected_output_json)
+
+
+@pytest.mark.integration()
+def test_run_job_reports_errors(job: Job, tmp_path: pathlib.Path) -> None:
+    daemon = PipelineDaemon(socket_path=pathlib.Path("unused.sock"))
+    missing = reader.CsvFileReaderMeta(path=tmp_path / "missing.csv", delimiter=";")
+
+    result = daemon.run_job(Job(missing, job.mappings_file, job.output))
+
+    assert result.status is JobStatus.ERROR
+    assert "FileNotFoundError" in str(result.error)
+
+
+@pytest.mark.unit()
+@pytest.mark.parametrize(
+    ("output", "options"),
+    [
+        (OutputMeta(), PipelineOptions(workers=2)),
+        (OutputMeta(), PipelineOptions(sorted_input=True, max_memory=1024)),
+        (
+            OutputMeta(format=OutputFormat.BINARY, layout=OutputLayout.TABLE),
+            PipelineOptions(),
+        ),
+    ],
+)
+def test_run_job_rejects_options(
+    job: Job, output: OutputMeta, options: PipelineOptions
+) -> None:
+    daemon = PipelineDaemon(socket_path=pathlib.Path("unused.sock"))
+    job = dataclasses.replace(
+        job, output=dataclasses.replace(output, path=job.output.path), options=options
+    )
+
+    result = daemon.run_job(job)
+
+    assert result.status is JobStatus.ERROR
+    assert not tp.cast(pathlib.Path, job.output.path).exists()
+
+
+@pytest.mark.integration()
+@pytest.mark.skipif(sys.platform == "win32", reason="Unix domain sockets")
+def test_submit_to_daemon(job: Job) -> None:
+    # Socket paths are limited to about 100 bytes, so not in tmp_path
+    socket_dir = tempfile.mkdtemp()
+    socket_path = pathlib.Path(socket_dir) / "daemon.sock"
+    daemon = PipelineDaemon(socket_path=socket_path)
+    thread = threading.Thread(target=daemon.serve_forever)
+    thread.start()
+    try:
+        while not socket_path.exists():
+            threading.Event().wait(0.01)
+
+        results = [submit(job, socket_path=socket_path) for _ in range(2)]
+    finally:
+        daemon.shutdown()
+        thread.join()
+        os.rmdir(socket_dir)
+
+    assert [result.status for result in results] == [JobStatus.OK, JobStatus.OK]
+    assert daemon.mappings.builds == 1
+    assert isinstance(results[0], JobResult)
+    assert not socket_path.exists()
@@ -0,0 +1,333 @@
+import bz2
+import gzip
+import lzma
+import pathlib
+import pickle
+import threading
+import typing as tp
+
+import pytest
+
+from src.extractor.exceptions import CsvReaderError, InvalidCsvSchemaError
+from src.extractor.reader import (
+    DECOMPRESS_READ_SIZE,
+    CsvReader,
+    RecordSplitter,
+    csv_stem,
+    read_block,
+    read_chunk,
+    split_header,
+)
+from src.extractor.schemas import (
+    Compression,
+    CsvFileReaderMeta,
+    CsvSourceSchemaRequired,
+    CsvStreamMeta,
+)
+
+COMPRESSORS: dict[Compression, tp.Callable[[bytes], bytes]] = {
+    Compression.GZIP: gzip.compress,
+    Compression.BZIP2: bz2.compress,
+    Compression.XZ: lzma.compress,
+}
+
+
+@pytest.fixture()
+def source_reader(input_source_pricat_csv_path: pathlib.Path) -> CsvReader:
+    return CsvReader(
+        file_meta=CsvFileReaderMeta(path=input_source_pricat_csv_path, delimiter=";"),
+        validation_schema=CsvSourceSchemaRequired,
+    )
+
+
+@pytest.mark.unit()
+@pytest.mark.parametrize("count", [1, 2, 7, 1000])
+def test_read_byte_ranges_equals_read_by_row(
+    source_reader: CsvReader, count: int
+) -> None:
+    fieldnames = source_reader.read_header()
+    byte_ranges = source_reader.split_into_byte_ranges(count=count)
+
+    rows = [
+        row
+        for byte_range in byte_ranges
+        for row in source_reader.read_byte_range(
+            byte_range=byte_range, fieldnames=fieldnames
+        )
+    ]
+
+    assert 1 <= len(byte_ranges) <= count
+    assert rows == list(source_reader.read_by_row())
+
+
+@pytest.mark.unit()
+def test_position_follows_read_by_row(
+    source_reader: CsvReader, input_source_pricat_csv_path: pathlib.Path
+) -> None:
+    assert source_reader.position == 0
+
+    rows = source_reader.read_by_row()
+    next(rows)
+
+    assert 0 < source_reader.position <= input_source_pricat_csv_path.stat().st_size
+
+    rows.close()
+    assert source_reader.position == 0
+
+
+@pytest.mark.unit()
+def test_read_by_tuple_equals_read_by_row(source_reader: CsvReader) -> None:
+    fieldnames = source_reader.read_header()
+
+    rows = [
+        dict(zip(fieldnames, values, strict=True))
+        for values in source_reader.read_by_tuple()
+    ]
+
+    assert rows == list(source_reader.read_by_row())
+
+
+@pytest.mark.unit()
+@pytest.mark.parametrize(
+    "columns", [["article_number"], ["size_code", "article_number"], []]
+)
+def test_read_by_tuple_projects_columns(
+    source_reader: CsvReader, columns: list[str]
+) -> None:
+    expected = [
+        tuple(row[column] for column in columns) for row in source_reader.read_by_row()
+    ]
+
+    assert list(source_reader.read_by_tuple(columns=columns)) == expected
+
+
+@pytest.mark.unit()
+def test_read_by_tuple_rejects_missing_columns(source_reader: CsvReader) -> None:
+    with pytest.raises(InvalidCsvSchemaError):
+        next(source_reader.read_by_tuple(columns=["article_number", "unknown"]))
+
+
+@pytest.mark.unit()
+def test_read_by_tuple_pads_short_rows(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "short.csv"
+    path.write_text("article_number;color;size\n1;red\n\n2;blue;36;extra\n")
+    csv_reader = CsvReader(
+        file_meta=CsvFileReaderMeta(path=path, delimiter=";"),
+        validation_schema=CsvSourceSchemaRequired,
+    )
+
+    assert list(csv_reader.read_by_tuple(columns=["size", "article_number"])) == [
+        (None, "1"),
+        ("36", "2"),
+    ]
+
+
+@pytest.mark.unit()
+def test_read_byte_ranges_by_tuple_equals_read_by_tuple(
+    source_reader: CsvReader,
+) -> None:
+    fieldnames = source_reader.read_header()
+    columns = ["ean", "article_number"]
+
+    rows = [
+        values
+        for byte_range in source_reader.split_into_byte_ranges(count=3)
+        for values in source_reader.read_byte_range_by_tuple(
+            byte_range=byte_range, fieldnames=fieldnames, columns=columns
+        )
+    ]
+
+    assert rows == list(source_reader.read_by_tuple(columns=columns))
+
+
+@pytest.mark.unit()
+@pytest.mark.parametrize("count", [1, 2, 3, 5, 100])
+def test_chunks_split_records_with_quoted_newlines(
+    tmp_path: pathlib.Path, count: int
+) -> None:
+    path = tmp_path / "quoted.csv"
+    path.write_bytes(
+        b'article_number;"name\nwith newline";size\n'
+        b'1;"red\n""big""\nshoe";36\n'
+        b"2;plain;37\n"
+        b'3;"blue\n\nboot";38\n'
+        b'4;"";39\n'
+    )
+    csv_reader = CsvReader(
+        file_meta=CsvFileReaderMeta(path=path, delimiter=";"),
+        validation_schema=CsvSourceSchemaRequired,
+    )
+
+    chunks = csv_reader.chunks(count=count)
+    rows = [values for chunk in chunks for values in read_chunk(chunk=chunk)]
+
+    assert 1 <= len(chunks) <= count
+    assert chunks[0].fieldnames == ("article_number", "name\nwith newline", "size")
+    assert rows == list(csv_reader.read_by_tuple())
+    assert rows[0] == ("1", 'red\n"big"\nshoe', "36")
+
+
+@pytest.mark.unit()
+def test_chunks_are_picklable(source_reader: CsvReader) -> None:
+    chunks = source_reader.chunks(count=4)
+
+    restored = pickle.loads(pickle.dumps(chunks))
+
+    assert restored == chunks
+    assert [
+        values for chunk in restored for values in read_chunk(chunk, ["ean"])
+    ] == list(source_reader.read_by_tuple(columns=["ean"]))
+
+
+@pytest.mark.unit()
+def test_chunks_of_empty_file(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "header.csv"
+    path.write_text("article_number;size\n")
+    csv_reader = CsvReader(
+        file_meta=CsvFileReaderMeta(path=path, delimiter=";"),
+        validation_schema=CsvSourceSchemaRequired,
+    )
+
+    assert csv_reader.chunks(count=4) == []
+
+
+@pytest.mark.unit()
+@pytest.mark.parametrize("block_size", [1, 3, 1024])
+def test_record_splitter_splits_at_record_boundaries(block_size: int) -> None:
+    data = b'article_number;name\r\n1;"a\nb"\n2;"c\n""d""\ne"\n3;f'
+    splitter = RecordSplitter()
+
+    blocks = [
+        splitter.feed(data[offset : offset + block_size])
+        for offset in range(0, len(data), block_size)
+    ]
+    blocks.append(splitter.close())
+
+    assert b"".join(blocks) == data
+    stream_meta = CsvStreamMeta(delimiter=";")
+    header, records = split_header(
+        b"".join(blocks[:-1]), stream_meta, CsvSourceSchemaRequired
+    )
+    assert header == ["article_number", "name"]
+    for block in blocks[:-1]:
+        assert not block or block.endswith(b"\n")
+    assert list(read_block(records + blocks[-1], stream_meta, header)) == [
+        ("1", "a\nb"),
+        ("2", 'c\n"d"\ne'),
+        ("3", "f"),
+    ]
+
+
+@pytest.mark.unit()
+def test_split_header_validates_schema() -> None:
+    with pytest.raises(InvalidCsvSchemaError):
+        split_header(
+            b"ean;price\n1;2\n", CsvStreamMeta(delimiter=";"), CsvSourceSchemaRequired
+        )
+
+
+@pytest.mark.unit()
+@pytest.mark.parametrize(
+    ("name", "stem"),
+    [
+        ("pricat.csv", "pricat"),
+        ("pricat.2024.csv.gz", "pricat.2024"),
+        ("pricat.csv.xz", "pricat"),
+        ("pricat.gz", None),
+        ("pricat.txt", None),
+    ],
+)
+def test_csv_stem(name: str, stem: str | None) -> None:
+    assert csv_stem(pathlib.Path(name)) == stem
+
+
+@pytest.mark.unit()
+@pytest.mark.parametrize("compression", list(Compression))
+def test_read_compressed_file(
+    tmp_path: pathlib.Path, source_reader: CsvReader, compression: Compression
+) -> None:
+    # The compression is told by magic bytes rather than the suffix
+    path = tmp_path / "pricat.csv.gz"
+    data = source_reader.file_meta.path.read_bytes()
+    # Streams may be concatenated, e.g. by parallel compressors
+    compress = COMPRESSORS[compression]
+    path.write_bytes(compress(data[:1000]) + compress(data[1000:]))
+    compressed_reader = CsvReader(
+        file_meta=CsvFileReaderMeta(path=path, delimiter=";"),
+        validation_schema=CsvSourceSchemaRequired,
+    )
+
+    assert compressed_reader.compression is compression
+    assert compressed_reader.read_header() == source_reader.read_header()
+    assert list(compressed_reader.read_by_tuple()) == list(
+        source_reader.read_by_tuple()
+    )
+    assert list(compressed_reader.read_by_row()) == list(source_reader.read_by_row())
+
+
+@pytest.mark.unit()
+@pytest.mark.parametrize("padding", [1, 1024, DECOMPRESS_READ_SIZE + 1])
+def test_read_gzip_file_with_zero_padding(
+    tmp_path: pathlib.Path, source_reader: CsvReader, padding: int
+) -> None:
+    # Padding after members is accepted by gzip tools and `gzip.decompress`
+    path = tmp_path / "pricat.csv.gz"
+    data = source_reader.file_meta.path.read_bytes()
+    compressed = (
+        gzip.compress(data[:1000])
+        + bytes(padding)
+        + gzip.compress(data[1000:])
+        + bytes(padding)
+    )
+    assert gzip.decompress(compressed) == data
+    path.write_bytes(compressed)
+    compressed_reader = CsvReader(
+        file_meta=CsvFileReaderMeta(path=path, delimiter=";"),
+        validation_schema=CsvSourceSchemaRequired,
+    )
+
+    assert list(compressed_reader.read_by_tuple()) == list(
+        source_reader.read_by_tuple()
+    )
+
+
+@pytest.mark.unit()
+def test_read_compressed_file_stops_early(
+    tmp_path: pathlib.Path, source_reader: CsvReader
+) -> None:
+    path = tmp_path / "pricat.csv.gz"
+    path.write_bytes(gzip.compress(source_reader.file_meta.path.read_bytes() * 20))
+    compressed_reader = CsvReader(
+        file_meta=CsvFileReaderMeta(path=path, delimiter=";"),
+        validation_schema=CsvSourceSchemaRequired,
+    )
+
+    rows = compressed_reader.read_by_tuple()
+    next(rows)
+    assert 0 < compressed_reader.position <= path.stat().st_size
+    rows.close()
+
+    assert compressed_reader.position == 0
+    assert not [
+        thread
+        for thread in threading.enumerate()
+        if thread.name.startswith("decompress-")
+    ]
+
+
+@pytest.mark.unit()
+def test_read_truncated_compressed_file(
+    tmp_path: pathlib.Path, source_reader: CsvReader
+) -> None:
+    path = tmp_path / "pricat.csv.xz"
+    compressed = lzma.compress(source_reader.file_meta.path.read_bytes())
+    path.write_bytes(compressed[: len(compressed) // 2])
+    compressed_reader = CsvReader(
+        file_meta=CsvFileReaderMeta(path=path, delimiter=";"),
+        validation_schema=CsvSourceSchemaRequired,
+    )
+
+    with pytest.raises(CsvReaderError):
+        list(compressed_reader.read_by_tuple())
+    with pytest.raises(CsvReaderError):
+        compressed_reader.chunks(count=2)
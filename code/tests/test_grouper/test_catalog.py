@@ -6,6 +6,7 @@ from src.grouper.catalog import (
     FlatDictRow,
     _level_up_common_attributes_to_article_level,
     _level_up_common_attributes_to_catalog_level,
+    consolidate_common_attributes,
 )
 
 
@@ -109,6 +110,71 @@ def test_catalog_add(flat_rows: list[FlatDictRow], expected: Catalog) -> None:
     assert catalog == expected
 
 
+@pytest.mark.unit()
+def test_catalog_add_tracks_shared_attributes() -> None:
+    catalog = Catalog.new()
+
+    catalog.add({"article_number": "a", "name": "same", "colour": "black"})
+    catalog.add({"article_number": "a", "name": "same", "colour": "red"})
+    catalog.add({"article_number": "b", "name": "other", "colour": "red"})
+
+    assert catalog.articles["a"].shared_attributes == {"name": "same"}
+    assert catalog.articles["b"].shared_attributes == {
+        "name": "other",
+        "colour": "red",
+    }
+
+
+@pytest.mark.functional()
+def test_consolidate_common_attributes_strips_variations_lazily() -> None:
+    catalog = Catalog.new()
+    catalog.add({"article_number": "a", "brand": "asos", "colour": "black"})
+    catalog.add({"article_number": "a", "brand": "asos", "colour": "red"})
+    catalog.add({"article_number": "b", "brand": "asos", "colour": "red"})
+
+    consolidate_common_attributes(catalog)
+
+    assert catalog.common_attributes == {"brand": "asos"}
+    assert catalog.articles["a"].common_attributes == {}
+    assert catalog.articles["b"].common_attributes == {"colour": "red"}
+    assert catalog.articles["a"].variations == [
+        {"brand": "asos", "colour": "black"},
+        {"brand": "asos", "colour": "red"},
+    ]
+    assert list(catalog.articles["a"].iter_variations()) == [
+        {"colour": "black"},
+        {"colour": "red"},
+    ]
+    assert list(catalog.articles["b"].iter_variations()) == [{}]
+    assert all(
+        article.shared_attributes is None for article in catalog.articles.values()
+    )
+
+
+@pytest.mark.functional()
+def test_consolidate_common_attributes_default_share() -> None:
+    catalog = Catalog.new()
+    catalog.add({"article_number": "a", "brand": "asos", "price": "125", "tag": "x"})
+    catalog.add({"article_number": "a", "brand": "asos", "price": "125", "tag": "x"})
+    catalog.add({"article_number": "a", "brand": "asos", "price": "99", "tag": "x"})
+    catalog.add({"article_number": "a", "brand": "asos", "price": "125"})
+    catalog.add({"article_number": "b", "brand": "asos", "price": "125"})
+
+    consolidate_common_attributes(catalog, default_share=0.75)
+
+    article = catalog.articles["a"]
+    assert catalog.common_attributes == {"brand": "asos"}
+    assert article.common_attributes == {}
+    assert article.default_attributes == {"price": "125", "tag": "x"}
+    assert article.to_dict() == {
+        "article_number": "a",
+        "variations": [{}, {}, {"price": "99"}, {"tag": None}],
+        "common_attributes": {},
+        "default_attributes": {"price": "125", "tag": "x"},
+    }
+    assert catalog.articles["b"].to_dict()["default_attributes"] == {}
+
+
 @pytest.mark.functional()
 @pytest.mark.parametrize(
     ("article", "expected_article"),
@@ -190,7 +256,7 @@ def test_level_up_common_attributes_to_article_level(
 ) -> None:
     _level_up_common_attributes_to_article_level(article)
 
-    assert article.variations == expected_article.variations
+    assert list(article.iter_variations()) == expected_article.variations
     assert article.common_attributes == expected_article.common_attributes
 
 
@@ -304,3 +370,51 @@ def test_level_up_common_attributes_to_catalog_level(
 
     assert catalog.articles == expected_catalog.articles
     assert catalog.common_attributes == expected_catalog.common_attributes
+
+
+@pytest.mark.unit()
+def test_catalog_memory_report() -> None:
+    catalog = Catalog.new()
+    for colour in ("black", "red", "black"):
+        catalog.add({"article_number": "a", "brand": "asos", "colour": colour})
+    catalog.add({"article_number": "b", "brand": "asos", "colour": "red"})
+
+    report = catalog.memory_report()
+
+    assert report.articles_count == 2
+    assert report.variations_count == 4
+    assert report.total_bytes == (
+        report.table_bytes + report.articles_bytes + report.variations_bytes
+    )
+    assert report.bytes_per_article == report.total_bytes / 2
+    assert report.bytes_per_variation > 0
+    assert Catalog.new().memory_report().bytes_per_variation == 0
+
+
+@pytest.mark.unit()
+def test_catalog_merge() -> None:
+    rows = [
+        {"article_number": "a", "brand": "asos", "colour": "black"},
+        {"article_number": "b", "brand": "asos", "colour": "red"},
+        {"article_number": "a", "brand": "asos", "colour": "red"},
+        {"article_number": "c", "brand": "nike", "colour": "red"},
+    ]
+    expected = Catalog.new()
+    for row in rows:
+        expected.add(row)
+    first, second = Catalog.new(), Catalog.new()
+    for row in rows[:2]:
+        first.add(row)
+    for row in rows[2:]:
+        second.add(row)
+
+    merged = first.merge(second)
+
+    assert merged == expected
+    assert {
+        article_number: article.shared_attributes
+        for article_number, article in merged.articles.items()
+    } == {
+        article_number: article.shared_attributes
+        for article_number, article in expected.articles.items()
+    }
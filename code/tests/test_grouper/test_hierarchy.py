@@ -0,0 +1,174 @@
+import pytest
+
+from src.grouper.catalog import Article, Catalog, consolidate_common_attributes
+from src.grouper.hierarchy import GroupedCatalog, group_variations
+
+
+@pytest.mark.unit()
+@pytest.mark.parametrize(
+    ("variations", "group_by", "expected"),
+    [
+        (
+            [
+                {"color_code": "1", "color": "black", "size": "36"},
+                {"color_code": "2", "color": "red", "size": "36"},
+                {"color_code": "1", "color": "black", "size": "37"},
+            ],
+            ("color_code",),
+            {
+                "1": {
+                    "color_code": "1",
+                    "variations": [{"size": "36"}, {"size": "37"}],
+                    "common_attributes": {"color": "black"},
+                },
+                "2": {
+                    "color_code": "2",
+                    "variations": [{}],
+                    "common_attributes": {"color": "red", "size": "36"},
+                },
+            },
+        ),
+        (
+            [
+                {"color_code": "1", "size_code": "36", "ean": "a", "price": "5"},
+                {"color_code": "1", "size_code": "36", "ean": "b", "price": "5"},
+                {"color_code": "1", "size_code": "37", "ean": "c", "price": "6"},
+            ],
+            ("color_code", "size_code"),
+            {
+                "1": {
+                    "color_code": "1",
+                    "groups": {
+                        "36": {
+                            "size_code": "36",
+                            "variations": [{"ean": "a"}, {"ean": "b"}],
+                            "common_attributes": {"price": "5"},
+                        },
+                        "37": {
+                            "size_code": "37",
+                            "variations": [{}],
+                            "common_attributes": {"ean": "c", "price": "6"},
+                        },
+                    },
+                    "common_attributes": {},
+                },
+            },
+        ),
+        (
+            [
+                {"color_code": "1", "size": "36"},
+                {"size": "37"},
+            ],
+            ("color_code",),
+            {
+                "1": {
+                    "color_code": "1",
+                    "variations": [{}],
+                    "common_attributes": {"size": "36"},
+                },
+                None: {
+                    "color_code": None,
+                    "variations": [{}],
+                    "common_attributes": {"size": "37"},
+                },
+            },
+        ),
+        (
+            [
+                {"color_code": "1", "size_code": "36", "ean": "a"},
+                {"color_code": "1", "size_code": "36", "ean": "b"},
+            ],
+            ("color_code", "size_code"),
+            {
+                "1": {
+                    "color_code": "1",
+                    "groups": {
+                        "36": {
+                            "size_code": "36",
+                            "variations": [{"ean": "a"}, {"ean": "b"}],
+                            "common_attributes": {},
+                        },
+                    },
+                    "common_attributes": {},
+                },
+            },
+        ),
+    ],
+)
+def test_group_variations(
+    variations: list[dict[str, str]],
+    group_by: tuple[str, ...],
+    expected: dict[str | None, dict[str, object]],
+) -> None:
+    assert group_variations(variations=variations, group_by=group_by) == expected
+
+
+@pytest.mark.unit()
+def test_grouped_catalog() -> None:
+    catalog = Catalog(
+        common_attributes={"brand": "x"},
+        articles={
+            "a": Article(
+                article_number="a",
+                variations=[
+                    {"color_code": "1", "size": "36"},
+                    {"color_code": "1", "size": "37"},
+                ],
+                common_attributes={"name": "dream"},
+            ),
+        },
+    )
+
+    grouped = GroupedCatalog(catalog=catalog, group_by=("color_code",))
+
+    assert grouped.common_attributes == {"brand": "x"}
+    assert grouped.articles_count == 1
+    assert list(grouped.iter_articles()) == [
+        {
+            "article_number": "a",
+            "groups": {
+                "1": {
+                    "color_code": "1",
+                    "variations": [{"size": "36"}, {"size": "37"}],
+                    "common_attributes": {},
+                },
+            },
+            "common_attributes": {"name": "dream"},
+        },
+    ]
+
+
+@pytest.mark.unit()
+@pytest.mark.parametrize("articles_count", [1, 2])
+def test_grouped_catalog_single_colour_articles(articles_count: int) -> None:
+    # A single article lifts its colour to the catalog, several to articles
+    catalog = Catalog.new()
+    for article_number in map(str, range(articles_count)):
+        for size in ("36", "37"):
+            catalog.add(
+                {
+                    "article_number": article_number,
+                    "color_code": article_number,
+                    "size": size,
+                    "brand": "x",
+                }
+            )
+    consolidate_common_attributes(catalog)
+
+    grouped = GroupedCatalog(catalog=catalog, group_by=("color_code",))
+
+    assert grouped.common_attributes == {"brand": "x"}
+    assert [record["groups"] for record in grouped.iter_articles()] == [
+        {
+            article_number: {
+                "color_code": article_number,
+                "variations": [{"size": "36"}, {"size": "37"}],
+                "common_attributes": {},
+            },
+        }
+        for article_number in map(str, range(articles_count))
+    ]
+    assert all(
+        "color_code" not in record["common_attributes"]
+        for record in grouped.iter_articles()
+    )
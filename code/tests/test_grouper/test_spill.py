@@ -0,0 +1,83 @@
+import pathlib
+
+import pytest
+
+from src.grouper.catalog import Catalog, consolidate_common_attributes
+from src.grouper.spill import (
+    ExternalGrouper,
+    estimate_buffered_rows,
+    estimate_partitions_count,
+)
+
+
+@pytest.mark.unit()
+@pytest.mark.parametrize(
+    ("source_size", "max_memory", "expected"),
+    [(100, 1000, 1), (1000, 1000, 2), (0, 1000, 1)],
+    ids=["fits", "spills", "empty_source"],
+)
+def test_estimate_partitions_count(
+    source_size: int, max_memory: int, expected: int
+) -> None:
+    assert estimate_partitions_count(source_size, max_memory) == expected
+
+
+@pytest.mark.unit()
+@pytest.mark.parametrize(
+    ("max_memory", "expected"),
+    [(1, 1), (4096, 2), (1024 * 1024, 512)],
+    ids=["tiny", "small", "large"],
+)
+def test_estimate_buffered_rows(max_memory: int, expected: int) -> None:
+    assert estimate_buffered_rows(max_memory) == expected
+
+
+@pytest.mark.functional()
+@pytest.mark.parametrize("max_buffered_rows", [1, 5])
+def test_external_grouper_caps_buffered_rows(
+    tmp_path: pathlib.Path, max_buffered_rows: int
+) -> None:
+    rows = [{"article_number": str(i % 50), "colour": str(i)} for i in range(500)]
+    catalog = Catalog.new()
+    grouper = ExternalGrouper(
+        directory=tmp_path, partitions_count=20, max_buffered_rows=max_buffered_rows
+    )
+
+    peak_buffered_rows = 0
+    for row in rows:
+        catalog.add(row)
+        grouper.add(row)
+        peak_buffered_rows = max(peak_buffered_rows, grouper.buffered_rows)
+
+    assert peak_buffered_rows < max_buffered_rows
+    consolidate_common_attributes(catalog)
+    assert grouper.consolidate().articles_count == len(catalog.articles)
+
+
+@pytest.mark.functional()
+def test_external_grouper_equals_in_memory_catalog(tmp_path: pathlib.Path) -> None:
+    rows = [
+        {
+            "article_number": str(i % 7),
+            "brand": "asos",
+            "name": f"name {i % 7}",
+            "colour": str(i % 3),
+        }
+        for i in range(50)
+    ]
+    catalog = Catalog.new()
+    grouper = ExternalGrouper(directory=tmp_path, partitions_count=3)
+    for row in rows:
+        catalog.add(row)
+        grouper.add(row)
+
+    consolidate_common_attributes(catalog)
+    spilled_catalog = grouper.consolidate()
+
+    assert spilled_catalog.common_attributes == catalog.common_attributes
+    assert sorted(
+        spilled_catalog.iter_articles(), key=lambda a: a["article_number"]
+    ) == [
+        catalog.articles[article_number].to_dict()
+        for article_number in sorted(catalog.articles)
+    ]
@@ -0,0 +1,103 @@
+import pickle
+
+import pytest
+
+from src.grouper.storage import AttributeTable, SharedValues, count_values
+
+
+@pytest.mark.unit()
+def test_attribute_table_encode() -> None:
+    table = AttributeTable()
+
+    first = table.encode({"article_number": "a", "colour": "black", "brand": "asos"})
+    second = table.encode(
+        {"article_number": "a", "brand": "asos", "size": "36"},
+        exclude="article_number",
+    )
+
+    assert first == {"article_number": "a", "colour": "black", "brand": "asos"}
+    assert second == {"brand": "asos", "size": "36"}
+    assert len(second) == 2
+    assert "colour" not in second
+    assert second.get("colour", "n/a") == "n/a"
+    assert second.to_dict(exclude={"brand"}) == {"size": "36"}
+    assert table.keys == ["article_number", "colour", "brand", "size"]
+    assert table.values == [None, "a", "black", "asos", "36"]
+    # Keys in the order of key ids are encoded without reordering
+    assert table.encode(
+        {"article_number": "b", "colour": "red", "brand": "nike"},
+        exclude="article_number",
+    ) == {"colour": "red", "brand": "nike"}
+
+
+@pytest.mark.unit()
+def test_compact_variation_missing_key() -> None:
+    variation = AttributeTable().encode({"colour": "black"})
+
+    with pytest.raises(KeyError):
+        variation["size"]
+
+
+@pytest.mark.unit()
+def test_compact_variation_pickles_with_shared_table() -> None:
+    table = AttributeTable()
+    variations = [table.encode({"colour": "black"}), table.encode({"colour": "red"})]
+
+    restored = pickle.loads(pickle.dumps(variations))
+
+    assert restored == [{"colour": "black"}, {"colour": "red"}]
+    assert restored[0]._table is restored[1]._table
+    # Attributes a row does not have are still missing after a round trip
+    assert restored[0]._table.encode({"size": "36"}) == {"size": "36"}
+    assert restored[0]._table.values == [None, "black", "red", "36"]
+
+
+@pytest.mark.unit()
+@pytest.mark.parametrize(
+    ("dicts", "expected"),
+    [
+        (
+            [
+                {"brand": "asos", "colour": "black", "size": "36"},
+                {"brand": "asos", "colour": "black", "size": "38"},
+                {"colour": "black", "brand": "asos", "price": "99"},
+            ],
+            {"brand": "asos", "colour": "black"},
+        ),
+        ([{"brand": "asos"}, {"brand": "asos", "colour": "red"}], {"brand": "asos"}),
+        ([{"brand": "asos", "colour": "red"}, {"size": "36"}], {}),
+    ],
+    ids=["shared_values", "one_shared_value", "nothing_shared"],
+)
+def test_shared_values_intersect(
+    dicts: list[dict[str, str]], expected: dict[str, str]
+) -> None:
+    table = AttributeTable()
+    variations = [table.encode(d) for d in dicts]
+
+    shared = SharedValues(variations[0])
+    for variation in variations[1:]:
+        assert shared.intersect(variation)
+
+    assert shared == expected
+    assert not shared.intersect(AttributeTable().encode(dicts[0]))
+
+
+@pytest.mark.unit()
+def test_count_values() -> None:
+    table = AttributeTable()
+    dicts = [
+        {"colour": "black", "price": "125"},
+        {"colour": "red", "price": "125"},
+        {"price": "99", "size": "36"},
+    ]
+
+    counts = count_values([table.encode(d) for d in dicts])
+
+    assert counts == count_values(dicts)
+    assert counts == {
+        "colour": {"black": 1, "red": 1},
+        "price": {"125": 2, "99": 1},
+        "size": {"36": 1},
+    }
+    assert list(counts["colour"]) == ["black", "red"]
@@ -0,0 +1,110 @@
+import pathlib
+import sqlite3
+
+import pytest
+
+from src.grouper.catalog import Catalog, consolidate_common_attributes
+from src.grouper.exceptions import CatalogStoreError, RequiredFieldMissingError
+from src.grouper.store import CatalogStore, UpdateReport
+
+ROWS = [
+    {
+        "article_number": str(i % 7),
+        "ean": str(i),
+        "brand": "asos",
+        "name": f"name {i % 7}",
+        "colour": str(i % 3),
+    }
+    for i in range(50)
+]
+
+
+def _consolidated_catalog(rows: list[dict[str, str]]) -> Catalog:
+    catalog = Catalog.new()
+    for row in rows:
+        catalog.add(row)
+    consolidate_common_attributes(catalog)
+    return catalog
+
+
+@pytest.mark.functional()
+@pytest.mark.parametrize("deltas_count", [1, 2, 5])
+def test_store_equals_in_memory_catalog(
+    tmp_path: pathlib.Path, deltas_count: int
+) -> None:
+    catalog = _consolidated_catalog(ROWS)
+
+    with CatalogStore(path=tmp_path / "catalog.db") as store:
+        size = -(-len(ROWS) // deltas_count)
+        for start in range(0, len(ROWS), size):
+            store.apply(ROWS[start : start + size])
+        stored_catalog = store.to_catalog()
+
+        assert stored_catalog.articles_count == len(catalog.articles)
+        assert stored_catalog.common_attributes == catalog.common_attributes
+        assert sorted(
+            stored_catalog.iter_articles(), key=lambda a: a["article_number"]
+        ) == [
+            catalog.articles[article_number].to_dict()
+            for article_number in sorted(catalog.articles)
+        ]
+
+
+@pytest.mark.functional()
+def test_store_updates_variations_by_key(tmp_path: pathlib.Path) -> None:
+    updated_row = {**ROWS[3], "brand": "nike"}
+    expected = _consolidated_catalog([updated_row if r is ROWS[3] else r for r in ROWS])
+
+    with CatalogStore(path=tmp_path / "catalog.db") as store:
+        store.apply(ROWS)
+        report = store.apply([updated_row])
+        stored_catalog = store.to_catalog()
+
+        assert report == UpdateReport(rows=1, articles_added=0, articles_updated=1)
+        # Brand is no longer common to all articles
+        assert stored_catalog.common_attributes == expected.common_attributes == {}
+        assert {
+            article["article_number"]: article
+            for article in stored_catalog.iter_articles()
+        } == {
+            article_number: article.to_dict()
+            for article_number, article in expected.articles.items()
+        }
+
+
+@pytest.mark.unit()
+def test_store_persists_between_connections(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "catalog.db"
+    with CatalogStore(path=path) as store:
+        store.apply(ROWS[:10])
+    with CatalogStore(path=path) as store:
+        report = store.apply(ROWS[10:])
+        stored_catalog = store.to_catalog()
+
+        assert report.articles_added == 0
+        assert stored_catalog.to_dict()["common_attributes"] == {"brand": "asos"}
+
+
+@pytest.mark.unit()
+def test_store_rejects_other_version(tmp_path: pathlib.Path) -> None:
+    path = tmp_path / "catalog.db"
+    with CatalogStore(path=path) as store:
+        store.apply(ROWS[:10])
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA user_version = 0")
+    connection.close()
+
+    with pytest.raises(CatalogStoreError):
+        CatalogStore(path=path)
+
+
+@pytest.mark.unit()
+@pytest.mark.parametrize("row", [{"ean": "1"}, {"article_number": "", "ean": "1"}])
+def test_store_rejects_row_without_article_number(
+    tmp_path: pathlib.Path, row: dict[str, str]
+) -> None:
+    with CatalogStore(path=tmp_path / "catalog.db") as store:
+        with pytest.raises(RequiredFieldMissingError):
+            store.apply([ROWS[0], row])
+
+        assert store.to_catalog().articles_count == 0
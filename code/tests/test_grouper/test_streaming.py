@@ -0,0 +1,69 @@
+import pytest
+
+from src.grouper.catalog import Catalog, iter_consolidated_articles
+from src.grouper.exceptions import RequiredFieldMissingError, UnsortedInputError
+from src.grouper.streaming import group_sorted
+
+
+@pytest.mark.functional()
+def test_group_sorted_equals_catalog() -> None:
+    rows = [
+        {"article_number": "a", "brand": "asos", "colour": "black"},
+        {"article_number": "a", "brand": "asos", "colour": "red"},
+        {"article_number": "b", "brand": "nike", "colour": "red"},
+        {"article_number": "b", "brand": "nike", "colour": "red"},
+        {"article_number": "c", "brand": "asos", "colour": "red"},
+    ]
+    catalog = Catalog.new()
+    for row in rows:
+        catalog.add(row)
+
+    articles = list(group_sorted(rows))
+
+    assert [article.to_dict() for article in articles] == [
+        article.to_dict() for article in iter_consolidated_articles(catalog)
+    ]
+
+
+@pytest.mark.unit()
+def test_group_sorted_yields_articles_as_they_complete() -> None:
+    rows = iter(
+        [
+            {"article_number": "a", "colour": "black"},
+            {"article_number": "b", "colour": "red"},
+            {"article_number": "c", "colour": "red"},
+        ]
+    )
+
+    articles = group_sorted(rows)
+
+    assert next(articles).article_number == "a"
+    assert next(rows) == {"article_number": "c", "colour": "red"}
+
+
+@pytest.mark.unit()
+@pytest.mark.parametrize(
+    ("rows", "error"),
+    [
+        (
+            [
+                {"article_number": "a", "colour": "black"},
+                {"article_number": "b", "colour": "red"},
+                {"article_number": "a", "colour": "red"},
+            ],
+            UnsortedInputError,
+        ),
+        (
+            [
+                {"article_number": "b", "colour": "black"},
+                {"article_number": "a", "colour": "red"},
+            ],
+            UnsortedInputError,
+        ),
+        ([{"colour": "black"}], RequiredFieldMissingError),
+    ],
+    ids=["reappearing", "descending", "article_number_missing"],
+)
+def test_group_sorted_error(rows: list[dict], error: type[Exception]) -> None:
+    with pytest.raises(error):
+        list(group_sorted(rows))
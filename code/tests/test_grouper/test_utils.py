@@ -1,8 +1,12 @@
+import collections
+
 import pytest
 
 from src.grouper.utils import (
     collect_common_attributes,
+    intersect_attributes_inplace,
     remove_attributes_inplace,
+    split_default_attributes,
 )
 
 
@@ -196,3 +200,48 @@ def test_remove_attributes_inplace(
 ) -> None:
     remove_attributes_inplace(target_dict, dict_to_remove)
     assert target_dict == expected
+
+
+@pytest.mark.parametrize(
+    ("common", "d", "expected"),
+    [
+        (
+            {"name": "same", "price": "125"},
+            {"name": "same", "price": "2"},
+            {"name": "same"},
+        ),
+        ({"name": "same"}, {"price": "2"}, {}),
+        ({"name": "same"}, {"name": "same", "price": "2"}, {"name": "same"}),
+        ({}, {"name": "same"}, {}),
+    ],
+    ids=["diff_values", "missing_key", "extra_key", "empty_common"],
+)
+def test_intersect_attributes_inplace(common: dict, d: dict, expected: dict) -> None:
+    intersect_attributes_inplace(common, d)
+    assert common == expected
+
+
+@pytest.mark.parametrize(
+    ("default_share", "expected"),
+    [
+        (1.0, ({"name": "same"}, {})),
+        (0.75, ({"name": "same"}, {"price": "125"})),
+        (0.5, ({"name": "same"}, {"price": "125", "discount": "10"})),
+    ],
+    ids=["all", "most", "half_first_on_ties"],
+)
+def test_split_default_attributes(
+    default_share: float, expected: tuple[dict, dict]
+) -> None:
+    value_counts = {
+        "name": collections.Counter({"same": 4}),
+        "price": collections.Counter({"125": 3, "99": 1}),
+        "discount": collections.Counter({"10": 2, "20": 2}),
+    }
+
+    assert (
+        split_default_attributes(
+            value_counts=value_counts, total=4, default_share=default_share
+        )
+        == expected
+    )
@@ -1,10 +1,22 @@
+import asyncio
+import dataclasses
+import gzip
+import io
 import json
 import pathlib
+import typing as tp
 
 import pytest
 
+from src.async_pipeline import run_pipeline_async
 from src.extractor import reader
+from src.extractor.exceptions import InvalidCsvSchemaError
+from src.extractor.schemas import CsvStreamMeta
+from src.loader.columnar import CatalogFile
+from src.loader.schemas import OutputFormat, OutputLayout, OutputMeta
+from src.loader.tables import restore_variations
 from src.main import run_pipeline
+from src.schemas import PipelineOptions
 
 
 @pytest.mark.integration()
@@ -49,3 +61,436 @@ def test_run_pipeline_bonus(
     captured = capsys.readouterr()
 
     assert json.loads(captured.out) == json.loads(expected_output_json_bonus)
+
+
+class _RunPipeline(tp.Protocol):
+    def __call__(
+        self,
+        output: OutputMeta | None = None,
+        options: PipelineOptions | None = None,
+        source_path: pathlib.Path | None = None,
+        stats_stream: tp.TextIO | None = None,
+    ) -> str: ...
+
+
+@pytest.fixture()
+def run_bonus_pipeline(
+    capsys: pytest.CaptureFixture[str],
+    input_source_pricat_csv_path: pathlib.Path,
+    input_mappings_bonus_csv_path: pathlib.Path,
+) -> _RunPipeline:
+    def run(
+        output: OutputMeta | None = None,
+        options: PipelineOptions | None = None,
+        source_path: pathlib.Path | None = None,
+        stats_stream: tp.TextIO | None = None,
+    ) -> str:
+        run_pipeline(
+            reader.CsvFileReaderMeta(
+                path=source_path or input_source_pricat_csv_path, delimiter=";"
+            ),
+            reader.CsvFileReaderMeta(path=input_mappings_bonus_csv_path, delimiter=";"),
+            output,
+            options,
+            stats_stream=stats_stream,
+        )
+        return capsys.readouterr().out
+
+    return run
+
+
+@pytest.fixture()
+def expected_catalog_bonus(expected_output_json_bonus: str) -> dict[str, tp.Any]:
+    return json.loads(expected_output_json_bonus)
+
+
+@pytest.mark.integration()
+def test_run_pipeline_to_file_compact(
+    tmp_path: pathlib.Path,
+    run_bonus_pipeline: _RunPipeline,
+    expected_catalog_bonus: dict[str, tp.Any],
+) -> None:
+    output_path = tmp_path / "catalog.json"
+
+    run_bonus_pipeline(OutputMeta(path=output_path, compact=True))
+
+    assert json.loads(output_path.read_text()) == expected_catalog_bonus
+
+
+@pytest.mark.integration()
+def test_run_pipeline_ndjson(
+    run_bonus_pipeline: _RunPipeline,
+    expected_catalog_bonus: dict[str, tp.Any],
+) -> None:
+    out = run_bonus_pipeline(OutputMeta(format=OutputFormat.NDJSON))
+
+    header = json.loads(out.splitlines()[0])
+    assert header == {"common_attributes": expected_catalog_bonus["common_attributes"]}
+    assert _load_ndjson(out) == expected_catalog_bonus
+
+
+@pytest.mark.integration()
+@pytest.mark.parametrize(
+    "options", [PipelineOptions(), PipelineOptions(max_memory=4096)]
+)
+def test_run_pipeline_table_layout(
+    tmp_path: pathlib.Path,
+    run_bonus_pipeline: _RunPipeline,
+    expected_catalog_bonus: dict[str, tp.Any],
+    options: PipelineOptions,
+) -> None:
+    output_path = tmp_path / "catalog.json"
+
+    run_bonus_pipeline(
+        OutputMeta(path=output_path, compact=True, layout=OutputLayout.TABLE), options
+    )
+
+    output = json.loads(output_path.read_text())
+    assert all("variations" not in article for article in output["articles"].values())
+    output["articles"] = {
+        article_number: restore_variations(article)
+        for article_number, article in output["articles"].items()
+    }
+    assert output == expected_catalog_bonus
+
+
+@pytest.mark.integration()
+@pytest.mark.parametrize(
+    "options", [PipelineOptions(), PipelineOptions(sorted_input=True)]
+)
+def test_run_pipeline_binary(
+    tmp_path: pathlib.Path,
+    run_bonus_pipeline: _RunPipeline,
+    expected_catalog_bonus: dict[str, tp.Any],
+    options: PipelineOptions,
+) -> None:
+    output_path = tmp_path / "catalog.bin"
+
+    run_bonus_pipeline(
+        OutputMeta(path=output_path, format=OutputFormat.BINARY), options
+    )
+
+    with CatalogFile(output_path) as catalog_file:
+        output = {
+            "articles": {
+                article.article_number: article.to_dict()
+                for article in catalog_file.iter_articles()
+            },
+            "common_attributes": catalog_file.common_attributes,
+        }
+    assert output == expected_catalog_bonus
+
+
+@pytest.mark.integration()
+@pytest.mark.parametrize(
+    "options",
+    [
+        PipelineOptions(),
+        PipelineOptions(sorted_input=True),
+        PipelineOptions(max_memory=1),
+    ],
+)
+def test_run_pipeline_compressed_source(
+    tmp_path: pathlib.Path,
+    input_source_pricat_csv_path: pathlib.Path,
+    run_bonus_pipeline: _RunPipeline,
+    expected_catalog_bonus: dict[str, tp.Any],
+    options: PipelineOptions,
+) -> None:
+    source_path = tmp_path / "pricat.csv.gz"
+    source_path.write_bytes(gzip.compress(input_source_pricat_csv_path.read_bytes()))
+
+    out = run_bonus_pipeline(options=options, source_path=source_path)
+
+    assert json.loads(out) == expected_catalog_bonus
+
+
+@pytest.mark.integration()
+def test_run_pipeline_workers(
+    run_bonus_pipeline: _RunPipeline, expected_catalog_bonus: dict[str, tp.Any]
+) -> None:
+    out = run_bonus_pipeline(options=PipelineOptions(workers=2))
+
+    assert json.loads(out) == expected_catalog_bonus
+
+
+@pytest.mark.integration()
+@pytest.mark.parametrize("output_format", [OutputFormat.JSON, OutputFormat.NDJSON])
+def test_run_pipeline_spill(
+    run_bonus_pipeline: _RunPipeline,
+    expected_catalog_bonus: dict[str, tp.Any],
+    output_format: OutputFormat,
+) -> None:
+    out = run_bonus_pipeline(
+        OutputMeta(format=output_format), PipelineOptions(max_memory=4096)
+    )
+
+    if output_format is OutputFormat.NDJSON:
+        assert _load_ndjson(out) == expected_catalog_bonus
+    else:
+        assert json.loads(out) == expected_catalog_bonus
+
+
+@pytest.mark.integration()
+def test_run_pipeline_sorted_input(
+    run_bonus_pipeline: _RunPipeline, expected_catalog_bonus: dict[str, tp.Any]
+) -> None:
+    out = run_bonus_pipeline(options=PipelineOptions(sorted_input=True))
+
+    assert json.loads(out) == expected_catalog_bonus
+
+
+@pytest.mark.integration()
+@pytest.mark.parametrize(
+    "options",
+    [
+        PipelineOptions(),
+        PipelineOptions(sorted_input=True),
+        PipelineOptions(max_memory=1),
+    ],
+)
+def test_run_pipeline_group_by(
+    run_bonus_pipeline: _RunPipeline,
+    expected_catalog_bonus: dict[str, tp.Any],
+    options: PipelineOptions,
+) -> None:
+    out = run_bonus_pipeline(
+        options=dataclasses.replace(options, group_by=("article_number", "color_code"))
+    )
+
+    output = json.loads(out)
+    assert output["common_attributes"] == expected_catalog_bonus["common_attributes"]
+    assert output["articles"].keys() == expected_catalog_bonus["articles"].keys()
+    for article_number, article in output["articles"].items():
+        expected_article = expected_catalog_bonus["articles"][article_number]
+        assert article["common_attributes"] == expected_article["common_attributes"]
+        # Every variation is in the group of its color, with the attributes
+        # lifted to the group
+        variations = [
+            {"color_code": color_code, **group["common_attributes"], **variation}
+            for color_code, group in article["groups"].items()
+            for variation in group["variations"]
+        ]
+        assert sorted(variations, key=lambda v: v["ean"]) == sorted(
+            expected_article["variations"], key=lambda v: v["ean"]
+        )
+        assert all(
+            "color_code" not in group["common_attributes"]
+            for group in article["groups"].values()
+        )
+
+
+@pytest.mark.integration()
+@pytest.mark.parametrize(
+    "options",
+    [
+        PipelineOptions(),
+        PipelineOptions(workers=2),
+        PipelineOptions(sorted_input=True),
+        PipelineOptions(max_memory=1),
+    ],
+)
+def test_run_pipeline_default_share(
+    run_bonus_pipeline: _RunPipeline,
+    expected_catalog_bonus: dict[str, tp.Any],
+    expected_output_json_bonus_defaults: str,
+    options: PipelineOptions,
+) -> None:
+    out = run_bonus_pipeline(options=dataclasses.replace(options, default_share=0.6))
+
+    output = json.loads(out)
+    assert output == json.loads(expected_output_json_bonus_defaults)
+    # Variations resolve to the same attributes as without defaults
+    assert _resolve_variations(output) == _resolve_variations(expected_catalog_bonus)
+
+
+@pytest.mark.integration()
+@pytest.mark.parametrize(
+    "options",
+    [
+        PipelineOptions(stats=True),
+        PipelineOptions(stats=True, max_memory=4096),
+        PipelineOptions(stats=True, sorted_input=True),
+    ],
+)
+def test_run_pipeline_stats(
+    run_bonus_pipeline: _RunPipeline,
+    expected_catalog_bonus: dict[str, tp.Any],
+    options: PipelineOptions,
+) -> None:
+    stats_stream = io.StringIO()
+
+    out = run_bonus_pipeline(options=options, stats_stream=stats_stream)
+
+    assert json.loads(out) == expected_catalog_bonus
+    stats = json.loads(stats_stream.getvalue())["stats"]
+    assert stats["rows"] == 49
+    assert stats["articles"] == 2
+    assert {"mappings", "grouping", "load"} <= set(stats["phases"])
+    assert stats["stages"]["read"]["items"] == 49
+    assert stats["stages"]["transform"]["items"] == 49
+    transform_cache = stats["counters"]["transform_cache"]
+    assert transform_cache["hits"] + transform_cache["misses"] == 49
+
+
+@pytest.mark.integration()
+def test_run_pipeline_mappings_cache(
+    tmp_path: pathlib.Path,
+    run_bonus_pipeline: _RunPipeline,
+    expected_catalog_bonus: dict[str, tp.Any],
+) -> None:
+    for _ in range(2):
+        out = run_bonus_pipeline(options=PipelineOptions(mappings_cache=tmp_path))
+
+        assert json.loads(out) == expected_catalog_bonus
+    assert len(list(tmp_path.glob("mapping-*.json"))) == 1
+
+
+@pytest.mark.integration()
+def test_run_pipeline_store(
+    tmp_path: pathlib.Path,
+    run_bonus_pipeline: _RunPipeline,
+    expected_catalog_bonus: dict[str, tp.Any],
+) -> None:
+    # Applying the same file again updates every variation in place
+    for _ in range(2):
+        out = run_bonus_pipeline(options=PipelineOptions(store=tmp_path / "catalog.db"))
+
+        assert json.loads(out) == expected_catalog_bonus
+
+
+class _BytesSink:
+    def __init__(self) -> None:
+        self.data = bytearray()
+
+    async def write(self, data: bytes) -> None:
+        self.data += data
+        await asyncio.sleep(0)
+
+
+async def _iter_bytes(data: bytes, block_size: int) -> tp.AsyncIterator[bytes]:
+    for offset in range(0, len(data), block_size):
+        yield data[offset : offset + block_size]
+        await asyncio.sleep(0)
+
+
+@pytest.mark.integration()
+@pytest.mark.parametrize("block_size", [7, 1024, 1024 * 1024])
+def test_run_pipeline_async(
+    input_source_pricat_csv_path: pathlib.Path,
+    input_mappings_bonus_csv_path: pathlib.Path,
+    run_bonus_pipeline: _RunPipeline,
+    block_size: int,
+) -> None:
+    sink = _BytesSink()
+
+    asyncio.run(
+        run_pipeline_async(
+            source=_iter_bytes(input_source_pricat_csv_path.read_bytes(), block_size),
+            source_meta=CsvStreamMeta(delimiter=";"),
+            mappings_file=reader.CsvFileReaderMeta(
+                path=input_mappings_bonus_csv_path, delimiter=";"
+            ),
+            sink=sink,
+        )
+    )
+
+    assert sink.data.decode() == run_bonus_pipeline()
+
+
+@pytest.mark.integration()
+def test_run_pipeline_async_ndjson(
+    input_source_pricat_csv_path: pathlib.Path,
+    input_mappings_bonus_csv_path: pathlib.Path,
+    expected_output_json_bonus: str,
+) -> None:
+    sink = _BytesSink()
+
+    asyncio.run(
+        run_pipeline_async(
+            source=_iter_bytes(input_source_pricat_csv_path.read_bytes(), 4096),
+            source_meta=CsvStreamMeta(delimiter=";"),
+            mappings_file=reader.CsvFileReaderMeta(
+                path=input_mappings_bonus_csv_path, delimiter=";"
+            ),
+            sink=sink,
+            output=OutputMeta(format=OutputFormat.NDJSON),
+        )
+    )
+
+    header, *lines = sink.data.decode().splitlines()
+    expected = json.loads(expected_output_json_bonus)
+    assert json.loads(header) == {"common_attributes": expected["common_attributes"]}
+    assert len(lines) == len(expected["articles"])
+
+
+@pytest.mark.integration()
+@pytest.mark.parametrize("data", [b"", b"ean;price\n1;2\n"])
+def test_run_pipeline_async_invalid_header(
+    input_mappings_csv_path: pathlib.Path, data: bytes
+) -> None:
+    with pytest.raises(InvalidCsvSchemaError):
+        asyncio.run(
+            run_pipeline_async(
+                source=_iter_bytes(data, 4),
+                source_meta=CsvStreamMeta(delimiter=";"),
+                mappings_file=reader.CsvFileReaderMeta(
+                    path=input_mappings_csv_path, delimiter=";"
+                ),
+                sink=_BytesSink(),
+            )
+        )
+
+
+@pytest.mark.integration()
+def test_run_pipeline_async_sink_error(
+    input_source_pricat_csv_path: pathlib.Path,
+    input_mappings_csv_path: pathlib.Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    class FailingSink:
+        async def write(self, data: bytes) -> None:
+            raise ConnectionResetError
+
+    # Small chunks fill the queue while the sink fails
+    monkeypatch.setattr("src.async_pipeline.OUTPUT_CHUNK_SIZE", 16)
+
+    with pytest.raises(ConnectionResetError):
+        asyncio.run(
+            run_pipeline_async(
+                source=_iter_bytes(input_source_pricat_csv_path.read_bytes(), 4096),
+                source_meta=CsvStreamMeta(delimiter=";"),
+                mappings_file=reader.CsvFileReaderMeta(
+                    path=input_mappings_csv_path, delimiter=";"
+                ),
+                sink=FailingSink(),
+            )
+        )
+
+
+def _load_ndjson(out: str) -> dict[str, tp.Any]:
+    header, *articles = [json.loads(line) for line in out.splitlines()]
+    return {
+        "articles": {article["article_number"]: article for article in articles},
+        **header,
+    }
+
+
+def _resolve_variations(catalog: dict[str, tp.Any]) -> dict[str, list[dict]]:
+    # Lifted attributes apply to variations unless overridden; None overrides
+    # an attribute that a variation does not have
+    resolved = {}
+    for article_number, article in catalog["articles"].items():
+        variations = []
+        for variation in article["variations"]:
+            attributes = {
+                **catalog["common_attributes"],
+                **article["common_attributes"],
+                **article.get("default_attributes", {}),
+                **variation,
+            }
+            variations.append(
+                {key: value for key, value in attributes.items() if value is not None}
+            )
+        resolved[article_number] = sorted(variations, key=lambda v: v["ean"])
+    return resolved
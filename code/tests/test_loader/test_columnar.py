@@ -0,0 +1,117 @@
+import io
+import pathlib
+
+import pytest
+
+from src.grouper.catalog import Article, Catalog
+from src.loader.columnar import CatalogFile, write_catalog
+from src.loader.exceptions import InvalidCatalogFileError, LoaderError
+
+
+@pytest.fixture()
+def catalog() -> Catalog:
+    return Catalog(
+        articles={
+            "001": Article(
+                article_number="001",
+                variations=[
+                    {"colour": "black", "size": "36"},
+                    {"colour": "wéiß"},
+                    {"size": "38", "price": "2"},
+                ],
+                common_attributes={"name": "same"},
+            ),
+            "002": Article(
+                article_number="002",
+                variations=[{}],
+                common_attributes={},
+                default_attributes={"price": "5"},
+            ),
+            "003": Article(
+                article_number="003",
+                variations=[{}, {"price": "6"}, {"price": "5"}],
+                common_attributes={"name": "other"},
+                default_attributes={"price": "5"},
+            ),
+        },
+        common_attributes={"brand": "asos"},
+    )
+
+
+@pytest.fixture()
+def catalog_path(tmp_path: pathlib.Path, catalog: Catalog) -> pathlib.Path:
+    path = tmp_path / "catalog.bin"
+    with open(path, "wb") as stream:
+        write_catalog(catalog=catalog, stream=stream)
+    return path
+
+
+@pytest.mark.unit()
+def test_catalog_file_round_trip(catalog: Catalog, catalog_path: pathlib.Path) -> None:
+    with CatalogFile(catalog_path) as catalog_file:
+        assert catalog_file.common_attributes == {"brand": "asos"}
+        assert catalog_file.articles_count == 3
+        assert list(catalog_file.article_numbers()) == ["001", "002", "003"]
+        assert [article.to_dict() for article in catalog_file.iter_articles()] == [
+            article.to_dict() for article in catalog.articles.values()
+        ]
+
+
+@pytest.mark.unit()
+def test_catalog_file_get_article(catalog_path: pathlib.Path) -> None:
+    with CatalogFile(catalog_path) as catalog_file:
+        article = catalog_file.get("001")
+
+        assert "001" in catalog_file
+        assert "004" not in catalog_file
+        assert article.article_number == "001"
+        assert article.common_attributes == {"name": "same"}
+        assert article.default_attributes is None
+        assert article.columns == ["colour", "size", "price"]
+        assert article.variations_count == 3
+        assert article.column("size") == ["36", None, "38"]
+        assert article.column("colour") == ["black", "wéiß", None]
+        with pytest.raises(KeyError):
+            article.column("material")
+        with pytest.raises(KeyError):
+            catalog_file.get("004")
+
+
+@pytest.mark.unit()
+def test_catalog_file_defaults(catalog_path: pathlib.Path) -> None:
+    with CatalogFile(catalog_path) as catalog_file:
+        article = catalog_file.get("003")
+
+        assert article.default_attributes == {"price": "5"}
+        # A null override and a missing value both read as None in a column
+        assert article.column("price") == [None, "6", None]
+        assert article.variations == [{"price": None}, {"price": "6"}, {}]
+
+
+@pytest.mark.unit()
+@pytest.mark.parametrize(
+    "content",
+    [b"", b"PCAT", b"JSON" + bytes(60), b"PCAT\x01\x00\x00\x00" + bytes(28) + b"PCAT"],
+    ids=["empty", "truncated", "magic", "offsets"],
+)
+def test_catalog_file_invalid(tmp_path: pathlib.Path, content: bytes) -> None:
+    path = tmp_path / "catalog.bin"
+    path.write_bytes(content)
+
+    with pytest.raises(InvalidCatalogFileError):
+        CatalogFile(path)
+
+
+@pytest.mark.unit()
+def test_write_catalog_non_string_value() -> None:
+    catalog = Catalog(
+        articles={
+            "001": Article(
+                article_number="001", variations=[{"size": 36}], common_attributes={}
+            ),
+        },
+        common_attributes={},
+    )
+
+    with pytest.raises(LoaderError):
+        write_catalog(catalog=catalog, stream=io.BytesIO())
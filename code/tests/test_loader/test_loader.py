@@ -0,0 +1,85 @@
+import io
+import json
+
+import pytest
+
+from src.grouper.catalog import Article, Catalog
+from src.loader.encoders import DataClassJsonEncoder
+from src.loader.loader import encode_to_json, write_json, write_ndjson
+
+
+@pytest.fixture()
+def catalog() -> Catalog:
+    return Catalog(
+        articles={
+            "001": Article(
+                article_number="001",
+                variations=[{"colour": "black"}, {"colour": "wéiß"}],
+                common_attributes={"name": "same"},
+            ),
+            "002": Article(
+                article_number="002",
+                variations=[{}],
+                common_attributes={},
+            ),
+        },
+        common_attributes={"brand": "asos"},
+    )
+
+
+@pytest.mark.unit()
+def test_write_json_matches_encode_to_json(catalog: Catalog) -> None:
+    stream = io.StringIO()
+
+    write_json(obj=catalog, stream=stream, encoder_cls=DataClassJsonEncoder)
+
+    assert stream.getvalue() == (
+        encode_to_json(obj=catalog, encoder_cls=DataClassJsonEncoder) + "\n"
+    )
+
+
+@pytest.mark.unit()
+def test_write_json_empty_catalog() -> None:
+    stream = io.StringIO()
+
+    write_json(obj=Catalog.new(), stream=stream, encoder_cls=DataClassJsonEncoder)
+
+    assert stream.getvalue() == '{\n  "articles": {},\n  "common_attributes": {}\n}\n'
+
+
+@pytest.mark.unit()
+def test_write_json_compact(catalog: Catalog) -> None:
+    stream = io.StringIO()
+
+    write_json(
+        obj=catalog, stream=stream, encoder_cls=DataClassJsonEncoder, compact=True
+    )
+
+    assert stream.getvalue().count("\n") == 1
+    assert " " not in stream.getvalue().replace("wéiß", "")
+    assert json.loads(stream.getvalue()) == json.loads(
+        encode_to_json(obj=catalog, encoder_cls=DataClassJsonEncoder)
+    )
+
+
+@pytest.mark.unit()
+def test_write_ndjson(catalog: Catalog) -> None:
+    stream = io.StringIO()
+
+    write_ndjson(
+        header={"common_attributes": catalog.common_attributes},
+        records=catalog.articles.values(),
+        stream=stream,
+        encoder_cls=DataClassJsonEncoder,
+    )
+
+    lines = stream.getvalue().splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"common_attributes": {"brand": "asos"}},
+        {
+            "article_number": "001",
+            "variations": [{"colour": "black"}, {"colour": "wéiß"}],
+            "common_attributes": {"name": "same"},
+        },
+        {"article_number": "002", "variations": [{}], "common_attributes": {}},
+    ]
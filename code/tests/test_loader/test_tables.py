@@ -0,0 +1,127 @@
+import io
+import json
+
+import pytest
+
+from src.grouper.catalog import Article, Catalog
+from src.loader.encoders import DataClassJsonEncoder
+from src.loader.loader import write_catalog
+from src.loader.schemas import OutputFormat, OutputLayout, OutputMeta
+from src.loader.tables import (
+    TableCatalog,
+    from_table,
+    restore_variations,
+    tabulate_record,
+    to_table,
+)
+
+
+@pytest.fixture()
+def catalog() -> Catalog:
+    return Catalog(
+        articles={
+            "001": Article(
+                article_number="001",
+                variations=[
+                    {"colour": "black", "size": "36"},
+                    {"colour": "wéiß"},
+                    {"size": "38", "price": "2"},
+                ],
+                common_attributes={"name": "same"},
+            ),
+            "002": Article(
+                article_number="002",
+                variations=[{}],
+                common_attributes={},
+            ),
+        },
+        common_attributes={"brand": "asos"},
+    )
+
+
+@pytest.mark.unit()
+def test_to_table() -> None:
+    variations = [
+        {"colour": "black", "size": "36"},
+        {"colour": "red"},
+        {"size": "38", "price": "2"},
+    ]
+
+    columns, rows = to_table(variations)
+
+    assert columns == ["colour", "size", "price"]
+    assert rows == [["black", "36", None], ["red", None, None], [None, "38", "2"]]
+    assert from_table(columns=columns, rows=rows) == variations
+
+
+@pytest.mark.unit()
+def test_tabulate_record_groups() -> None:
+    record = {
+        "article_number": "001",
+        "groups": {
+            "1": {
+                "color_code": "1",
+                "variations": [{"size": "36"}, {"size": "37"}],
+                "common_attributes": {},
+            },
+        },
+        "common_attributes": {"name": "same"},
+    }
+
+    tabulated = tabulate_record(record)
+
+    assert tabulated == {
+        "article_number": "001",
+        "groups": {
+            "1": {
+                "color_code": "1",
+                "columns": ["size"],
+                "rows": [["36"], ["37"]],
+                "common_attributes": {},
+            },
+        },
+        "common_attributes": {"name": "same"},
+    }
+    assert restore_variations(tabulated) == record
+
+
+@pytest.mark.unit()
+@pytest.mark.parametrize("output_format", [OutputFormat.JSON, OutputFormat.NDJSON])
+def test_write_catalog_table_layout(
+    catalog: Catalog, output_format: OutputFormat
+) -> None:
+    stream = io.StringIO()
+
+    write_catalog(
+        catalog=catalog,
+        stream=stream,
+        output=OutputMeta(format=output_format, layout=OutputLayout.TABLE),
+        encoder_cls=DataClassJsonEncoder,
+    )
+
+    if output_format is OutputFormat.NDJSON:
+        header, *articles = [
+            json.loads(line) for line in stream.getvalue().splitlines()
+        ]
+    else:
+        output = json.loads(stream.getvalue())
+        header = {"common_attributes": output["common_attributes"]}
+        articles = list(output["articles"].values())
+    assert header == {"common_attributes": {"brand": "asos"}}
+    assert articles[0] == {
+        "article_number": "001",
+        "columns": ["colour", "size", "price"],
+        "rows": [["black", "36", None], ["wéiß", None, None], [None, "38", "2"]],
+        "common_attributes": {"name": "same"},
+    }
+    assert [restore_variations(article) for article in articles] == [
+        article.to_dict() for article in catalog.articles.values()
+    ]
+
+
+@pytest.mark.unit()
+def test_table_catalog_counts(catalog: Catalog) -> None:
+    table_catalog = TableCatalog(catalog=catalog)
+
+    assert table_catalog.articles_count == 2
+    assert table_catalog.common_attributes == {"brand": "asos"}
@@ -0,0 +1,63 @@
+import io
+import json
+
+import pytest
+
+from src import stats as pipeline_stats
+from src.stats import PipelineStats
+
+
+@pytest.mark.unit()
+def test_call_excludes_time_of_nested_stages() -> None:
+    stats = PipelineStats(stream=io.StringIO())
+
+    def outer() -> int:
+        return stats.call("inner", sum, range(100_000))
+
+    result = stats.call("outer", outer)
+
+    assert result == sum(range(100_000))
+    assert stats.stages["outer"].items == 1
+    assert stats.stages["inner"].items == 1
+    assert stats.stages["outer"].wall_seconds < stats.stages["inner"].wall_seconds
+
+
+@pytest.mark.unit()
+def test_iterate_counts_items_and_reports_progress(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(pipeline_stats, "PROGRESS_CHECK_EVERY_ITEMS", 2)
+    stream = io.StringIO()
+    stats = PipelineStats(stream=stream, progress_interval=0)
+
+    items = list(stats.iterate("read", range(4), position=lambda: 50, total=100))
+
+    assert items == [0, 1, 2, 3]
+    assert stats.stages["read"].items == 4
+    progress = stream.getvalue().splitlines()
+    assert len(progress) == 2
+    assert progress[0].startswith("read: 2 rows")
+    assert "50.0%, ETA" in progress[0]
+
+
+@pytest.mark.unit()
+def test_report_writes_summary_as_json_line() -> None:
+    stream = io.StringIO()
+
+    with (
+        PipelineStats(stream=stream, trace_memory=True) as stats,
+        pipeline_stats.phase(stats, "grouping"),
+    ):
+        stats.rows = 3
+        stats.articles = 1
+
+    summary = json.loads(stream.getvalue())["stats"]
+    assert summary["rows"] == 3
+    assert summary["articles"] == 1
+    assert summary["phases"]["grouping"]["tracemalloc_peak_bytes"] is not None
+
+
+@pytest.mark.unit()
+def test_phase_is_noop_without_stats() -> None:
+    with pipeline_stats.phase(None, "grouping") as phase:
+        assert phase is None
@@ -0,0 +1,86 @@
+import pathlib
+import shutil
+
+import pytest
+
+from src.extractor.reader import CsvFileReaderMeta
+from src.transformer import cache
+from src.transformer.cache import MappingCache
+from src.transformer.transformer import Mapping
+
+
+@pytest.fixture()
+def mappings_file(
+    tmp_path: pathlib.Path, input_mappings_bonus_csv_path: pathlib.Path
+) -> CsvFileReaderMeta:
+    path = tmp_path / "mappings.csv"
+    shutil.copy(input_mappings_bonus_csv_path, path)
+    return CsvFileReaderMeta(path=path, delimiter=";")
+
+
+def _forbid_build(monkeypatch: pytest.MonkeyPatch) -> None:
+    def build_mapping(mappings_file: CsvFileReaderMeta) -> Mapping:
+        raise AssertionError("Mapping is built instead of loaded")
+
+    monkeypatch.setattr(cache, "build_mapping", build_mapping)
+
+
+@pytest.mark.unit()
+def test_get_or_build_loads_cached_mapping(
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: pathlib.Path,
+    mappings_file: CsvFileReaderMeta,
+) -> None:
+    mapping_cache = MappingCache(directory=tmp_path / "cache")
+    built = mapping_cache.get_or_build(mappings_file)
+
+    _forbid_build(monkeypatch)
+    loaded = mapping_cache.get_or_build(mappings_file)
+
+    assert loaded.plan == built.plan
+    assert loaded.direct_items == built.direct_items
+    assert loaded.composite_items == built.composite_items
+    assert loaded.glob_items == built.glob_items
+
+
+@pytest.mark.unit()
+def test_get_or_build_rebuilds_changed_file(
+    tmp_path: pathlib.Path, mappings_file: CsvFileReaderMeta
+) -> None:
+    mapping_cache = MappingCache(directory=tmp_path / "cache")
+    mapping_cache.get_or_build(mappings_file)
+
+    with open(mappings_file.path, "a") as file:
+        file.write("\nnew;New;season;season\n")
+    mapping = mapping_cache.get_or_build(mappings_file)
+
+    assert mapping.get("new", "season") is not None
+    assert len(list((tmp_path / "cache").iterdir())) == 2
+
+
+@pytest.mark.unit()
+@pytest.mark.parametrize(
+    "content",
+    [
+        b"",
+        b"not json",
+        b"[1]",
+        b'{"key": "other", "plan": {}}',
+        b'{"plan": {}}',
+        b'{"key": "%s", "plan": {"direct": [], "composite": [], "glob": []}}',
+        b'{"key": "%s", "plan": {"direct": {}, "composite": [[1]], "glob": []}}',
+    ],
+)
+def test_get_or_build_rebuilds_corrupt_entry(
+    tmp_path: pathlib.Path, mappings_file: CsvFileReaderMeta, content: bytes
+) -> None:
+    mapping_cache = MappingCache(directory=tmp_path / "cache")
+    expected = mapping_cache.get_or_build(mappings_file)
+    (entry,) = (tmp_path / "cache").iterdir()
+    content = content.replace(b"%s", cache.cache_key(mappings_file).encode())
+    entry.write_bytes(content)
+
+    mapping = mapping_cache.get_or_build(mappings_file)
+
+    assert mapping.plan == expected.plan
+    assert entry.read_bytes() != content
@@ -1,11 +1,15 @@
 import pytest
 
 from src.extractor.reader import Row
+from src.transformer.exceptions import MappingBuildError
 from src.transformer.transformer import (
     MapAttr,
     Mapping,
     MappingUnit,
+    SignatureCache,
+    TupleTransform,
     transform_row,
+    transform_rows,
 )
 
 
@@ -49,7 +53,7 @@ def test_mapping_unit_from_row(row: Row, expected: MappingUnit) -> None:
                 },
             ],
             {
-                "1.color_code": MappingUnit(
+                ("1", "color_code"): MappingUnit(
                     source=MapAttr(val="1", type_="color_code"),
                     destination=MapAttr(val="black", type_="color"),
                 )
@@ -73,11 +77,11 @@ def test_mapping_unit_from_row(row: Row, expected: MappingUnit) -> None:
                 },
             ],
             {
-                "1.color_code": MappingUnit(
+                ("1", "color_code"): MappingUnit(
                     source=MapAttr(val="1", type_="color_code"),
                     destination=MapAttr(val="black", type_="color"),
                 ),
-                "2.color_code": MappingUnit(
+                ("2", "color_code"): MappingUnit(
                     source=MapAttr(val="2", type_="color_code"),
                     destination=MapAttr(val="green", type_="color"),
                 ),
@@ -96,7 +100,7 @@ def test_mapping_unit_from_row(row: Row, expected: MappingUnit) -> None:
             ],
             {},
             {
-                "EU|36.size_group_code|size_code": MappingUnit(
+                ("EU|36", "size_group_code|size_code"): MappingUnit(
                     source=MapAttr(val="EU|36", type_="size_group_code|size_code"),
                     destination=MapAttr(val="European size 36", type_="size"),
                 ),
@@ -115,7 +119,7 @@ def test_mapping_unit_from_row(row: Row, expected: MappingUnit) -> None:
             {},
             {},
             {
-                "*.price|currency": MappingUnit(
+                ("*", "price|currency"): MappingUnit(
                     source=MapAttr(val="*", type_="price|currency"),
                     destination=MapAttr(val="*", type_="price_currency"),
                 ),
@@ -143,6 +147,32 @@ def test_mapping_build_ok(
     assert mapping.glob_items == expected_glob_items
 
 
+@pytest.mark.unit()
+@pytest.mark.parametrize(
+    ("source", "source_type"),
+    [
+        ("EU|36", "size_group_code|size_code|size_name"),
+        ("EU", "size_group_code|size_code"),
+    ],
+)
+def test_mapping_build_rejects_composite_with_mismatched_counts(
+    source: str, source_type: str
+) -> None:
+    mapping = Mapping()
+
+    with pytest.raises(MappingBuildError):
+        mapping.build(
+            [
+                {
+                    "source": source,
+                    "destination": "European size 36",
+                    "source_type": source_type,
+                    "destination_type": "size",
+                },
+            ]
+        )
+
+
 @pytest.mark.parametrize(
     ("source_row", "expected_row"),
     [
@@ -278,3 +308,217 @@ def test_transform_row(source_row: Row, expected_row: Row) -> None:
         ]
     )
     assert transform_row(source_row, mapping) == expected_row
+
+
+def _mapping_row(
+    source: str, source_type: str, destination: str, destination_type: str
+) -> Row:
+    return {
+        "source": source,
+        "source_type": source_type,
+        "destination": destination,
+        "destination_type": destination_type,
+    }
+
+
+@pytest.mark.unit()
+@pytest.mark.parametrize(
+    ("mapping_rows", "source_row", "expected_row"),
+    [
+        (
+            [_mapping_row("1", "a", "X", "t"), _mapping_row("1|2", "a|b", "Y", "t")],
+            {"a": "1", "b": "2"},
+            {"a": "1", "b": "2", "t": "Y"},
+        ),
+        (
+            [_mapping_row("1|2", "a|b", "Y", "t"), _mapping_row("1", "a", "X", "t")],
+            {"a": "1", "b": "2"},
+            {"a": "1", "b": "2", "t": "Y"},
+        ),
+        (
+            [_mapping_row("*", "a|c", "*", "x"), _mapping_row("*", "a|b", "*", "y")],
+            {"a": "1", "b": "2"},
+            {"a": "1", "b": "2"},
+        ),
+        (
+            [_mapping_row("2", "b", "Y", "t"), _mapping_row("1", "a", "X", "t")],
+            {"b": "2", "a": "1"},
+            {"b": "2", "a": "1", "t": "X"},
+        ),
+    ],
+    ids=[
+        "composite_overrides_earlier_direct",
+        "composite_overrides_later_direct",
+        "glob_stops_at_missing_part",
+        "direct_in_order_of_row_columns",
+    ],
+)
+def test_transform_row_precedence(
+    mapping_rows: list[Row], source_row: Row, expected_row: Row
+) -> None:
+    # Expected rows are those of the transform strategies before the plan
+    mapping = Mapping()
+    mapping.build(mapping_rows)
+    transform = TupleTransform.compile(plan=mapping.plan, fieldnames=list(source_row))
+
+    assert transform_row(source_row, mapping) == expected_row
+    assert transform_rows([source_row], mapping) == [expected_row]
+    assert transform.apply_batch([tuple(source_row.values())]) == [expected_row]
+
+
+@pytest.mark.unit()
+def test_mapping_build_compiles_plan(mock_mapping: Mapping) -> None:
+    plan = mock_mapping.plan
+
+    assert plan.direct == {
+        "attribute": {
+            "color": MapAttr(val="colour", type_="attribute"),
+            "size": MapAttr(val="size", type_="dimension"),
+        },
+        "*": {"*": MapAttr(val="combined", type_="composite")},
+    }
+    assert plan.composite == {
+        ("attribute", "attribute"): {
+            ("color", "size"): MapAttr(val="color_size", type_="composite"),
+        },
+    }
+    assert plan.glob == ()
+
+
+@pytest.fixture()
+def sizes_mapping() -> Mapping:
+    mapping = Mapping()
+    mapping.build(
+        [
+            {
+                "source": "36",
+                "source_type": "size_code",
+                "destination": "36 EUR",
+                "destination_type": "size",
+            },
+            {
+                "source": "*",
+                "source_type": "size_code|currency",
+                "destination": "*",
+                "destination_type": "size_currency",
+            },
+        ]
+    )
+    return mapping
+
+
+@pytest.mark.unit()
+def test_tuple_transform_equals_transform_row(sizes_mapping: Mapping) -> None:
+    fieldnames = ["article_number", "size_code", "currency"]
+    transform = TupleTransform.compile(plan=sizes_mapping.plan, fieldnames=fieldnames)
+
+    for values in [("001", "36", "EUR"), ("002", "38", "EUR"), ("003", "36", "")]:
+        row = dict(zip(fieldnames, values, strict=True))
+        assert transform.apply(values) == transform_row(row, sizes_mapping)
+
+
+@pytest.mark.unit()
+def test_tuple_transform_drops_columns(sizes_mapping: Mapping) -> None:
+    transform = TupleTransform.compile(
+        plan=sizes_mapping.plan,
+        fieldnames=["article_number", "price", "size_code", "currency"],
+        drop_columns={"price", "currency"},
+    )
+
+    # Currency is read by a glob rule, so it is read and then dropped
+    assert transform.columns == ("article_number", "size_code", "currency")
+    assert transform.apply(("001", "36", "EUR")) == {
+        "article_number": "001",
+        "size_code": "36",
+        "size": "36 EUR",
+        "size_currency": "36 EUR",
+    }
+
+
+@pytest.mark.unit()
+def test_transform_rows_equals_transform_row(sizes_mapping: Mapping) -> None:
+    rows = [
+        {"article_number": "001", "size_code": "36", "currency": "EUR"},
+        {"article_number": "002", "size_code": "38", "currency": "EUR"},
+        {"article_number": "003", "size_code": "36", "currency": "EUR"},
+        # Values written by rules differ from values of the source column
+        {"article_number": "004", "size_code": "36", "size_currency": "old"},
+        {"article_number": "005", "size_code": "36", "currency": "EUR", "size": "x"},
+        {"article_number": "006"},
+    ]
+
+    assert transform_rows(rows, sizes_mapping) == [
+        transform_row(row, sizes_mapping) for row in rows
+    ]
+
+
+@pytest.mark.unit()
+@pytest.mark.parametrize("drop_columns", [(), ("currency",)])
+def test_tuple_transform_apply_batch_equals_apply(
+    sizes_mapping: Mapping, drop_columns: tuple[str, ...]
+) -> None:
+    transform = TupleTransform.compile(
+        plan=sizes_mapping.plan,
+        fieldnames=["article_number", "size_code", "currency", "size_currency"],
+        drop_columns=drop_columns,
+    )
+    batch = [
+        ("001", "36", "EUR", ""),
+        ("002", "38", "USD", "old"),
+        ("003", "36", "EUR", "old"),
+        ("004", "36", "", ""),
+    ]
+
+    assert transform.apply_batch(batch) == [transform.apply(row) for row in batch]
+    assert list(transform.apply_batches(batch, batch_size=3)) == [
+        transform.apply(row) for row in batch
+    ]
+    assert transform.apply_batch([]) == []
+
+
+@pytest.mark.unit()
+def test_tuple_transform_cache_reuses_signatures_across_batches(
+    sizes_mapping: Mapping,
+) -> None:
+    transform = TupleTransform.compile(
+        plan=sizes_mapping.plan, fieldnames=["article_number", "size_code", "currency"]
+    )
+    batch = [("001", "36", "EUR"), ("002", "38", "EUR"), ("003", "36", "EUR")]
+    expected = [transform.apply(row) for row in batch]
+
+    assert list(transform.apply_batches(batch, batch_size=1)) == expected
+    assert transform.cache is not None
+    assert (transform.cache.hits, transform.cache.misses) == (1, 2)
+
+    assert transform.apply_batch(batch) == expected
+    assert (transform.cache.hits, transform.cache.misses) == (4, 2)
+    assert transform.cache.hit_rate == pytest.approx(4 / 6)
+
+
+@pytest.mark.unit()
+def test_tuple_transform_cache_disabled(sizes_mapping: Mapping) -> None:
+    transform = TupleTransform.compile(
+        plan=sizes_mapping.plan,
+        fieldnames=["article_number", "size_code", "currency"],
+        cache_size=0,
+    )
+
+    assert transform.cache is None
+    assert transform.apply_batch([("001", "36", "EUR")]) == [
+        transform.apply(("001", "36", "EUR"))
+    ]
+
+
+@pytest.mark.unit()
+def test_signature_cache_evicts_least_recently_used() -> None:
+    cache = SignatureCache(maxsize=2)
+    cache.put(("a",), {"x": "1"})
+    cache.put(("b",), {"x": "2"})
+    assert cache.get(("a",)) == {"x": "1"}
+
+    cache.put(("c",), {"x": "3"})
+
+    assert len(cache) == 2
+    assert cache.get(("b",)) is None
+    assert cache.get(("a",)) == {"x": "1"}
+    assert cache.get(("c",)) == {"x": "3"}